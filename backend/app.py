@@ -13,6 +13,8 @@ load_dotenv()
 
 from src.input_processor import InputProcessor
 from src.task_decomposer import TaskDecomposer
+from src.execution.rate_limiter import get_rate_limiter
+from src.execution.model_telemetry import get_model_telemetry
 # from src.execution import Executor
 # from src.screen_recorder import ScreenRecorder
 
@@ -120,8 +122,12 @@ def generate_plan_task(job_id: str, instruction:  str):
         import traceback
         traceback.print_exc()
 
-def execute_plan_task(job_id: str):
-    """Background task - execute plan from ontology and record video."""
+def execute_plan_task(job_id: str, resume: bool = False, replay: bool = False):
+    """
+    Background task - execute plan from ontology and record video.
+    With resume, execution continues from the executed ontology and the new part is appended to the existing video.
+    With replay, the whole video is recorded again using the element locations stored in the executed ontology.
+    """
     try:
         jobs[job_id]["status"] = JobStatus.RECORDING
         jobs[job_id]["message"] = "Starting execution from ontology..."
@@ -143,15 +149,31 @@ def execute_plan_task(job_id: str):
             mapper.map_plan_to_ontology(plan_dict, task_id=job_id)
             ontology.save_ontology(owl_path, format="xml")
         
-        executor = OntologyExecutor(slow_mode=True, record_video=True)
+        executor = OntologyExecutor(
+            slow_mode=True,
+            record_video=True,
+            prefetch=os.getenv("SPECULATIVE_PREFETCH", "1") != "0",
+            verify_steps=os.getenv("VERIFY_STEPS", "0") == "1"
+        )
         
         video_name = f"tutorial_{job_id}"
         
+        # Postojeci video na koji se nastavak nadovezuje
+        append_to = None
+        if resume and jobs[job_id].get("video_filename"):
+            append_to = os.path.join(VIDEOS_DIR, jobs[job_id]["video_filename"])
+        
         jobs[job_id]["status"] = JobStatus.EXECUTING
-        jobs[job_id]["message"] = "Reading steps from OWL and executing..."
+        if resume:
+            jobs[job_id]["message"] = "Resuming from the executed ontology..."
+        elif replay:
+            jobs[job_id]["message"] = "Replaying the executed ontology..."
+        else:
+            jobs[job_id]["message"] = "Reading steps from OWL and executing..."
         
         # DIREKTNO IZ OWL FAJLA
-        results = executor.execute_from_owl(owl_path, video_name=video_name)
+        results = executor.execute_from_owl(owl_path, video_name=video_name, resume=resume, append_to=append_to,
+                                          replay=replay)
         
         # Check results
         video_path = results.get("video_path")
@@ -175,7 +197,9 @@ def execute_plan_task(job_id: str):
             jobs[job_id]["results"] = {
                 "successful_steps": results.get("successful_steps", 0),
                 "failed_steps": results.get("failed_steps", 0),
-                "total_steps": results.get("total_steps", 0)
+                "total_steps": results.get("total_steps", 0),
+                "resumed_from": results.get("resumed_from"),
+                "replay": results.get("replay")
             }
         else:
             jobs[job_id]["status"] = JobStatus.FAILED
@@ -198,6 +222,20 @@ def health_check():
         "timestamp": datetime. now().isoformat()
     })
 
+@app.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    """Metrike Vision API-ja (cekanje na rate limiter, stanje circuit breaker-a po modelu)"""
+    return jsonify({
+        "rate_limiter": get_rate_limiter().metrics(),
+        "models": get_model_telemetry().summary(),
+        "timestamp": datetime.now().isoformat()
+    })
+
+@app.route("/api/metrics/models", methods=["GET"])
+def get_model_metrics():
+    """Statistika vision modela (latencija, greske, tacnost) i trenutni redoslijed modela"""
+    return jsonify(get_model_telemetry().summary())
+
 @app.route("/api/generate-plan", methods=["POST"])
 def generate_plan():
     """
@@ -346,12 +384,20 @@ def update_task_plan(job_id: str):
 
 @app.route("/api/regenerate/<job_id>", methods=["POST"])
 def regenerate_video(job_id: str):
-    """Regenerisanje video upustva za azurirani task plan ili vec postojeci task plan"""
+    """
+    Regenerisanje video upustva za azurirani task plan ili vec postojeci task plan.
+    Body {"resume": true} nastavlja od prvog nezavrsenog koraka i nadovezuje snimak na postojeci video.
+    Body {"replay": true} snima cijeli video ponovo, koristeci lokacije elemenata iz izvrsene ontologije.
+    """
     if job_id not in jobs:
         return jsonify({"error": "Job not found"}), 404
     
+    data = request.get_json(silent=True) or {}
+    resume = bool(data.get("resume"))
+    replay = bool(data.get("replay")) and not resume
+    
     old_video = jobs[job_id]. get("video_filename")
-    if old_video:
+    if old_video and not resume:
         old_path = os.path.join(VIDEOS_DIR, old_video)
         if os.path.exists(old_path):
             try:
@@ -359,22 +405,23 @@ def regenerate_video(job_id: str):
             except:
                 pass
     
-    # Postavljanje novog statusa job-a
-    jobs[job_id]["video_url"] = None
-    jobs[job_id]["video_filename"] = None
+    # Postavljanje novog statusa job-a (kod nastavka video ostaje - na njega se nadovezuje)
+    if not resume:
+        jobs[job_id]["video_url"] = None
+        jobs[job_id]["video_filename"] = None
     jobs[job_id]["results"] = None
     jobs[job_id]["error"] = None
     
     thread = threading. Thread(
         target=execute_plan_task,
-        args=(job_id,)
+        args=(job_id, resume, replay)
     )
     thread.start()
     
     return jsonify({
         "job_id": job_id,
         "status": JobStatus.RECORDING,
-        "message": "Regeneration started"
+        "message": "Resume started" if resume else "Replay started" if replay else "Regeneration started"
     })
 
 
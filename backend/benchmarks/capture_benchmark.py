@@ -0,0 +1,95 @@
+"""
+Screen capture latency benchmark.
+
+Compares the original capture path (pyautogui.screenshot, taken twice per step:
+once for grounding and once for the archived screenshot) with the pluggable
+capture backends that return NumPy frames shared across the whole step.
+
+Usage (from the backend folder):
+    python -m benchmarks.capture_benchmark --iterations 50
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import pyautogui
+
+from src.execution.screen_capture import CAPTURE_BACKENDS, create_capture_backend
+
+
+def _measure(func: Callable[[], None], iterations: int, warmup: int = 3) -> Dict[str, float]:
+    for _ in range(warmup):
+        func()
+
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    samples.sort()
+    return {
+        "mean_ms": round(statistics.mean(samples), 2),
+        "p50_ms": round(samples[len(samples) // 2], 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        "min_ms": round(samples[0], 2)
+    }
+
+
+def run(iterations: int, backends: List[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+
+    # Stari put: dva pyautogui screenshot-a po koraku
+    def legacy_step():
+        pyautogui.screenshot()
+        pyautogui.screenshot()
+
+    results["legacy pyautogui (2 captures/step)"] = _measure(legacy_step, iterations)
+
+    for name in backends:
+        backend = create_capture_backend(name)
+        if backend.name != name:
+            print(f"[Benchmark] Skipping '{name}' (not available)")
+            continue
+
+        results[f"{name} grab (NumPy frame)"] = _measure(backend.grab, iterations)
+
+        # Novi put: jedan frame po koraku, PIL slika se pravi jednom i dijeli
+        def shared_step():
+            frame = backend.grab()
+            return frame.image
+
+        results[f"{name} step (1 capture, shared)"] = _measure(shared_step, iterations)
+        backend.close()
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Screen capture latency benchmark")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--backends", nargs="+", default=list(CAPTURE_BACKENDS.keys()))
+    parser.add_argument("--json", dest="json_path", default=None, help="Optional path for JSON results")
+    args = parser.parse_args()
+
+    width, height = pyautogui.size()
+    print(f"\nScreen: {width}x{height}, iterations: {args.iterations}\n")
+
+    results = run(args.iterations, args.backends)
+
+    print(f"{'Path':<40} {'mean':>9} {'p50':>9} {'p95':>9} {'min':>9}")
+    print("-" * 80)
+    for path, stats in results.items():
+        print(f"{path:<40} {stats['mean_ms']:>7.2f}ms {stats['p50_ms']:>7.2f}ms "
+              f"{stats['p95_ms']:>7.2f}ms {stats['min_ms']:>7.2f}ms")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
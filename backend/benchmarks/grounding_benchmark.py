@@ -0,0 +1,395 @@
+"""
+Grounding accuracy and latency benchmark.
+
+Runs ScreenAnalyzer.find_element_coordinates over a versioned corpus of
+screenshots with ground-truth element boxes, once per encoding/grounding
+configuration (image size cap, resampling, JPEG quality, ROI, progressive
+zoom, Set-of-Mark, refinement), and reports per configuration:
+
+    hit rate       - located point inside the ground-truth box
+    pixel error    - distance from the located point to the box center
+    payload        - base64 image bytes sent per sample
+    encode time    - resize + JPEG + base64 time per sample
+    latency        - end-to-end find_element_coordinates time per sample
+
+Vision modes:
+    mock      - local oracle endpoint: answers with the ground-truth center mapped
+                into the sent image plus Gaussian noise in image pixels (models the
+                resolution effect; JPEG artifacts and prompt wording are not modeled)
+    recorded  - replays responses recorded with --record (per configuration and sample)
+    live      - real API (OPENROUTER_API_KEY); --record saves the responses
+
+Corpus manifest (JSON, image paths relative to the manifest):
+    {
+      "name": "desktop-v1",
+      "version": 3,
+      "samples": [
+        {"id": "vscode_file_menu", "image": "images/vscode_1.png",
+         "target": "File", "context": "", "box": [12, 4, 44, 26]}
+      ]
+    }
+
+Configurations (--configs, JSON list; missing keys keep the defaults):
+    [{"name": "q70", "max_size": 800, "resample": "lanczos", "jpeg_quality": 70,
+      "grounding_mode": "coordinates", "progressive": true, "roi": true, "refine": true}]
+
+No display is needed: the analyzer gets the corpus screenshots through an injected
+capture backend, so mock and recorded modes also run headless (CI).
+
+Usage (from the backend folder):
+    python -m benchmarks.grounding_benchmark --corpus corpus/manifest.json --mode mock
+    python -m benchmarks.grounding_benchmark --corpus corpus/manifest.json --mode live --record recordings
+    python -m benchmarks.grounding_benchmark --corpus corpus/manifest.json --mode recorded --recordings recordings
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+from PIL import Image
+
+from src.execution.screen_analyzer import ScreenAnalyzer
+from src.execution.screen_capture import CaptureBackend, Frame
+from src.execution.template_locator import TemplateLocator
+from src.execution.rate_limiter import RateLimiter
+from src.execution.element_boxes import nearest_box
+
+DEFAULT_CONFIG = {
+    "max_size": 800,
+    "resample": "lanczos",
+    "jpeg_quality": 85,
+    "grounding_mode": "coordinates",
+    "progressive": True,
+    "roi": True,
+    "refine": True
+}
+
+DEFAULT_CONFIGS = [
+    {"name": "baseline"},
+    {"name": "max_size_1024", "max_size": 1024},
+    {"name": "max_size_640", "max_size": 640},
+    {"name": "bilinear", "resample": "bilinear"},
+    {"name": "jpeg_70", "jpeg_quality": 70},
+    {"name": "jpeg_95", "jpeg_quality": 95},
+    {"name": "full_frame", "roi": False, "progressive": False},
+    {"name": "no_refine", "refine": False},
+    {"name": "set_of_mark", "grounding_mode": "marks"}
+]
+
+
+def load_corpus(manifest_path: str) -> Dict[str, Any]:
+    with open(manifest_path, "rb") as f:
+        raw = f.read()
+
+    manifest = json.loads(raw)
+    folder = os.path.dirname(os.path.abspath(manifest_path))
+    for sample in manifest["samples"]:
+        sample["image_path"] = os.path.join(folder, sample["image"])
+
+    return {
+        "name": manifest.get("name", os.path.basename(folder)),
+        "version": manifest.get("version", 1),
+        "sha256": hashlib.sha256(raw).hexdigest()[:16],
+        "samples": manifest["samples"]
+    }
+
+
+class CorpusCapture(CaptureBackend):
+    """Capture backend that returns the current corpus screenshot instead of the screen."""
+
+    name = "corpus"
+
+    def __init__(self):
+        self.image: Optional[Image.Image] = None
+
+    def grab(self) -> Frame:
+        if self.image is None:
+            raise RuntimeError("No corpus sample loaded")
+        return Frame(np.asarray(self.image), "RGB", image=self.image)
+
+
+def _percentile(samples: List[float], percentile: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+
+class BenchmarkVisionClient:
+    """
+    Stand-in for VisionClient (same chat / chat_stream / run interface).
+
+    In mock mode it answers from the ground truth, in recorded mode from saved
+    responses; with a live client it forwards requests and records the answers.
+    """
+
+    def __init__(self, analyzer: ScreenAnalyzer, mode: str, live_client=None, noise: float = 2.0,
+                 latency: float = 0.0, recordings_dir: Optional[str] = None, replay_latency: bool = False,
+                 seed: int = 0):
+        self.analyzer = analyzer
+        self.mode = mode
+        self.live_client = live_client
+        self.noise = noise
+        self.latency = latency
+        self.recordings_dir = recordings_dir
+        self.replay_latency = replay_latency
+        self.random = random.Random(seed)
+
+        self.sample: Optional[Dict[str, Any]] = None
+        self.config_name = ""
+        self._responses: List[Dict[str, Any]] = []
+        self._loop = asyncio.new_event_loop()
+
+    def begin(self, config_name: str, sample: Dict[str, Any]):
+        self.config_name = config_name
+        self.sample = sample
+        self._responses = self._load_recording() if self.mode == "recorded" else []
+
+    def end(self):
+        if self.mode == "live" and self.recordings_dir:
+            path = self._recording_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self._responses, f, indent=2)
+
+    def _recording_path(self) -> str:
+        return os.path.join(self.recordings_dir, self.config_name, f"{self.sample['id']}.json")
+
+    def _load_recording(self) -> List[Dict[str, Any]]:
+        path = self._recording_path()
+        if not os.path.exists(path):
+            print(f"[Benchmark] No recording for {self.config_name}/{self.sample['id']}")
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _mock_answer(self) -> str:
+        geometry = self.analyzer.last_request_geometry or {}
+        left, top, right, bottom = self.sample["box"]
+        offset_x, offset_y = geometry.get("offset", (0, 0))
+        scale = geometry.get("scale_factor", 1.0)
+        width, height = geometry.get("size", (0, 0))
+
+        # Greska modela je u pikselima poslate slike - manja slika, veca greska na ekranu
+        x = ((left + right) / 2 - offset_x) * scale + self.random.gauss(0, self.noise)
+        y = ((top + bottom) / 2 - offset_y) * scale + self.random.gauss(0, self.noise)
+
+        if geometry.get("marks"):
+            screen_x, screen_y = int(offset_x + x / scale), int(offset_y + y / scale)
+            box = nearest_box(geometry["marks"], screen_x, screen_y, max_distance=10 ** 6)
+            return json.dumps({"marks": [geometry["marks"].index(box) + 1], "confidence": 0.9})
+
+        if not (0 <= x < width and 0 <= y < height):
+            return json.dumps({"found": False, "candidates": [], "description": "Not in this image"})
+
+        box = [int((left - offset_x) * scale), int((top - offset_y) * scale),
+               int((right - offset_x) * scale), int((bottom - offset_y) * scale)]
+        return json.dumps({"found": True, "candidates": [
+            {"x": int(x), "y": int(y), "box": box, "confidence": 0.9, "description": "mock"}
+        ]})
+
+    async def _answer(self, model: str, messages, max_tokens: int, deadline: Optional[float],
+                      stream: bool, stop_when=None):
+        if self.mode == "live":
+            started = time.time()
+            if stream:
+                status, headers, content, stopped = await self.live_client.chat_stream(
+                    model, messages, max_tokens=max_tokens, deadline=deadline, stop_when=stop_when
+                )
+            else:
+                response = await self.live_client.chat(model, messages, max_tokens=max_tokens, deadline=deadline)
+                status, headers, stopped = response.status_code, response.headers, False
+                content = response.json()["choices"][0]["message"]["content"] if status == 200 else response.text
+            if status == 200:
+                self._responses.append({"content": content, "latency": round(time.time() - started, 3)})
+            return status, headers, content, stopped
+
+        if self.mode == "recorded":
+            if not self._responses:
+                return 500, httpx.Headers(), "Recording exhausted", False
+            recorded = self._responses.pop(0)
+            if self.replay_latency:
+                await asyncio.sleep(recorded.get("latency", 0))
+            return 200, httpx.Headers(), recorded["content"], False
+
+        if self.latency:
+            await asyncio.sleep(max(0.0, self.random.gauss(self.latency, self.latency * 0.2)))
+        return 200, httpx.Headers(), self._mock_answer(), False
+
+    async def chat(self, model, messages, max_tokens: int = 300, deadline: Optional[float] = None):
+        status, headers, content, _ = await self._answer(model, messages, max_tokens, deadline, stream=False)
+        body = {"choices": [{"message": {"role": "assistant", "content": content}}]} if status == 200 else {}
+        return httpx.Response(status, headers=headers, json=body)
+
+    async def chat_stream(self, model, messages, max_tokens: int = 300, deadline: Optional[float] = None,
+                          stop_when=None):
+        return await self._answer(model, messages, max_tokens, deadline, stream=True, stop_when=stop_when)
+
+    def run(self, coroutine, timeout: Optional[float] = None):
+        return self._loop.run_until_complete(coroutine)
+
+    def close(self):
+        self._loop.close()
+
+
+def _apply_config(analyzer: ScreenAnalyzer, config: Dict[str, Any]):
+    analyzer.image_max_size = int(config["max_size"])
+    analyzer.resample = getattr(Image.Resampling, config["resample"].upper())
+    analyzer.jpeg_quality = int(config["jpeg_quality"])
+    analyzer.grounding_mode = config["grounding_mode"]
+    analyzer.progressive = bool(config["progressive"])
+    analyzer.use_roi = bool(config["roi"])
+    analyzer.refine = bool(config["refine"])
+
+
+def run_config(analyzer: ScreenAnalyzer, client: BenchmarkVisionClient, config: Dict[str, Any],
+               samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    _apply_config(analyzer, config)
+
+    hits, errors, latencies, payloads, encodes, calls = 0, [], [], [], [], []
+    per_sample = []
+
+    for sample in samples:
+        screenshot = Image.open(sample["image_path"]).convert("RGB")
+        analyzer.capture.image = screenshot
+        analyzer.screen_width, analyzer.screen_height = screenshot.size
+        analyzer.locator = TemplateLocator()
+        analyzer._reference_thumbnail = None
+        analyzer.last_request_geometry = None
+
+        images_before, bytes_before, encode_before = (
+            analyzer.encoded_images, analyzer.payload_bytes, analyzer.encode_seconds
+        )
+
+        client.begin(config["name"], sample)
+        started = time.perf_counter()
+        element = analyzer.find_element_coordinates(
+            sample["target"], sample.get("context", ""), screenshot=screenshot, use_cache=False
+        )
+        latency = time.perf_counter() - started
+        client.end()
+
+        left, top, right, bottom = sample["box"]
+        found = bool(element and element.get("found"))
+        hit = found and left <= element["x"] < right and top <= element["y"] < bottom
+        error = math.hypot(element["x"] - (left + right) / 2, element["y"] - (top + bottom) / 2) if found else None
+
+        hits += hit
+        if error is not None:
+            errors.append(error)
+        latencies.append(latency)
+        payloads.append(analyzer.payload_bytes - bytes_before)
+        encodes.append(analyzer.encode_seconds - encode_before)
+        calls.append(analyzer.encoded_images - images_before)
+
+        per_sample.append({
+            "id": sample["id"],
+            "found": found,
+            "hit": hit,
+            "error_px": round(error, 1) if error is not None else None,
+            "latency_s": round(latency, 3)
+        })
+
+    count = max(1, len(samples))
+    return {
+        "config": config,
+        "samples": len(samples),
+        "hit_rate": round(hits / count, 3),
+        "found_rate": round(len(errors) / count, 3),
+        "error_px_mean": round(statistics.mean(errors), 1) if errors else None,
+        "error_px_p50": round(_percentile(errors, 50), 1) if errors else None,
+        "error_px_p95": round(_percentile(errors, 95), 1) if errors else None,
+        "payload_kb_mean": round(statistics.mean(payloads) / 1024, 1) if payloads else 0,
+        "encode_ms_mean": round(statistics.mean(encodes) * 1000, 2) if encodes else 0,
+        "images_per_sample": round(statistics.mean(calls), 2) if calls else 0,
+        "latency_s_p50": round(_percentile(latencies, 50), 3) if latencies else 0,
+        "latency_s_p95": round(_percentile(latencies, 95), 3) if latencies else 0,
+        "per_sample": per_sample
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grounding accuracy and latency benchmark")
+    parser.add_argument("--corpus", required=True, help="Path to the corpus manifest.json")
+    parser.add_argument("--mode", choices=["mock", "recorded", "live"], default="mock")
+    parser.add_argument("--configs", default=None, help="JSON file with a list of configurations")
+    parser.add_argument("--only", nargs="+", default=None, help="Run only these configuration names")
+    parser.add_argument("--noise", type=float, default=2.0, help="Mock answer noise (sent-image pixels)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mean mock response latency (seconds)")
+    parser.add_argument("--recordings", default="benchmark_recordings", help="Folder with recorded responses")
+    parser.add_argument("--record", default=None, help="Live mode: save responses to this folder")
+    parser.add_argument("--replay-latency", action="store_true", help="Recorded mode: sleep the recorded latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default=None, help="Optional path for JSON results")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+
+    configs = DEFAULT_CONFIGS
+    if args.configs:
+        with open(args.configs, "r", encoding="utf-8") as f:
+            configs = json.load(f)
+    configs = [dict(DEFAULT_CONFIG, **config) for config in configs]
+    if args.only:
+        configs = [config for config in configs if config["name"] in args.only]
+
+    if args.mode != "live":
+        # Bez mreze, telemetrije na disku i ogranicenja brzine
+        os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+        os.environ["VISION_STATS_PATH"] = ""
+
+    # Velicina ekrana se postavlja po uzorku - pravi ekran (pyautogui) nije potreban
+    analyzer = ScreenAnalyzer(screen_size=(1, 1), capture=CorpusCapture())
+    analyzer.hedging = False
+    if args.mode != "live":
+        analyzer.rate_limiter = RateLimiter(default_rate=1000.0, default_burst=1000)
+
+    client = BenchmarkVisionClient(
+        analyzer, args.mode,
+        live_client=analyzer.client if args.mode == "live" else None,
+        noise=args.noise,
+        latency=args.latency,
+        recordings_dir=args.record if args.mode == "live" else args.recordings,
+        replay_latency=args.replay_latency,
+        seed=args.seed
+    )
+    analyzer.client = client
+
+    print(f"\nCorpus: {corpus['name']} v{corpus['version']} ({corpus['sha256']}), "
+          f"{len(corpus['samples'])} samples, mode: {args.mode}\n")
+
+    results = []
+    for config in configs:
+        print(f"[Benchmark] Configuration '{config['name']}'")
+        results.append(run_config(analyzer, client, config, corpus["samples"]))
+
+    print(f"\n{'Configuration':<18} {'hit':>6} {'err p50':>8} {'err p95':>8} {'KB':>7} "
+          f"{'enc ms':>7} {'img':>5} {'lat p50':>8} {'lat p95':>8}")
+    print("-" * 84)
+    for result in results:
+        fmt = lambda value: "-" if value is None else f"{value:.1f}"
+        print(f"{result['config']['name']:<18} {result['hit_rate']:>6.1%} {fmt(result['error_px_p50']):>8} "
+              f"{fmt(result['error_px_p95']):>8} {result['payload_kb_mean']:>7.1f} {result['encode_ms_mean']:>7.2f} "
+              f"{result['images_per_sample']:>5.2f} {result['latency_s_p50']:>7.3f}s {result['latency_s_p95']:>7.3f}s")
+
+    client.close()
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "corpus": {key: corpus[key] for key in ("name", "version", "sha256")},
+                "mode": args.mode,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "results": results
+            }, f, indent=2)
+        print(f"\nResults saved: {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+"""
+Local OpenAI-compatible stand-in for the Groq and OpenRouter endpoints.
+
+Serves POST .../chat/completions (plain and "stream": true) with scripted or
+recorded completions, a configurable latency distribution, 429 injection and
+error rates, so the whole pipeline (InputProcessor, TaskDecomposer,
+ScreenAnalyzer) can be load-tested offline and deterministically.
+
+Point the backend at it through the environment:
+    GROQ_BASE_URL=http://localhost:8765
+    OPENROUTER_BASE_URL=http://localhost:8765/api/v1
+
+Latency specs (seconds, time to first token):
+    fixed:0.5 | uniform:0.2,1.5 | normal:0.8,0.2 | lognormal:-0.5,0.4 | empirical:latencies.json
+
+Script file (--script, JSON; first matching rule answers, responses are cycled):
+    {
+      "rules": [
+        {"match": "Find the UI element", "latency": "normal:1.2,0.3",
+         "responses": ["{\\"found\\": true, \\"candidates\\": [{\\"x\\": 40, \\"y\\": 12, \\"confidence\\": 0.9}]}"]},
+        {"match": "Expected state", "responses": [{"content": "{\\"satisfied\\": true}", "latency": 0.9}]}
+      ]
+    }
+Responses given as {"content", "latency"} are recorded answers and replay their own latency.
+Requests without a matching rule get a built-in answer of the right shape.
+
+Usage (from the backend folder):
+    python -m benchmarks.stand_in_server --port 8765 --latency normal:0.8,0.2 --rate-429 0.05 --error-rate 0.01
+    curl http://localhost:8765/stats
+"""
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, Response, jsonify, request
+
+
+class LatencyModel:
+    """Samples response latency (seconds) from a spec like "normal:0.8,0.2"."""
+
+    def __init__(self, spec: str, rng: random.Random):
+        self.spec = spec
+        self.rng = rng
+        kind, _, params = spec.partition(":")
+        self.kind = kind.strip().lower()
+
+        if self.kind == "empirical":
+            with open(params, "r", encoding="utf-8") as f:
+                self.samples = [float(value) for value in json.load(f)]
+            self.params: List[float] = []
+        else:
+            self.params = [float(value) for value in params.split(",") if value.strip()]
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0]
+        if self.kind == "uniform":
+            return self.rng.uniform(self.params[0], self.params[1])
+        if self.kind == "normal":
+            return max(0.0, self.rng.gauss(self.params[0], self.params[1]))
+        if self.kind == "lognormal":
+            return self.rng.lognormvariate(self.params[0], self.params[1])
+        if self.kind == "empirical":
+            return self.rng.choice(self.samples)
+        raise ValueError(f"Unknown latency distribution: {self.spec}")
+
+
+def _image_size(prompt: str) -> tuple:
+    match = re.search(r"Image size:\s*(\d+)x(\d+)", prompt)
+    return (int(match.group(1)), int(match.group(2))) if match else (800, 450)
+
+
+def builtin_answer(prompt: str, rng: random.Random) -> str:
+    """Answer of the shape each prompt in the backend expects (elements are placed near the image center)."""
+    width, height = _image_size(prompt)
+    x = int(width / 2 + rng.gauss(0, width / 20))
+    y = int(height / 2 + rng.gauss(0, height / 20))
+    candidate = {"x": x, "y": y, "box": [x - 40, y - 12, x + 40, y + 12], "confidence": 0.9,
+                 "description": "stand-in element"}
+
+    if "extract key information" in prompt:
+        return json.dumps({
+            "intent": "Write a short note in Notepad",
+            "application": "Notepad",
+            "programming_language": None,
+            "specific_actions": ["Open Notepad", "Type a note", "Save the file"]
+        })
+    if "Create a DETAILED plan" in prompt:
+        return json.dumps({
+            "goal": "Write a short note in Notepad",
+            "prerequisites": ["Notepad is installed"],
+            "steps": [
+                {"id": 1, "action": "open_application", "target": "Notepad", "value": None,
+                 "description": "Start Notepad", "expected_result": "Notepad is opened"},
+                {"id": 2, "action": "wait", "target": "screen", "value": "2",
+                 "description": "Wait for loading", "expected_result": "Notepad is visible"},
+                {"id": 3, "action": "click", "target": "File", "value": None,
+                 "description": "Open the File menu", "expected_result": "File menu is opened"},
+                {"id": 4, "action": "type_text", "target": "editor", "value": "Hello from the stand-in",
+                 "description": "Type a note", "expected_result": "Text is entered"},
+                {"id": 5, "action": "key_combination", "target": "ctrl+s", "value": None,
+                 "description": "Save the file", "expected_result": "Save dialog is opened"}
+            ],
+            "success_criteria": "The note is saved"
+        })
+    if "numbered boxes (marks)" in prompt:
+        return json.dumps({"marks": [1, 2], "confidence": 0.9})
+    if "TASK 1 - Expected state" in prompt:
+        return json.dumps({"satisfied": True, "confidence": 0.9, "description": "stand-in",
+                           "next": {"found": True, "candidates": [candidate]}})
+    if "Find each of these UI elements" in prompt:
+        ids = re.findall(r"^\s*(\d+)\.\s+\"", prompt, flags=re.MULTILINE)
+        return json.dumps([{"id": int(i), "found": True, "x": x, "y": y} for i in ids])
+    if "Find the UI element" in prompt:
+        return json.dumps({"found": True, "candidates": [candidate]})
+    if "Expected state" in prompt:
+        return json.dumps({"satisfied": True, "confidence": 0.9, "description": "stand-in"})
+    if "Describe this screenshot" in prompt:
+        return "A desktop with an application window open."
+    return "{}"
+
+
+class StandInServer:
+    def __init__(
+        self,
+        latency: str = "fixed:0.3",
+        token_delay: float = 0.01,
+        chunk_chars: int = 8,
+        rate_429: float = 0.0,
+        rpm: Optional[int] = None,
+        retry_after: float = 2.0,
+        error_rate: float = 0.0,
+        script: Optional[Dict[str, Any]] = None,
+        seed: int = 0
+    ):
+        """
+        Args:
+            latency: Default time-to-first-token distribution
+            token_delay: Seconds between streamed chunks (and per chunk for plain responses)
+            chunk_chars: Characters per streamed chunk (roughly two tokens)
+            rate_429: Probability of an injected 429
+            rpm: Requests per minute per model before real 429s with Retry-After (None = unlimited)
+            retry_after: Retry-After seconds sent with injected 429s
+            error_rate: Probability of a 500/503 response
+            script: Scripted rules (see the module docstring)
+        """
+        self.rng = random.Random(seed)
+        self.latency = LatencyModel(latency, self.rng)
+        self.token_delay = token_delay
+        self.chunk_chars = chunk_chars
+        self.rate_429 = rate_429
+        self.rpm = rpm
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+
+        self.rules = []
+        for rule in (script or {}).get("rules", []):
+            self.rules.append({
+                "match": rule.get("match", ""),
+                "responses": itertools.cycle(rule.get("responses") or ["{}"]),
+                "latency": LatencyModel(rule["latency"], self.rng) if rule.get("latency") else None
+            })
+
+        self._lock = threading.Lock()
+        self._windows: Dict[str, List[float]] = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counts = {"requests": 0, "ok": 0, "streamed": 0, "rate_limited": 0, "errors": 0,
+                           "client_disconnects": 0}
+            self.per_model: Dict[str, int] = {}
+            self.in_flight = 0
+            self.max_in_flight = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = max(1e-6, time.time() - self.started)
+            return dict(self.counts, per_model=dict(self.per_model), in_flight=self.in_flight,
+                        max_in_flight=self.max_in_flight, throughput_rps=round(self.counts["ok"] / elapsed, 2),
+                        uptime_s=round(elapsed, 1))
+
+    def _count(self, key: str, delta: int = 1):
+        with self._lock:
+            self.counts[key] += delta
+
+    def _rate_limited(self, model: str) -> Optional[float]:
+        """Seconds until the model accepts requests again, or None."""
+        with self._lock:
+            if self.rng.random() < self.rate_429:
+                return self.retry_after
+            if not self.rpm:
+                return None
+
+            now = time.time()
+            window = [t for t in self._windows.get(model, []) if now - t < 60]
+            self._windows[model] = window
+            if len(window) >= self.rpm:
+                return round(60 - (now - window[0]), 2)
+            window.append(now)
+            return None
+
+    def _answer(self, prompt: str):
+        """(content, latency) from the first matching rule, or a built-in answer."""
+        with self._lock:
+            for rule in self.rules:
+                if rule["match"] in prompt:
+                    response = next(rule["responses"])
+                    if isinstance(response, dict):
+                        return response["content"], float(response.get("latency", 0))
+                    model = rule["latency"] or self.latency
+                    return response, model.sample()
+            return builtin_answer(prompt, self.rng), self.latency.sample()
+
+    @staticmethod
+    def _prompt_text(messages: List[Dict[str, Any]]) -> str:
+        parts = []
+        for message in messages:
+            content = message.get("content")
+            if isinstance(content, str):
+                parts.append(content)
+            elif isinstance(content, list):
+                parts.extend(part.get("text", "") for part in content if part.get("type") == "text")
+        return "\n".join(parts)
+
+    def _ratelimit_headers(self, model: str, retry_after: Optional[float] = None) -> Dict[str, str]:
+        """
+        Rate-limit headers under the names RateLimiter.update_from_response reads
+        (x-ratelimit-remaining, x-ratelimit-reset in seconds, retry-after on a 429).
+        """
+        headers = {}
+        if self.rpm:
+            with self._lock:
+                window = self._windows.get(model, [])
+                used = len(window)
+                reset = 60 - (time.time() - window[0]) if window else 0.0
+            headers = {"x-ratelimit-limit": str(self.rpm),
+                       "x-ratelimit-remaining": str(max(0, self.rpm - used)),
+                       "x-ratelimit-reset": f"{max(0.0, reset):.2f}"}
+
+        if retry_after is not None:
+            headers.update({"retry-after": f"{retry_after:g}",
+                            "x-ratelimit-remaining": "0",
+                            "x-ratelimit-reset": f"{retry_after:.2f}"})
+        return headers
+
+    def completions(self):
+        body = request.get_json(force=True, silent=True) or {}
+        model = body.get("model", "stand-in")
+        stream = bool(body.get("stream"))
+
+        with self._lock:
+            self.counts["requests"] += 1
+            self.per_model[model] = self.per_model.get(model, 0) + 1
+
+        wait = self._rate_limited(model)
+        if wait is not None:
+            self._count("rate_limited")
+            return jsonify({"error": {"message": "Rate limit exceeded", "code": 429}}), 429, \
+                self._ratelimit_headers(model, retry_after=wait)
+
+        if self.rng.random() < self.error_rate:
+            self._count("errors")
+            status = self.rng.choice([500, 503])
+            return jsonify({"error": {"message": "Injected upstream error", "code": status}}), status
+
+        content, latency = self._answer(self._prompt_text(body.get("messages", [])))
+        chunks = [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)] or [""]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        if not stream:
+            try:
+                time.sleep(latency + self.token_delay * len(chunks))
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+            self._count("ok")
+            return jsonify({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 0, "completion_tokens": len(chunks) * 2,
+                          "total_tokens": len(chunks) * 2}
+            }), 200, self._ratelimit_headers(model)
+
+        def events():
+            try:
+                time.sleep(latency)
+                yield ": STAND-IN PROCESSING\n\n"
+                for chunk in chunks:
+                    event = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                             "model": model, "choices": [{"index": 0, "delta": {"content": chunk},
+                                                          "finish_reason": None}]}
+                    yield f"data: {json.dumps(event)}\n\n"
+                    time.sleep(self.token_delay)
+                yield "data: [DONE]\n\n"
+                self._count("ok")
+                self._count("streamed")
+            except GeneratorExit:
+                # Klijent je zatvorio stream (rani prekid)
+                self._count("client_disconnects")
+                raise
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+        return Response(events(), mimetype="text/event-stream", headers=self._ratelimit_headers(model))
+
+
+def create_app(server: StandInServer) -> Flask:
+    app = Flask(__name__)
+
+    @app.route("/chat/completions", methods=["POST"])
+    @app.route("/<path:prefix>/chat/completions", methods=["POST"])
+    def chat_completions(prefix: str = ""):
+        return server.completions()
+
+    @app.route("/stats", methods=["GET"])
+    def stats():
+        return jsonify(server.stats())
+
+    @app.route("/reset", methods=["POST"])
+    def reset():
+        server.reset()
+        return jsonify({"status": "reset"})
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stand-in for Groq and OpenRouter")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="fixed:0.3", help="Time-to-first-token distribution")
+    parser.add_argument("--token-delay", type=float, default=0.01, help="Seconds between streamed chunks")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of an injected 429")
+    parser.add_argument("--rpm", type=int, default=None, help="Requests per minute per model before 429")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After of injected 429s")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500/503")
+    parser.add_argument("--script", default=None, help="JSON file with scripted or recorded responses")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            script = json.load(f)
+
+    server = StandInServer(
+        latency=args.latency,
+        token_delay=args.token_delay,
+        rate_429=args.rate_429,
+        rpm=args.rpm,
+        retry_after=args.retry_after,
+        error_rate=args.error_rate,
+        script=script,
+        seed=args.seed
+    )
+
+    print(f"[StandIn] Serving on http://{args.host}:{args.port} (latency {args.latency}, "
+          f"429 rate {args.rate_429}, rpm {args.rpm}, error rate {args.error_rate})")
+    print(f"[StandIn] GROQ_BASE_URL=http://{args.host}:{args.port}")
+    print(f"[StandIn] OPENROUTER_BASE_URL=http://{args.host}:{args.port}/api/v1")
+    create_app(server).run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
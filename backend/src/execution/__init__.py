@@ -1,5 +1,14 @@
 from .screen_analyzer import ScreenAnalyzer
 from .action_performer import ActionPerformer
 from .executor import Executor
+from .grounding_cache import GroundingCache
+from .template_locator import TemplateLocator
+from .screen_capture import Frame, create_capture_backend
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .model_telemetry import ModelTelemetry, get_model_telemetry
+from .input_backend import InputBackend, create_input_backend
+from .presentation_timing import PresentationTiming
 
-__all__ = ['ScreenAnalyzer', 'ActionPerformer', 'Executor']
\ No newline at end of file
+__all__ = ['ScreenAnalyzer', 'ActionPerformer', 'Executor', 'GroundingCache', 'TemplateLocator', 'Frame', 'create_capture_backend',
+           'RateLimiter', 'get_rate_limiter', 'ModelTelemetry', 'get_model_telemetry',
+           'InputBackend', 'create_input_backend', 'PresentationTiming']
\ No newline at end of file
@@ -1,123 +1,134 @@
 import os
 import time
 import subprocess
-import pyautogui
-from typing import Optional
+from typing import Optional, Callable
 
-# Sigurnosne postavke
-pyautogui. FAILSAFE = True
-pyautogui.PAUSE = 0.3
+from .text_input import TextInput
+from .input_backend import InputBackend, create_input_backend
+from .presentation_timing import PresentationTiming
 
 
 class ActionPerformer:
     """Izvrsava akcije na ekranu."""
-    
-    def __init__(self, slow_mode: bool = True):
+
+    def __init__(
+        self,
+        slow_mode: bool = True,
+        input_backend: Optional[InputBackend] = None,
+        timing: Optional[PresentationTiming] = None
+    ):
+        """
+        Args:
+            slow_mode: Recording pace (SLOW timing) instead of no pauses at all
+            input_backend: Mouse/keyboard backend (default INPUT_BACKEND or pyautogui)
+            timing: Explicit presentation timing, overrides slow_mode
+        """
         self.slow_mode = slow_mode
-        self.screen_width, self. screen_height = pyautogui.size()
+        self.input = input_backend or create_input_backend()
+        self.timing = timing or PresentationTiming.for_mode(slow_mode)
+        self.screen_width, self.screen_height = self.input.size()
+        self.text_input = TextInput(typing_interval=self.timing.typing_interval, input_backend=self.input)
+        # Poziva se jednom, odmah posle unosa a prije prezentacione pauze (npr. prefetch sljedeceg koraka)
+        self.after_input: Optional[Callable[[], None]] = None
         print(f"[ActionPerformer] Initialized")
         print(f"[ActionPerformer] Slow mode: {slow_mode}")
+        print(f"[ActionPerformer] Input backend: {self.input.name}")
         print(f"[ActionPerformer] Screen: {self.screen_width}x{self.screen_height}")
-    
-    def _slow_pause(self, duration: float = 0.3):
-        if self.slow_mode:
-            time. sleep(duration)
-    
-    def click(self, x:  int, y: int) -> bool:
-        """Kliktanje na koordinate"""
+
+    def _input_done(self):
+        callback, self.after_input = self.after_input, None
+        if callback:
+            try:
+                callback()
+            except Exception as e:
+                print(f"[ActionPerformer] after_input error: {e}")
+
+    def _click(self, x: int, y: int, button: str = "left", clicks: int = 1) -> bool:
         try:
-            pyautogui.moveTo(x, y, duration=0.3 if self.slow_mode else 0.1)
-            self._slow_pause(0.1)
-            pyautogui.click(x, y)
-            self._slow_pause(0.3)
+            if self.timing.move_duration > 0:
+                self.input.move(x, y, duration=self.timing.move_duration)
+                self.timing.pause("before_click")
+            self.input.click(x, y, button=button, clicks=clicks)
+            self._input_done()
+            self.timing.pause("after_click")
             return True
         except Exception as e:
             print(f"[ActionPerformer] Error clicking: {e}")
             return False
-    
+
+    def click(self, x:  int, y: int) -> bool:
+        """Kliktanje na koordinate"""
+        return self._click(x, y)
+
     def double_click(self, x: int, y: int) -> bool:
         """Dupli klik na koordinate"""
-        try:
-            pyautogui.moveTo(x, y, duration=0.3 if self. slow_mode else 0.1)
-            self._slow_pause(0.1)
-            pyautogui.doubleClick(x, y)
-            self._slow_pause(0.3)
-            return True
-        except Exception as e: 
-            print(f"[ActionPerformer] Error:  {e}")
-            return False
-    
+        return self._click(x, y, clicks=2)
+
     def right_click(self, x:  int, y: int) -> bool:
         """Desni klik na koordinate"""
-        try: 
-            pyautogui.moveTo(x, y, duration=0.3 if self.slow_mode else 0.1)
-            self._slow_pause(0.1)
-            pyautogui. rightClick(x, y)
-            self._slow_pause(0.3)
-            return True
-        except Exception as e: 
-            print(f"[ActionPerformer] Error:  {e}")
-            return False
-    
+        return self._click(x, y, button="right")
+
     def type_text(self, text:  str) -> bool:
         """Kucanje teksta"""
         try:
-            pyautogui.typewrite(text, interval=0.05 if self.slow_mode else 0.02)
-            self._slow_pause(0.2)
+            self.input.write(text, interval=self.timing.typing_interval)
+            self._input_done()
+            self.timing.pause("after_type")
             return True
         except Exception as e:
             print(f"[ActionPerformer] Error:  {e}")
             return False
-    
-    def type_text_with_clipboard(self, text:  str) -> bool:
-        """Kucanje teksta iz clipboard-a"""
+
+    def type_text_with_clipboard(self, text:  str, input_mode: Optional[str] = None) -> bool:
+        """
+        Unos teksta preko TextInput backend-a.
+
+        Args:
+            input_mode: "clipboard", "inject", "visual" ili "type" (korak ili plan); None = TEXT_INPUT_MODE
+        """
         try:
-            pyautogui.typewrite(text, interval=0.08)
-            time.sleep(1.5)
-            self._slow_pause(0.3)
+            mode = self.text_input.type_text(text, input_mode)
+            print(f"[ActionPerformer] Entered {len(text)} characters ({mode})")
+            self._input_done()
+            self.timing.pause("after_type")
             return True
-
-            # import pyperclip
-            # pyperclip.copy(text)
-            # pyautogui.hotkey("ctrl", "v")
-            # self._slow_pause(0.3)
-            # return True
-        except ImportError:
-            return self.type_text(text)
-        except Exception as e: 
+        except Exception as e:
             print(f"[ActionPerformer] Error:  {e}")
             return False
-    
+
     def press_key(self, key: str) -> bool:
         """Pritiskanje tastera"""
         try:
-            pyautogui.press(key. lower())
-            self._slow_pause(0.2)
+            self.input.press(key.lower())
+            self._input_done()
+            self.timing.pause("after_key")
             return True
         except Exception as e:
             print(f"[ActionPerformer] Error: {e}")
             return False
-    
+
     def key_combination(self, *keys) -> bool:
         """Pritiskanje kombinacije tastera"""
         try:
-            pyautogui.hotkey(*[k.lower() for k in keys])
-            self._slow_pause(0.3)
+            self.input.hotkey(*[k.lower() for k in keys])
+            self._input_done()
+            self.timing.pause("after_hotkey")
             return True
         except Exception as e:
             print(f"[ActionPerformer] Error: {e}")
             return False
-    
+
     def scroll(self, amount: int) -> bool:
         """Skrolovanje (pozitivno je na gore, a negativno na dole)"""
         try:
-            pyautogui.scroll(amount)
-            self._slow_pause(0.3)
+            self.input.scroll(amount)
+            self._input_done()
+            self.timing.pause("after_scroll")
             return True
         except Exception as e:
             print(f"[ActionPerformer] Error: {e}")
             return False
-    
+
     def wait(self, seconds: int) -> bool:
         """Cekanje nekoliko sekundi"""
         print(f"[ActionPerformer] Waiting {seconds}s")
@@ -126,11 +137,11 @@ class ActionPerformer:
             time.sleep(1)
         print("\rOK")
         return True
-    
+
     def open_application(self, app_name: str) -> bool:
         """Ptvaranje aplikacije preko Start menu-a"""
         print(f"[ActionPerformer] Opening:  {app_name}")
-        
+
         # Mapping za poznate aplikacije
         app_paths = {
             "visual studio": [
@@ -142,12 +153,12 @@ class ActionPerformer:
                 r"C:\Program Files\Eclipse\eclipse.exe",
             ]
         }
-        
+
         app_lower = app_name.lower()
-        
+
         # Probaj direktno pokretanje
         if app_lower in app_paths:
-            for path in app_paths[app_lower]: 
+            for path in app_paths[app_lower]:
                 if os.path.exists(path):
                     try:
                         subprocess.Popen([path])
@@ -155,30 +166,29 @@ class ActionPerformer:
                         return True
                     except Exception as e:
                         continue
-        
-        # Fallback:  Start menu
-        try: 
-            pyautogui.press("win")
+
+        # Fallback:  Start menu (cekanja su funkcionalna - meni i pretraga se moraju otvoriti)
+        try:
+            self.input.press("win")
             time.sleep(1)
-            
+
             search_term = app_name
-            pyautogui.typewrite(search_term, interval=0.08)
+            self.input.write(search_term, interval=max(self.timing.typing_interval, 0.02))
             time.sleep(1.5)
-            pyautogui.press("enter")
-            
+            self.input.press("enter")
+
             print(f"[ActionPerformer] Opened via Start menu")
             return True
-            
+
         except Exception as e:
             print(f"[ActionPerformer] Error:  {e}")
             return False
-    
+
     def minimize_all(self) -> bool:
         """Minimizuj sve prozore da bi se vidio desktop"""
         try:
-            pyautogui.hotkey("win", "d")
-            time.sleep(1)
+            self.input.hotkey("win", "d")
             return True
         except Exception as e:
             print(f"[ActionPerformer] Error: {e}")
-            return False
\ No newline at end of file
+            return False
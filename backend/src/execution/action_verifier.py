@@ -0,0 +1,161 @@
+import re
+from typing import Optional, Dict, Any, Tuple
+import numpy as np
+
+from .screen_capture import Frame
+
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+AMBIGUOUS = "ambiguous"
+
+# Akcije poslije kojih nepromijenjen ekran znaci da akcija nije uspjela
+CHANGE_EXPECTED_ACTIONS = {
+    "click", "double_click", "right_click", "type_text", "key_press", "key_combination", "open_application"
+}
+
+# Ocekivani rezultat koji imenuje novi element ("'Create' dialog appears", "error message") - promjena
+# oko tacke klika ne kaze da li je otvoren bas taj element, pa odluku donosi Vision model
+NAMES_NEW_ELEMENT = re.compile(
+    r"['\"].+?['\"]|\b(dialog|window|page|message|error|warning|notification|popup|pop-up)s?\b",
+    re.IGNORECASE
+)
+
+
+class ActionVerifier:
+    """
+    Local verification tier in front of ScreenAnalyzer.verify_action_result.
+
+    Before and after frames are compared around the action point and over the
+    whole screen. No change around the action point fails locally, and a strong
+    change around it passes locally. Borderline diffs, changes without an action
+    point, and expected results that name a specific new element (a dialog, a
+    quoted label) are checked by the vision model.
+    """
+
+    def __init__(
+        self,
+        analyzer,
+        radius: int = 60,
+        factor: int = 4,
+        pixel_threshold: float = 24.0,
+        changed_global: float = 0.01,
+        changed_local: float = 0.3,
+        unchanged_global: float = 0.0005,
+        unchanged_local: float = 0.002
+    ):
+        """
+        Args:
+            analyzer: ScreenAnalyzer used for ambiguous cases
+            radius: Half size of the box compared around the action point (pixels)
+            factor: Downscale factor for the full-screen comparison
+            pixel_threshold: Grayscale difference (0-255) that counts a pixel as changed
+            changed_global: Fraction of changed screen pixels that is clearly a change
+            changed_local: Fraction of changed pixels around the point that is clearly a change
+            unchanged_global: Below this screen fraction (and unchanged_local) nothing happened
+            unchanged_local: Below this fraction around the point nothing happened
+        """
+        self.analyzer = analyzer
+        self.radius = radius
+        self.factor = factor
+        self.pixel_threshold = pixel_threshold
+        self.changed_global = changed_global
+        self.changed_local = changed_local
+        self.unchanged_global = unchanged_global
+        self.unchanged_local = unchanged_local
+
+        self.local_decisions = 0
+        self.escalations = 0
+        self.fused = 0
+
+    def _changed_fraction(self, before: Frame, after: Frame, factor: int,
+                          box: Optional[Tuple[int, int, int, int]] = None) -> float:
+        first, second = before.rgb, after.rgb
+        if box:
+            left, top, right, bottom = box
+            first, second = first[top:bottom, left:right], second[top:bottom, left:right]
+
+        first = first[::factor, ::factor].mean(axis=2, dtype=np.float32)
+        second = second[::factor, ::factor].mean(axis=2, dtype=np.float32)
+        if first.size == 0:
+            return 0.0
+        return float((np.abs(second - first) > self.pixel_threshold).mean())
+
+    def classify(self, before: Frame, after: Frame, point: Optional[Tuple[int, int]] = None,
+                 action: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Decide whether the action clearly changed the screen.
+
+        Returns:
+            {"verdict": "changed" | "unchanged" | "ambiguous", "global_change": float, "local_change": float}
+        """
+        if before.pixels.shape != after.pixels.shape:
+            return {"verdict": CHANGED, "global_change": 1.0, "local_change": 1.0}
+
+        global_change = self._changed_fraction(before, after, self.factor)
+        local_change = 0.0
+
+        if point is not None:
+            x, y = point
+            box = (
+                max(0, x - self.radius), max(0, y - self.radius),
+                min(after.width, x + self.radius), min(after.height, y + self.radius)
+            )
+            local_change = self._changed_fraction(before, after, 1, box)
+
+        if global_change >= self.changed_global or local_change >= self.changed_local:
+            verdict = CHANGED
+        elif (global_change < self.unchanged_global and local_change < self.unchanged_local
+              and (action is None or action in CHANGE_EXPECTED_ACTIONS)):
+            verdict = UNCHANGED
+        else:
+            verdict = AMBIGUOUS
+
+        return {"verdict": verdict, "global_change": round(global_change, 4), "local_change": round(local_change, 4)}
+
+    def verify(self, expected_result: str, before: Frame, after: Frame,
+               point: Optional[Tuple[int, int]] = None, action: Optional[str] = None,
+               next_target: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+        """
+        Verify an action; same result format as ScreenAnalyzer.verify_action_result
+        plus "verdict", "effect" (the action visibly changed the screen) and
+        "source" ("pixel_diff" or "vision").
+
+        Args:
+            next_target: (target, context) of the next step; an escalation then also
+                         locates it in the same vision request (ScreenAnalyzer.verify_and_locate)
+        """
+        check = self.classify(before, after, point, action)
+        check["effect"] = check["verdict"] == CHANGED
+        expected = (expected_result or "").strip()
+
+        if check["verdict"] == UNCHANGED and point is not None:
+            self.local_decisions += 1
+            print("[ActionVerifier] Screen did not change after the action")
+            return dict(check, satisfied=False, confidence=0.8, source="pixel_diff",
+                        description="Screen did not change after the action")
+        # Bez tacke (key_press) postoji samo globalni diff - efekat moze biti premali da se vidi
+
+        if check["verdict"] == CHANGED:
+            print(f"[ActionVerifier] Screen changed (global {check['global_change']}, local {check['local_change']})")
+            if not expected:
+                # Nema ocekivanog stanja - promjena je sve sto se moze provjeriti
+                self.local_decisions += 1
+                return dict(check, satisfied=True, confidence=0.6, source="pixel_diff",
+                            description="Screen changed after the action")
+
+            if point is not None and check["local_change"] >= self.changed_local \
+                    and not NAMES_NEW_ELEMENT.search(expected):
+                self.local_decisions += 1
+                return dict(check, satisfied=True, confidence=0.75, source="pixel_diff",
+                            description="Screen changed around the action point")
+
+        self.escalations += 1
+        if next_target is not None:
+            self.fused += 1
+            result = self.analyzer.verify_and_locate(expected_result, next_target[0], next_target[1], after.image)
+        else:
+            result = self.analyzer.verify_action_result(expected_result, after.image)
+        return dict(result, **check, source="vision")
+
+    def stats(self) -> Dict[str, int]:
+        return {"local_decisions": self.local_decisions, "escalations": self.escalations, "fused": self.fused}
@@ -0,0 +1,279 @@
+import math
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    from scipy import ndimage
+except ImportError:
+    ndimage = None
+
+Box = Tuple[int, int, int, int]
+
+
+def edge_mask(gray: np.ndarray, threshold: float = 40.0) -> np.ndarray:
+    """Pixels with a strong horizontal or vertical intensity step."""
+    gx = np.zeros_like(gray)
+    gy = np.zeros_like(gray)
+    gx[:, 1:] = np.abs(np.diff(gray, axis=1))
+    gy[1:, :] = np.abs(np.diff(gray, axis=0))
+    return np.maximum(gx, gy) > threshold
+
+
+def dilate(mask: np.ndarray, radius: int = 1) -> np.ndarray:
+    """Binary dilation with a square kernel (merges letters of one label into one blob)."""
+    if radius <= 0:
+        return mask
+
+    if cv2 is not None:
+        kernel = np.ones((2 * radius + 1, 2 * radius + 1), np.uint8)
+        return cv2.dilate(mask.astype(np.uint8), kernel) > 0
+
+    out = mask.copy()
+    height, width = mask.shape
+    for dy in range(-radius, radius + 1):
+        for dx in range(-radius, radius + 1):
+            if dx == 0 and dy == 0:
+                continue
+            out[max(0, dy):height + min(0, dy), max(0, dx):width + min(0, dx)] |= \
+                mask[max(0, -dy):height + min(0, -dy), max(0, -dx):width + min(0, -dx)]
+    return out
+
+
+def _components_from_runs(mask: np.ndarray) -> List[Box]:
+    """8-connected component bounding boxes via run-length labeling (NumPy fallback)."""
+    parent: List[int] = []
+    runs: List[Tuple[int, int, int]] = []
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    previous: List[int] = []
+    padded = np.zeros(mask.shape[1] + 2, dtype=np.int8)
+
+    for y in range(mask.shape[0]):
+        padded[1:-1] = mask[y]
+        steps = np.diff(padded)
+        starts = np.flatnonzero(steps == 1)
+        ends = np.flatnonzero(steps == -1)
+
+        current = []
+        j = 0
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            index = len(runs)
+            runs.append((y, start, end))
+            parent.append(index)
+            current.append(index)
+
+            while j < len(previous) and runs[previous[j]][2] < start:
+                j += 1
+            k = j
+            while k < len(previous) and runs[previous[k]][1] <= end:
+                root_a, root_b = find(index), find(previous[k])
+                if root_a != root_b:
+                    parent[root_b] = root_a
+                k += 1
+
+        previous = current
+
+    boxes = {}
+    for index, (y, start, end) in enumerate(runs):
+        root = find(index)
+        box = boxes.get(root)
+        if box is None:
+            boxes[root] = [start, y, end, y + 1]
+        else:
+            box[0] = min(box[0], start)
+            box[1] = min(box[1], y)
+            box[2] = max(box[2], end)
+            box[3] = max(box[3], y + 1)
+
+    return [tuple(box) for box in boxes.values()]
+
+
+def connected_boxes(mask: np.ndarray) -> List[Box]:
+    """Bounding boxes (left, top, right, bottom) of the connected components of a mask."""
+    if cv2 is not None:
+        count, _, stats, _ = cv2.connectedComponentsWithStats(mask.astype(np.uint8), connectivity=8)
+        return [
+            (int(x), int(y), int(x + w), int(y + h))
+            for x, y, w, h, _ in stats[1:count]
+        ]
+
+    if ndimage is not None:
+        labels, _ = ndimage.label(mask, structure=np.ones((3, 3)))
+        return [
+            (s[1].start, s[0].start, s[1].stop, s[0].stop)
+            for s in ndimage.find_objects(labels) if s is not None
+        ]
+
+    return _components_from_runs(mask)
+
+
+def box_iou(first: Box, second: Box) -> float:
+    left, top = max(first[0], second[0]), max(first[1], second[1])
+    right, bottom = min(first[2], second[2]), min(first[3], second[3])
+    inter = max(0, right - left) * max(0, bottom - top)
+    if inter == 0:
+        return 0.0
+    area = lambda b: (b[2] - b[0]) * (b[3] - b[1])
+    return inter / float(area(first) + area(second) - inter)
+
+
+def clip_box(box: Box, region: Box, min_size: int = 4) -> Optional[Box]:
+    """Part of the box inside the region, or None if (almost) nothing of it is inside."""
+    left, top = max(box[0], region[0]), max(box[1], region[1])
+    right, bottom = min(box[2], region[2]), min(box[3], region[3])
+    if right - left < min_size or bottom - top < min_size:
+        return None
+    return left, top, right, bottom
+
+
+def dedupe_boxes(boxes: List[Box], max_iou: float = 0.7) -> List[Box]:
+    """Drop boxes that overlap an earlier (preferred) box by more than max_iou."""
+    kept: List[Box] = []
+    for box in boxes:
+        if all(box_iou(box, other) <= max_iou for other in kept):
+            kept.append(box)
+    return kept
+
+
+def propose_boxes(
+    screenshot: Image.Image,
+    region: Optional[Box] = None,
+    factor: int = 2,
+    edge_threshold: float = 40.0,
+    merge_radius: int = 2,
+    min_size: int = 10,
+    max_fraction: float = 0.2,
+    max_boxes: int = 60,
+    typical_size: Tuple[int, int] = (90, 28)
+) -> List[Box]:
+    """
+    Candidate UI element boxes from edges and connected components.
+
+    Args:
+        screenshot: Full screen image
+        region: Optional (left, top, right, bottom) area to search; boxes are still in screen pixels
+        factor: Downscale factor of the analyzed grid
+        edge_threshold: Intensity step (0-255) that counts as an edge
+        merge_radius: Dilation radius on the grid (joins letters and icon parts)
+        min_size: Minimum box width and height in screen pixels
+        max_fraction: Maximum box area as a fraction of the analyzed area
+        max_boxes: How many boxes to return (closest to typical_size first)
+        typical_size: (width, height) of a typical control, used for ranking
+
+    Returns:
+        Boxes in screen pixels, in reading order (top to bottom, left to right)
+    """
+    offset_x, offset_y = (region[0], region[1]) if region else (0, 0)
+    image = screenshot.crop(region) if region else screenshot
+
+    small = image.convert("L").resize(
+        (max(1, image.width // factor), max(1, image.height // factor)), Image.Resampling.BILINEAR
+    )
+    gray = np.asarray(small, dtype=np.float32)
+    mask = dilate(edge_mask(gray, edge_threshold), merge_radius)
+
+    area_limit = max_fraction * image.width * image.height
+    typical_area = typical_size[0] * typical_size[1]
+    boxes = []
+
+    # Dilatacija siri svaku komponentu za merge_radius celija na svaku stranu
+    grow = merge_radius
+
+    for left, top, right, bottom in connected_boxes(mask):
+        left, top = min(left + grow, right - 1), min(top + grow, bottom - 1)
+        right, bottom = max(right - grow, left + 1), max(bottom - grow, top + 1)
+        box = (
+            offset_x + left * factor, offset_y + top * factor,
+            offset_x + right * factor, offset_y + bottom * factor
+        )
+        width, height = box[2] - box[0], box[3] - box[1]
+        if width < min_size or height < min_size or width * height > area_limit:
+            continue
+        if max(width, height) > 30 * min(width, height):
+            continue
+        boxes.append(box)
+
+    boxes.sort(key=lambda b: abs(math.log((b[2] - b[0]) * (b[3] - b[1]) / typical_area)))
+    boxes = dedupe_boxes(boxes)[:max_boxes]
+    boxes.sort(key=lambda b: (b[1] // 20, b[0]))
+    return boxes
+
+
+def nearest_box(boxes: List[Box], x: int, y: int, max_distance: int = 40) -> Optional[Box]:
+    """
+    Box containing the point (smallest one if several do), otherwise the
+    closest box within max_distance pixels.
+    """
+    containing = [b for b in boxes if b[0] <= x < b[2] and b[1] <= y < b[3]]
+    if containing:
+        return min(containing, key=lambda b: (b[2] - b[0]) * (b[3] - b[1]))
+
+    best, best_distance = None, max_distance
+    for box in boxes:
+        dx = max(box[0] - x, 0, x - box[2] + 1)
+        dy = max(box[1] - y, 0, y - box[3] + 1)
+        distance = math.hypot(dx, dy)
+        if distance <= best_distance:
+            best, best_distance = box, distance
+    return best
+
+
+def refine_point(
+    screenshot: Image.Image,
+    x: int,
+    y: int,
+    window: Tuple[int, int] = (200, 100),
+    max_shift: int = 40
+) -> Optional[Dict[str, Any]]:
+    """
+    Snap a point from a downscaled vision answer to the nearest element box
+    found in a small full-resolution window around it.
+
+    Args:
+        window: (width, height) of the searched window around the point
+        max_shift: Maximum distance (pixels) between the point and the element box
+
+    Returns:
+        {"x", "y", "box", "shift"} or None if no suitable box is near the point
+    """
+    half_w, half_h = window[0] // 2, window[1] // 2
+    region = (
+        max(0, x - half_w), max(0, y - half_h),
+        min(screenshot.width, x + half_w), min(screenshot.height, y + half_h)
+    )
+    if region[2] - region[0] < 8 or region[3] - region[1] < 8:
+        return None
+
+    boxes = propose_boxes(
+        screenshot, region, factor=1, merge_radius=2, min_size=6, max_fraction=0.5, max_boxes=40
+    )
+    box = nearest_box(boxes, x, y, max_distance=max_shift)
+    if box is None:
+        return None
+
+    # Box dodiruje ivicu prozora (po x ili y) - vjerovatno veci element od prozora, tacka se ne pomjera.
+    # Ivice se detektuju par piksela unutar prozora, pa se dodir racuna sa tolerancijom;
+    # ivica ekrana nije ivica prozora, tamo se element zaista zavrsava.
+    edge = 3
+    if (box[0] <= region[0] + edge and region[0] > 0
+            or box[2] >= region[2] - edge and region[2] < screenshot.width
+            or box[1] <= region[1] + edge and region[1] > 0
+            or box[3] >= region[3] - edge and region[3] < screenshot.height):
+        return None
+
+    new_x, new_y = (box[0] + box[2]) // 2, (box[1] + box[3]) // 2
+    shift = math.hypot(new_x - x, new_y - y)
+
+    return {"x": new_x, "y": new_y, "box": box, "shift": round(shift, 1)}
+
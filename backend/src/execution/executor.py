@@ -3,26 +3,46 @@ import json
 import time
 import re
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 from . screen_analyzer import ScreenAnalyzer
 from .action_performer import ActionPerformer
+from .screen_capture import Frame
+from .screen_settle import ScreenSettle
+from .action_verifier import ActionVerifier
+from .retry_engine import RetryEngine
 from .. models import TaskPlan, Step, ActionType
 from ..screen_recorder import ScreenRecorder
 
 
 class Executor:
-    def __init__(self, slow_mode: bool = True, verify_steps: bool = False, record_video: bool = True):
+    def __init__(self, slow_mode: bool = True, verify_steps: bool = False, record_video: bool = True,
+                 lookahead_steps: int = 3):
         """
         Args:
             slow_mode:  Sporije izvršavanje (bolje za snimanje)
             verify_steps: Da li verificirati svaki korak sa Vision AI
             record_video: Da li snimati ekran tokom izvršavanja
+            lookahead_steps: Koliko narednih elemenata traziti u istom Vision zahtjevu (0 = iskljuceno)
         """
         self.analyzer = ScreenAnalyzer()
         self.performer = ActionPerformer(slow_mode=slow_mode)
         self.verify_steps = verify_steps
         self.slow_mode = slow_mode
         self.record_video = record_video
+        self.lookahead_steps = lookahead_steps
+        
+        # Nacin unosa teksta zadat na nivou plana (korak ga moze promijeniti)
+        self.input_mode: Optional[str] = None
+        
+        # Cekanje dok se ekran ne smiri (fiksna cekanja su samo gornja granica)
+        self.settle = ScreenSettle(self.analyzer.capture)
+        
+        # Lokalna verifikacija (pixel diff), Vision AI samo za nejasne slucajeve
+        self.verifier = ActionVerifier(self.analyzer)
+        
+        # Retry sa eskalacijom trazenja i sinonimima elemenata iz ontologije
+        from ..ontology.ontology_manager import OntologyManager
+        self.retry = RetryEngine(self.analyzer, self.settle, synonyms=OntologyManager.get_target_synonyms)
         
         # Screen recorder
         self.recorder = ScreenRecorder(output_dir="videos") if record_video else None
@@ -56,12 +76,13 @@ class Executor:
         print(entry)
         self.log.append(entry)
     
-    def _save_screenshot(self, name: str) -> str:
+    def _save_screenshot(self, name: str, frame: Optional[Frame] = None) -> str:
+        """Sacuvaj screenshot (postojeci frame ako je vec uhvacen, inace novi)"""
         self.screenshot_counter += 1
         filename = f"{self.screenshot_counter:03d}_{name}.png"
         filepath = os.path.join(self.screenshots_dir, filename)
-        screenshot = self.analyzer.take_screenshot()
-        screenshot. save(filepath)
+        screenshot = frame.image if frame is not None else self.analyzer.take_screenshot()
+        screenshot.save(filepath)
         return filepath
     
     def _get_click_context(self, target: str) -> str:
@@ -88,6 +109,40 @@ class Executor:
         else:
             return f"Look for a clickable UI element labeled '{target}'."
     
+    def _grounding_context(self, step: Step) -> Optional[str]:
+        """Context za Vision AI ako korak trazi element na ekranu, inace None"""
+        if step.action in [ActionType.CLICK, ActionType.DOUBLE_CLICK, ActionType.RIGHT_CLICK]:
+            return self._get_click_context(step.target)
+        if step.action == ActionType.TYPE_TEXT and step.target.lower() not in ["editor", "code editor", "screen", ""]:
+            return f"Look for an INPUT FIELD or TEXT BOX labeled '{step.target}'."
+        return None
+    
+    def _lookahead_targets(self, steps: List[Step], index: int) -> List[Tuple[str, str]]:
+        """Elementi narednih koraka koji bi mogli biti vidljivi na trenutnom ekranu"""
+        targets = []
+        
+        for step in steps[index + 1:]:
+            if len(targets) >= self.lookahead_steps:
+                break
+            if step.action == ActionType.OPEN_APPLICATION:
+                break
+            
+            context = self._grounding_context(step)
+            if context is not None:
+                targets.append((step.target, context))
+        
+        return targets
+    
+    def _next_target(self, steps: List[Step], index: int) -> Optional[Tuple[str, str]]:
+        """Prvi naredni element koji treba traziti (spaja se sa verifikacijom koraka index)"""
+        for step in steps[index + 1:]:
+            if step.action == ActionType.OPEN_APPLICATION:
+                return None
+            context = self._grounding_context(step)
+            if context is not None:
+                return step.target, context
+        return None
+    
     def _parse_wait_value(self, value) -> int:
         """Parsiraj wait value - uvijek vrati broj"""
         if value is None:
@@ -100,8 +155,17 @@ class Executor:
                 return int(numbers[0])
         return 3
     
-    def execute_step(self, step: Step, max_retries: int = 3) -> Dict[str, Any]:
-        """Izvrsavanje jednog koraka"""
+    def execute_step(self, step: Step, max_retries: Optional[int] = None,
+                     lookahead: Optional[List[Tuple[str, str]]] = None,
+                     next_target: Optional[Tuple[str, str]] = None) -> Dict[str, Any]:
+        """
+        Izvrsavanje jednog koraka
+        
+        Args:
+            max_retries: Najvise pokusaja (None = RETRY_MAX_ATTEMPTS)
+            lookahead: Elementi narednih koraka koji se traze zajedno sa ovim
+            next_target: Element sljedeceg koraka - trazi se u istom Vision pozivu kao verifikacija ovog
+        """
         result = {
             "step_id": step.id,
             "action":  step.action.value,
@@ -112,150 +176,152 @@ class Executor:
         
         action = step.action
         target = step.target
-        value = step.value
         
         self._log(f"STEP {step.id}: {action.value.upper()} → {target}", "ACTION")
         if step.description:
             print(f"{step.description}")
         
-        for attempt in range(max_retries):
-            if attempt > 0:
-                self._log(f"Retry {attempt + 1}/{max_retries}...", "WARN")
-                time.sleep(2)
-            
-            try:
-                success = False
-                
-                # -------------------- Open Application --------------------
-                if action == ActionType.OPEN_APPLICATION:
-                    self._log("Minimizing all windows...", "ACTION")
-                    self.performer.minimize_all()
-                    time.sleep(1)
-                    self._save_screenshot("01_clean_desktop")
-                    
-                    success = self.performer.open_application(target)
-                    
-                    if success:
-                        self._save_screenshot(f"02_opening_{target.replace(' ', '_')}")
-                
-                # -------------------- Wait --------------------
-                elif action == ActionType.WAIT:
-                    wait_time = self._parse_wait_value(value)
-                    self._log(f"Waiting for {wait_time} seconds...", "WAIT")
-                    success = self.performer.wait(wait_time)
-                
-                # -------------------- Click --------------------
-                elif action == ActionType.CLICK: 
-                    context = self._get_click_context(target)
-                    self._log(f"Looking for element: '{target}'", "VISION")
-                    
-                    element = self.analyzer.find_element_coordinates(target, context)
-                    
-                    if element and element.get("found"):
-                        x, y = element["x"], element["y"]
-                        self._log(f"Clicking at ({x}, {y})", "CLICK")
-                        success = self.performer.click(x, y)
-                        
-                        if success:
-                            self._save_screenshot(f"click_{target.replace(' ', '_')[:15]}")
-                            time.sleep(0.5)
-                    else:
-                        self._log(f"Element '{target}' not found!", "ERROR")
-                        success = False
-                
-                # -------------------- Double Click --------------------
-                elif action == ActionType.DOUBLE_CLICK:
-                    context = self._get_click_context(target)
-                    element = self.analyzer.find_element_coordinates(target, context)
-                    
-                    if element and element.get("found"):
-                        success = self.performer.double_click(element["x"], element["y"])
-                        time.sleep(0.5)
-                    else:
-                        success = False
-                
-                # -------------------- Right Click --------------------
-                elif action == ActionType.RIGHT_CLICK:
-                    context = self._get_click_context(target)
-                    element = self.analyzer.find_element_coordinates(target, context)
-                    
-                    if element and element. get("found"):
-                        success = self.performer.right_click(element["x"], element["y"])
-                        time.sleep(0.5)
-                    else:
-                        success = False
-                
-                # -------------------- Type Text --------------------
-                elif action == ActionType.TYPE_TEXT: 
-                    if target. lower() not in ["editor", "code editor", "screen", ""]:
-                        context = f"Look for an INPUT FIELD or TEXT BOX labeled '{target}'."
-                        self._log(f"Looking for field: '{target}'", "VISION")
-                        
-                        element = self.analyzer. find_element_coordinates(target, context)
-                        
-                        if element and element.get("found"):
-                            self. performer.click(element["x"], element["y"])
-                            time.sleep(0.3)
-                    
-                    if value:
-                        self._log(f"Typing:  '{value[: 50]}{'...' if len(value) > 50 else ''}'", "TYPE")
-                        success = self.performer.type_text_with_clipboard(value)
-                        time.sleep(0.3)
-                    else:
-                        success = True
-                
-                # -------------------- Key Press --------------------
-                elif action == ActionType.KEY_PRESS:
-                    key = (value or target).lower()
-                    self._log(f"Pressing:  {key}", "TYPE")
-                    success = self.performer.press_key(key)
-                    time.sleep(0.3)
-                
-                # -------------------- Key Combination --------------------
-                elif action == ActionType.KEY_COMBINATION:
-                    combo = (value or target).lower().replace(" ", "")
-                    keys = combo.split("+")
-                    self._log(f"Combination: {'+'.join(keys)}", "TYPE")
-                    success = self. performer.key_combination(*keys)
-                    time.sleep(0.3)
-                
-                # -------------------- Scroll --------------------
-                elif action == ActionType.SCROLL: 
-                    amount = int(value) if value else -3
-                    success = self.performer.scroll(amount)
-                    time.sleep(0.3)
-                
-                # -------------------- Unknown Action --------------------
-                else:
-                    self._log(f"Unknown action: {action}", "WARN")
-                    success = False
-                
-                # -------------------- Verification --------------------
-                if success and self.verify_steps and step.expected_result:
-                    time.sleep(1)
-                    verification = self.analyzer.verify_action_result(step.expected_result)
-                    
-                    if verification. get("satisfied"):
-                        result["success"] = True
-                        self._log(f"Step {step.id} verified", "SUCCESS")
-                        return result
-                    else:
-                        self._log("Verification failed, retrying...", "WARN")
-                        result["retries"] = attempt + 1
-                        continue
-                
-                elif success:
-                    result["success"] = True
-                    self._log(f"Step {step.id} OK", "SUCCESS")
-                    return result
-                
-            except Exception as e:
-                self._log(f"Error:  {e}", "ERROR")
-                result["retries"] = attempt + 1
+        context = self._grounding_context(step)
+        if context is not None:
+            self._log(f"Looking for element: '{target}'", "VISION")
+        
+        def perform(element: Optional[Dict[str, Any]]) -> bool:
+            return self._perform_attempt(step, element, next_target)
+        
+        try:
+            result["success"] = self.retry.run(
+                target, context, perform,
+                locate=lambda t, c: self.analyzer.find_element_coordinates(t, c, lookahead=lookahead),
+                result=result,
+                max_attempts=max_retries,
+                optional_target=action == ActionType.TYPE_TEXT
+            )
+        except Exception as e:
+            self._log(f"Error:  {e}", "ERROR")
         
-        self._log(f"Step {step. id} FAILED", "ERROR")
+        if result["success"]:
+            self._log(f"Step {step.id} {'verified' if self.verify_steps and step.expected_result else 'OK'}", "SUCCESS")
+        else:
+            self._log(f"Step {step. id} FAILED", "ERROR")
         return result
     
+    def _perform_attempt(self, step: Step, element: Optional[Dict[str, Any]],
+                         next_target: Optional[Tuple[str, str]] = None) -> bool:
+        """Jedan pokusaj koraka: akcija, screenshot za arhivu i verifikacija"""
+        action = step.action
+        target = step.target
+        value = step.value
+        
+        success = False
+        archive_name = None
+        
+        # Frame prije akcije (za lokalnu verifikaciju)
+        before = self.analyzer.capture_frame() if self.verify_steps and step.expected_result else None
+        
+        # -------------------- Open Application --------------------
+        if action == ActionType.OPEN_APPLICATION:
+            self._log("Minimizing all windows...", "ACTION")
+            self.performer.minimize_all()
+            self.settle.wait(1.5, require_change=True)
+            self._save_screenshot("01_clean_desktop")
+            
+            success = self.performer.open_application(target)
+            
+            if success:
+                self._save_screenshot(f"02_opening_{target.replace(' ', '_')}")
+        
+        # -------------------- Wait --------------------
+        elif action == ActionType.WAIT:
+            wait_time = self._parse_wait_value(value)
+            self._log(f"Waiting up to {wait_time} seconds (until the screen settles)...", "WAIT")
+            self.settle.wait_for_load(wait_time)
+            success = True
+        
+        # -------------------- Click --------------------
+        elif action == ActionType.CLICK: 
+            x, y = element["x"], element["y"]
+            self._log(f"Clicking at ({x}, {y})", "CLICK")
+            success = self.performer.click(x, y)
+            
+            if success:
+                archive_name = f"click_{target.replace(' ', '_')[:15]}"
+                self.settle.wait(0.5)
+        
+        # -------------------- Double Click --------------------
+        elif action == ActionType.DOUBLE_CLICK:
+            success = self.performer.double_click(element["x"], element["y"])
+            self.settle.wait(0.5)
+        
+        # -------------------- Right Click --------------------
+        elif action == ActionType.RIGHT_CLICK:
+            success = self.performer.right_click(element["x"], element["y"])
+            self.settle.wait(0.5)
+        
+        # -------------------- Type Text --------------------
+        elif action == ActionType.TYPE_TEXT: 
+            if element and element.get("found"):
+                self. performer.click(element["x"], element["y"])
+                # Polje mora dobiti fokus prije unosa (zavrsava cim se ekran smiri)
+                self.settle.wait(0.3)
+            
+            if value:
+                self._log(f"Typing:  '{value[: 50]}{'...' if len(value) > 50 else ''}'", "TYPE")
+                success = self.performer.type_text_with_clipboard(value, step.input_mode or self.input_mode)
+            else:
+                success = True
+        
+        # -------------------- Key Press --------------------
+        elif action == ActionType.KEY_PRESS:
+            key = (value or target).lower()
+            self._log(f"Pressing:  {key}", "TYPE")
+            success = self.performer.press_key(key)
+        
+        # -------------------- Key Combination --------------------
+        elif action == ActionType.KEY_COMBINATION:
+            combo = (value or target).lower().replace(" ", "")
+            keys = combo.split("+")
+            self._log(f"Combination: {'+'.join(keys)}", "TYPE")
+            success = self. performer.key_combination(*keys)
+        
+        # -------------------- Scroll --------------------
+        elif action == ActionType.SCROLL: 
+            amount = int(value) if value else -3
+            success = self.performer.scroll(amount)
+        
+        # -------------------- Unknown Action --------------------
+        else:
+            self._log(f"Unknown action: {action}", "WARN")
+            success = False
+        
+        # -------------------- Screenshot after action --------------------
+        verify = bool(success and self.verify_steps and step.expected_result)
+        frame = None
+        
+        if verify:
+            # Frame na kojem se ekran smirio koristi se za arhivu i verifikaciju
+            frame = self.settle.wait(1, require_change=True)
+        
+        if success and (archive_name or verify):
+            # Jedan frame za arhivu i verifikaciju
+            frame = frame or self.analyzer.capture_frame()
+            if archive_name:
+                self._save_screenshot(archive_name, frame)
+        
+        # -------------------- Verification --------------------
+        if verify:
+            point = (element["x"], element["y"]) if element and element.get("found") else None
+            verification = self.verifier.verify(step.expected_result, before, frame, point, action.value,
+                                                next_target=next_target)
+            
+            if not verification. get("satisfied"):
+                self._log("Verification failed, retrying...", "WARN")
+                return False
+            
+            if element and element.get("found"):
+                self.analyzer.confirm_element(element)
+        
+        return success
+    
     def execute_plan(self, plan: TaskPlan, video_name: Optional[str] = None) -> Dict[str, Any]:
         """Izvrsavanje plana"""
 
@@ -269,6 +335,10 @@ class Executor:
             "video_path": None
         }
         
+        self.settle.reset_stats()
+        self.retry.reset_stats()
+        self.input_mode = plan.input_mode
+        
         print("\n" + "=" * 70)
         print("STARTING EXECUTION")
         print("=" * 70)
@@ -276,7 +346,8 @@ class Executor:
         print(f"Steps: {len(plan.steps)}")
         print(f"Recording: {'YES' if self.record_video else 'NO'}")
         print("=" * 70)
-        print("\nMove mouse to TOP LEFT CORNER to STOP!\n")
+        if self.performer.input.failsafe:
+            print("\nMove mouse to TOP LEFT CORNER to STOP!\n")
         
         # Pokreni snimanje ukoliko je omoguceno
         video_path = None
@@ -295,10 +366,11 @@ class Executor:
         
         try:
             # Izvrsavanje koraka
-            for step in plan. steps:
+            for index, step in enumerate(plan.steps):
                 print(f"\n{'─' * 60}")
                 
-                step_result = self.execute_step(step)
+                step_result = self.execute_step(step, lookahead=self._lookahead_targets(plan.steps, index),
+                                                next_target=self._next_target(plan.steps, index))
                 results["steps"].append(step_result)
                 
                 if step_result["success"]:
@@ -306,6 +378,10 @@ class Executor:
                 else:
                     results["failed_steps"] += 1
                     self._log("Continuing with next step...", "WARN")
+                
+                # Pauza izmedju koraka dolazi iz PresentationTiming (0 bez slow_mode)
+                if self.performer.timing.between_steps > 0:
+                    self.settle.wait(self.performer.timing.between_steps)
             
         except Exception as e:
             self._log(f"Critical error: {e}", "ERROR")
@@ -322,6 +398,10 @@ class Executor:
         
         # Rezultat
         results["success"] = results["failed_steps"] == 0
+        results["settle"] = self.settle.stats()
+        results["verification"] = self.verifier.stats()
+        results["retry"] = self.retry.stats()
+        self.analyzer.flush()
         
         print("\n" + "=" * 70)
         print("EXECUTION RESULT")
@@ -329,6 +409,7 @@ class Executor:
         print(f"Successful: {results['successful_steps']}/{results['total_steps']}")
         print(f"Failed: {results['failed_steps']}")
         print(f"Status: {'SUCCESS' if results['success'] else 'PARTIAL'}")
+        print(f"Time saved by settle waits: {results['settle']['saved_s']}s")
         
         if results. get("video_path"):
             print(f"\nVIDEO:  {results['video_path']}")
@@ -360,7 +441,8 @@ class Executor:
                 target=step_data. get("target", "screen"),
                 value=step_data.get("value"),
                 description=step_data. get("description", ""),
-                expected_result=step_data.get("expected_result", "")
+                expected_result=step_data.get("expected_result", ""),
+                input_mode=step_data.get("input_mode")
             ))
         
         plan = TaskPlan(
@@ -368,7 +450,8 @@ class Executor:
             goal=plan_data. get("goal", ""),
             prerequisites=plan_data.get("prerequisites", []),
             steps=steps,
-            success_criteria=plan_data.get("success_criteria", "")
+            success_criteria=plan_data.get("success_criteria", ""),
+            input_mode=plan_data.get("input_mode")
         )
         
         # Generisanje imena videa ukoliko nije vec definisano
@@ -0,0 +1,269 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+import numpy as np
+from PIL import Image
+
+
+def screen_fingerprint(
+    screenshot: Image.Image,
+    region: Optional[Tuple[int, int, int, int]] = None,
+    hash_size: int = 16
+) -> str:
+    """
+    Perceptual difference hash (dHash) of a screenshot or of one region of it.
+
+    Args:
+        screenshot: Full screen image
+        region: Optional (left, top, right, bottom) box to hash instead of the whole screen
+        hash_size: Hash grid size, the fingerprint has hash_size^2 bits
+
+    Returns:
+        Fingerprint as a hex string
+    """
+    image = screenshot.crop(region) if region else screenshot
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR, reducing_gap=2.0)
+    pixels = np.asarray(small, dtype=np.int16)
+
+    # Bit po paru susjednih piksela u redu, red po red (prvi bit je najznacajniji)
+    diff = (pixels[:, :-1] > pixels[:, 1:]).ravel()
+    bits = int("".join("1" if bit else "0" for bit in diff), 2)
+
+    return f"{bits:0{hash_size * hash_size // 4}x}"
+
+
+def patch_box(screenshot: Image.Image, x: int, y: int, size: Tuple[int, int] = (96, 48)) -> Tuple[int, int, int, int]:
+    """Box of the given size around a point, kept inside the screen."""
+    width, height = min(size[0], screenshot.width), min(size[1], screenshot.height)
+    left = max(0, min(x - width // 2, screenshot.width - width))
+    top = max(0, min(y - height // 2, screenshot.height - height))
+    return left, top, left + width, top + height
+
+
+def fingerprint_distance(first: str, second: str) -> int:
+    """Hamming distance between two fingerprints (number of differing bits)."""
+    if len(first) != len(second):
+        return len(first) * 4
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
+
+
+class GroundingCache:
+    """
+    LRU cache of grounding results keyed by (target, context, screen fingerprint).
+
+    The whole-screen fingerprint barely moves for small changes (an open dropdown,
+    a hover highlight), so each entry also keeps a fingerprint of the patch around
+    the cached point; a hit is only returned if that patch still looks the same
+    on the current frame.
+    """
+
+    def __init__(self, max_entries: int = 256, max_distance: int = 3, cache_path: Optional[str] = None,
+                 patch_max_distance: int = 8, save_every: int = 10):
+        """
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            max_distance: Maximum fingerprint distance that still counts as the same screen
+            cache_path: Optional JSON file used as the on-disk tier
+            patch_max_distance: Maximum distance (of 64 bits) of the patch around the cached point
+            save_every: Changes collected before the on-disk tier is rewritten (flush() writes the rest)
+        """
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.cache_path = cache_path
+        self.patch_max_distance = patch_max_distance
+        self.save_every = max(1, save_every)
+        self._unsaved = 0
+
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_patches = 0
+
+        if self.cache_path:
+            self._load()
+
+    @staticmethod
+    def _normalize(target: str, context: str) -> Tuple[str, str]:
+        return target.strip().lower(), context.strip()
+
+    def _find_key(self, target_key: str, context_key: str, fingerprint: str) -> Optional[Tuple[str, str, str]]:
+        key = (target_key, context_key, fingerprint)
+        if key in self._entries:
+            return key
+
+        if self.max_distance > 0:
+            # No exact hit - accept a nearly identical screen
+            for candidate in reversed(self._entries):
+                if candidate[0] != target_key or candidate[1] != context_key:
+                    continue
+                if fingerprint_distance(candidate[2], fingerprint) <= self.max_distance:
+                    return candidate
+
+        return None
+
+    @staticmethod
+    def _patch_fingerprint(screenshot: Image.Image, result: Dict[str, Any]) -> Optional[str]:
+        if "x" not in result or "y" not in result:
+            return None
+        return screen_fingerprint(screenshot, patch_box(screenshot, int(result["x"]), int(result["y"])), hash_size=8)
+
+    def _patch_matches(self, entry: Dict[str, Any], screenshot: Optional[Image.Image]) -> bool:
+        patch = entry.get("_patch")
+        if screenshot is None or patch is None:
+            return True
+        return fingerprint_distance(patch, self._patch_fingerprint(screenshot, entry)) <= self.patch_max_distance
+
+    def get(self, target: str, context: str, fingerprint: str,
+            screenshot: Optional[Image.Image] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for this target on a matching screen, or None.
+
+        Args:
+            screenshot: Current frame; the patch around the cached point must still match it
+        """
+        target_key, context_key = self._normalize(target, context)
+
+        with self._lock:
+            key = self._find_key(target_key, context_key, fingerprint)
+            entry = self._entries[key] if key is not None else None
+
+        # Ekran je u cjelini isti, ali se oko elementa nesto promijenilo (dropdown, hover)
+        stale = entry is not None and not self._patch_matches(entry, screenshot)
+
+        with self._lock:
+            if stale:
+                self.stale_patches += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+            result = dict(entry)
+        result.pop("_patch", None)
+        return result
+
+    def contains(self, target: str, context: str, fingerprint: str,
+                 screenshot: Optional[Image.Image] = None) -> bool:
+        """Check for a matching entry without touching LRU order or counters."""
+        target_key, context_key = self._normalize(target, context)
+
+        with self._lock:
+            key = self._find_key(target_key, context_key, fingerprint)
+            entry = self._entries[key] if key is not None else None
+        return entry is not None and self._patch_matches(entry, screenshot)
+
+    def put(self, target: str, context: str, fingerprint: str, result: Dict[str, Any],
+            screenshot: Optional[Image.Image] = None):
+        """
+        Store a successful grounding result.
+
+        Args:
+            screenshot: Frame the result was found on; the patch around the point is kept with it
+        """
+        target_key, context_key = self._normalize(target, context)
+        entry = dict(result)
+        entry.pop("_patch", None)
+        if screenshot is not None:
+            patch = self._patch_fingerprint(screenshot, entry)
+            if patch is not None:
+                entry["_patch"] = patch
+
+        with self._lock:
+            key = (target_key, context_key, fingerprint)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._unsaved += 1
+            save = self._unsaved >= self.save_every
+
+        if self.cache_path and save:
+            self._save()
+
+    def flush(self):
+        """Write unsaved changes to the on-disk tier."""
+        if self.cache_path and self._unsaved:
+            self._save()
+
+    def invalidate(self, target: Optional[str] = None, fingerprint: Optional[str] = None) -> int:
+        """
+        Remove entries for a target and/or a screen fingerprint.
+        Without arguments the whole cache is cleared.
+
+        Returns:
+            Number of removed entries
+        """
+        target_key = target.strip().lower() if target else None
+
+        with self._lock:
+            stale = [
+                key for key in self._entries
+                if (target_key is None or key[0] == target_key)
+                and (fingerprint is None or fingerprint_distance(key[2], fingerprint) <= self.max_distance)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            self._unsaved += len(stale)
+
+        if stale:
+            # Pogresne lokacije ne smiju da prezive restart
+            self.flush()
+
+        return len(stale)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "stale_patches": self.stale_patches,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+    def _load(self):
+        if not os.path.exists(self.cache_path):
+            return
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            for entry in data.get("entries", [])[-self.max_entries:]:
+                key = (entry["target"], entry["context"], entry["fingerprint"])
+                self._entries[key] = entry["result"]
+
+            print(f"[GroundingCache] Loaded {len(self._entries)} entries from {self.cache_path}")
+        except Exception as e:
+            print(f"[GroundingCache] Could not load cache: {e}")
+
+    def _save(self):
+        with self._lock:
+            entries = [
+                {"target": key[0], "context": key[1], "fingerprint": key[2], "result": result}
+                for key, result in self._entries.items()
+            ]
+            self._unsaved = 0
+
+            try:
+                folder = os.path.dirname(self.cache_path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+
+                tmp_path = self.cache_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"entries": entries}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.cache_path)
+            except Exception as e:
+                print(f"[GroundingCache] Could not save cache: {e}")
@@ -0,0 +1,269 @@
+import os
+import time
+from typing import Optional, Dict, Type, Tuple
+try:
+    import pyautogui
+except Exception:
+    # Bez ekrana (headless, CI) pyautogui pada vec pri importu (nema DISPLAY)
+    pyautogui = None
+
+try:
+    from Xlib import X, XK
+    from Xlib.display import Display
+    from Xlib.ext import xtest
+except ImportError:
+    Display = None
+
+
+class FailSafeException(Exception):
+    """Raised when the pointer sits in the fail-safe corner (the user wants to stop)."""
+
+
+class InputBackend:
+    """
+    Base class for mouse and keyboard backends.
+
+    Backends inject input only; they never sleep on their own except for an
+    explicitly requested move duration. All pacing comes from PresentationTiming.
+    """
+
+    name = "base"
+
+    # Da li backend prekida rad kad korisnik odvede mis u gornji levi ugao
+    failsafe = False
+
+    def size(self) -> Tuple[int, int]:
+        raise NotImplementedError
+
+    def move(self, x: int, y: int, duration: float = 0.0):
+        raise NotImplementedError
+
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1):
+        raise NotImplementedError
+
+    def press(self, key: str):
+        raise NotImplementedError
+
+    def hotkey(self, *keys: str):
+        raise NotImplementedError
+
+    def scroll(self, amount: int):
+        raise NotImplementedError
+
+    def write(self, text: str, interval: float = 0.0):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAutoGUIInput(InputBackend):
+    """pyautogui without its global PAUSE (the hidden 0.3 s after every call)."""
+
+    name = "pyautogui"
+    failsafe = True
+
+    def __init__(self):
+        if pyautogui is None:
+            raise RuntimeError("pyautogui is not available (no display)")
+        pyautogui.FAILSAFE = True
+        pyautogui.PAUSE = 0
+
+    def size(self) -> Tuple[int, int]:
+        return tuple(pyautogui.size())
+
+    def move(self, x: int, y: int, duration: float = 0.0):
+        pyautogui.moveTo(x, y, duration=duration)
+
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1):
+        pyautogui.click(x, y, clicks=clicks, interval=0.0, button=button)
+
+    def press(self, key: str):
+        pyautogui.press(key)
+
+    def hotkey(self, *keys: str):
+        pyautogui.hotkey(*keys, interval=0.0)
+
+    def scroll(self, amount: int):
+        pyautogui.scroll(amount)
+
+    def write(self, text: str, interval: float = 0.0):
+        pyautogui.typewrite(text, interval=interval)
+
+
+class XTestInput(InputBackend):
+    """
+    Direct XTest injection through python-xlib (X11 only).
+
+    Events go straight to the X server and are flushed once per primitive;
+    there are no per-call pauses or fail-safe screenshots. Like pyautogui,
+    move and click raise FailSafeException while the pointer is in the
+    top left corner.
+    """
+
+    name = "xtest"
+    failsafe = True
+
+    FAILSAFE_POINTS = ((0, 0),)
+
+    # pyautogui imena tastera -> X keysym imena
+    KEY_NAMES = {
+        "enter": "Return", "return": "Return", "tab": "Tab", "space": "space",
+        "esc": "Escape", "escape": "Escape", "backspace": "BackSpace",
+        "delete": "Delete", "del": "Delete", "insert": "Insert",
+        "home": "Home", "end": "End", "pageup": "Prior", "pagedown": "Next",
+        "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+        "ctrl": "Control_L", "ctrlleft": "Control_L", "ctrlright": "Control_R",
+        "shift": "Shift_L", "shiftleft": "Shift_L", "shiftright": "Shift_R",
+        "alt": "Alt_L", "altleft": "Alt_L", "altright": "Alt_R",
+        "win": "Super_L", "winleft": "Super_L", "command": "Super_L",
+        "capslock": "Caps_Lock", "printscreen": "Print",
+        **{f"f{i}": f"F{i}" for i in range(1, 25)}
+    }
+
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self, display: Optional[str] = None, move_rate: float = 120.0):
+        """
+        Args:
+            display: X display name (default $DISPLAY)
+            move_rate: Cursor updates per second while a move is animated
+        """
+        if Display is None:
+            raise ImportError("python-xlib is not installed (pip install python-xlib)")
+
+        self.display = Display(display)
+        if not self.display.has_extension("XTEST"):
+            raise RuntimeError("X server has no XTEST extension")
+
+        self.root = self.display.screen().root
+        self.move_rate = move_rate
+        self.shift_keycode = self.display.keysym_to_keycode(XK.string_to_keysym("Shift_L"))
+
+    def size(self) -> Tuple[int, int]:
+        screen = self.display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+
+    def _position(self) -> Tuple[int, int]:
+        pointer = self.root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def _check_failsafe(self):
+        if self._position() in self.FAILSAFE_POINTS:
+            raise FailSafeException("Fail-safe triggered by moving the mouse to the top left corner")
+
+    def _motion(self, x: int, y: int):
+        xtest.fake_input(self.display, X.MotionNotify, x=int(x), y=int(y))
+        self.display.sync()
+
+    def move(self, x: int, y: int, duration: float = 0.0):
+        self._check_failsafe()
+        if duration <= 0:
+            self._motion(x, y)
+            return
+
+        # Animacija kursora (easeInOutQuad, kao pyautogui) - samo kad je tajming trazi
+        start_x, start_y = self._position()
+        steps = max(1, int(duration * self.move_rate))
+        started = time.perf_counter()
+
+        for i in range(1, steps + 1):
+            t = i / steps
+            eased = 2 * t * t if t < 0.5 else -1 + (4 - 2 * t) * t
+            self._motion(start_x + (x - start_x) * eased, start_y + (y - start_y) * eased)
+            delay = started + duration * t - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def click(self, x: int, y: int, button: str = "left", clicks: int = 1):
+        self._check_failsafe()
+        self._motion(x, y)
+        code = self.BUTTONS[button]
+        for _ in range(clicks):
+            xtest.fake_input(self.display, X.ButtonPress, code)
+            xtest.fake_input(self.display, X.ButtonRelease, code)
+        self.display.sync()
+
+    def _keycode(self, key: str) -> Tuple[int, bool]:
+        """(keycode, needs_shift) for a pyautogui key name or a single character."""
+        if len(key) == 1:
+            # Latin-1 keysym je isti kao kod karaktera, ostali Unicode su 0x01000000 + kod
+            keysym = ord(key) if ord(key) < 256 else 0x01000000 + ord(key)
+            if key == "\n":
+                keysym = XK.string_to_keysym("Return")
+            elif key == "\t":
+                keysym = XK.string_to_keysym("Tab")
+        else:
+            keysym = XK.string_to_keysym(self.KEY_NAMES.get(key.lower(), key))
+
+        keycode = self.display.keysym_to_keycode(keysym)
+        if not keycode:
+            raise ValueError(f"No keycode for key '{key}'")
+
+        shift = self.display.keycode_to_keysym(keycode, 0) != keysym and \
+            self.display.keycode_to_keysym(keycode, 1) == keysym
+        return keycode, shift
+
+    def _tap(self, keycode: int, shift: bool = False):
+        if shift:
+            xtest.fake_input(self.display, X.KeyPress, self.shift_keycode)
+        xtest.fake_input(self.display, X.KeyPress, keycode)
+        xtest.fake_input(self.display, X.KeyRelease, keycode)
+        if shift:
+            xtest.fake_input(self.display, X.KeyRelease, self.shift_keycode)
+
+    def press(self, key: str):
+        self._tap(*self._keycode(key))
+        self.display.sync()
+
+    def hotkey(self, *keys: str):
+        codes = [self._keycode(key)[0] for key in keys]
+        for code in codes:
+            xtest.fake_input(self.display, X.KeyPress, code)
+        for code in reversed(codes):
+            xtest.fake_input(self.display, X.KeyRelease, code)
+        self.display.sync()
+
+    def scroll(self, amount: int):
+        # Dugme 4 je skrol na gore, 5 na dole (jedan "klik" tockica po jedinici)
+        code = 4 if amount > 0 else 5
+        for _ in range(abs(amount)):
+            xtest.fake_input(self.display, X.ButtonPress, code)
+            xtest.fake_input(self.display, X.ButtonRelease, code)
+        self.display.sync()
+
+    def write(self, text: str, interval: float = 0.0):
+        for char in text:
+            self._tap(*self._keycode(char))
+            if interval > 0:
+                self.display.sync()
+                time.sleep(interval)
+        self.display.sync()
+
+    def close(self):
+        self.display.close()
+
+
+INPUT_BACKENDS: Dict[str, Type[InputBackend]] = {
+    PyAutoGUIInput.name: PyAutoGUIInput,
+    XTestInput.name: XTestInput,
+}
+
+
+def create_input_backend(name: Optional[str] = None) -> InputBackend:
+    """
+    Create an input backend by name (INPUT_BACKEND env variable by default).
+    Falls back to pyautogui if the requested backend is not available.
+    """
+    name = (name or os.getenv("INPUT_BACKEND") or "pyautogui").lower()
+    backend_class = INPUT_BACKENDS.get(name)
+
+    if backend_class is None:
+        print(f"[InputBackend] Unknown backend '{name}', using pyautogui")
+        backend_class = PyAutoGUIInput
+
+    try:
+        return backend_class()
+    except Exception as e:
+        print(f"[InputBackend] Backend '{name}' not available ({e}), using pyautogui")
+        return PyAutoGUIInput()
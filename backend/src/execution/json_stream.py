@@ -0,0 +1,94 @@
+import json
+from typing import Optional, Dict, Any
+
+
+class JsonStreamScanner:
+    """
+    Incremental scanner for the first JSON value in a streamed model answer.
+
+    Chunks are fed as they arrive. The scanner tracks strings, escapes and
+    nesting, so it knows when the top-level value is closed and, for a
+    top-level object, which members are already complete. The caller can
+    stop the stream as soon as the members it needs have arrived.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.start: Optional[int] = None
+        self.end: Optional[int] = None
+
+        # Zavrseni clanovi top-level objekta (npr. {"found": true, "candidates": [...]})
+        self.fields: Dict[str, Any] = {}
+        self._fields_end: Optional[int] = None
+
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def complete(self) -> bool:
+        """Top-level JSON value is closed."""
+        return self.end is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Add streamed text; returns True once the top-level value is closed."""
+        self.text += chunk
+
+        while self._pos < len(self.text) and self.end is None:
+            char = self.text[self._pos]
+            index = self._pos
+            self._pos += 1
+
+            if self.start is None:
+                if char in "{[":
+                    self.start = index
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._member_boundary(index + 1)
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = index + 1
+                    self._member_boundary(index)
+                elif self._depth == 1:
+                    self._member_boundary(index + 1)
+            elif char == "," and self._depth == 1:
+                self._member_boundary(index)
+
+        return self.complete
+
+    def _member_boundary(self, upto: int):
+        """Possible end of a top-level member; keep the members that parse as a closed object."""
+        if self.text[self.start] != "{":
+            return
+        try:
+            value = json.loads(self.text[self.start:upto] + "}")
+        except json.JSONDecodeError:
+            return
+        if isinstance(value, dict):
+            self.fields = value
+            self._fields_end = upto
+
+    def snapshot(self) -> Optional[str]:
+        """JSON text of everything usable so far (the whole value, or the complete members closed as an object)."""
+        if self.complete:
+            return self.text[self.start:self.end]
+        if self._fields_end is not None:
+            return json.dumps(self.fields)
+        return None
@@ -0,0 +1,217 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+from typing import Optional, Dict, Any, List
+
+
+class ModelStats:
+    """Rolling statistics of one vision model."""
+
+    def __init__(self, window: int = 200):
+        self.latencies: deque = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.answers = 0
+        self.parse_failures = 0
+        self.verified = 0
+        self.verified_correct = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "latencies": list(self.latencies),
+            "requests": self.requests,
+            "errors": self.errors,
+            "throttled": self.throttled,
+            "answers": self.answers,
+            "parse_failures": self.parse_failures,
+            "verified": self.verified,
+            "verified_correct": self.verified_correct
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], window: int = 200) -> "ModelStats":
+        stats = cls(window)
+        stats.latencies.extend(data.get("latencies", []))
+        for field in ("requests", "errors", "throttled", "answers", "parse_failures", "verified", "verified_correct"):
+            setattr(stats, field, int(data.get(field, 0)))
+        return stats
+
+
+class ModelTelemetry:
+    """
+    Per-model latency and accuracy telemetry used to rank the vision models.
+
+    Models are ordered by the expected time to a correct answer:
+    median latency divided by the probability that one request ends with a
+    usable, correct location (no error or 429, parseable JSON, verified click).
+    """
+
+    def __init__(
+        self,
+        stats_path: Optional[str] = None,
+        window: int = 200,
+        prior_latency: float = 5.0,
+        save_every: int = 10
+    ):
+        """
+        Args:
+            stats_path: Optional JSON file where statistics survive restarts
+            window: Latency samples kept per model
+            prior_latency: Assumed latency (seconds) of a model without samples
+            save_every: Persist after this many updates
+        """
+        self.stats_path = stats_path
+        self.window = window
+        self.prior_latency = prior_latency
+        self.save_every = save_every
+
+        self._models: Dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+        self._updates = 0
+
+        if self.stats_path:
+            self._load()
+
+    def _stats(self, model: str) -> ModelStats:
+        if model not in self._models:
+            self._models[model] = ModelStats(self.window)
+        return self._models[model]
+
+    def _updated(self):
+        self._updates += 1
+        if self.stats_path and self._updates % self.save_every == 0:
+            self._save()
+
+    def record_response(self, model: str, latency: float, status_code: int):
+        """One HTTP response (200, 429 or error status) with its latency in seconds."""
+        with self._lock:
+            stats = self._stats(model)
+            stats.requests += 1
+            if status_code == 200:
+                stats.answers += 1
+                stats.latencies.append(latency)
+            elif status_code == 429:
+                stats.throttled += 1
+            else:
+                stats.errors += 1
+        self._updated()
+
+    def record_error(self, model: str):
+        """Request that ended without a response (timeout, connection error)."""
+        with self._lock:
+            stats = self._stats(model)
+            stats.requests += 1
+            stats.errors += 1
+        self._updated()
+
+    def record_parse_failure(self, model: str):
+        """Answer that did not contain the expected JSON."""
+        with self._lock:
+            self._stats(model).parse_failures += 1
+        self._updated()
+
+    def record_verification(self, model: str, correct: bool):
+        """Outcome of an action performed at the location the model returned."""
+        with self._lock:
+            stats = self._stats(model)
+            stats.verified += 1
+            stats.verified_correct += int(correct)
+        self._updated()
+
+    def latency_percentile(self, model: str, percentile: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._models[model].latencies) if model in self._models else []
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percentile / 100))]
+
+    def success_probability(self, model: str) -> float:
+        """P(one request gives a correct answer), with add-one smoothing so new models get tried."""
+        with self._lock:
+            stats = self._models.get(model)
+            if stats is None:
+                return 1.0
+            answered = (stats.answers + 1) / (stats.requests + 1)
+            parsed = (stats.answers - stats.parse_failures + 1) / (stats.answers + 1)
+            correct = (stats.verified_correct + 1) / (stats.verified + 1)
+        return max(0.01, answered * max(parsed, 0.01) * correct)
+
+    def expected_time(self, model: str) -> float:
+        latency = self.latency_percentile(model, 50)
+        if latency is None:
+            latency = self.prior_latency
+        return latency / self.success_probability(model)
+
+    def rank(self, models: List[str]) -> List[str]:
+        """Models sorted by expected time to a correct answer (configured order breaks ties)."""
+        return sorted(models, key=lambda model: (round(self.expected_time(model), 3), models.index(model)))
+
+    def summary(self) -> Dict[str, Any]:
+        models = {}
+        for model in list(self._models):
+            stats = self._models[model]
+            requests = max(stats.requests, 1)
+            models[model] = {
+                "requests": stats.requests,
+                "latency_p50_s": self.latency_percentile(model, 50),
+                "latency_p90_s": self.latency_percentile(model, 90),
+                "latency_p99_s": self.latency_percentile(model, 99),
+                "error_rate": round(stats.errors / requests, 3),
+                "throttle_rate": round(stats.throttled / requests, 3),
+                "parse_failure_rate": round(stats.parse_failures / max(stats.answers, 1), 3),
+                "verified": stats.verified,
+                "verified_correct_rate": round(stats.verified_correct / stats.verified, 3) if stats.verified else None,
+                "expected_time_s": round(self.expected_time(model), 3)
+            }
+        return {"models": models, "ranking": sorted(models, key=lambda m: models[m]["expected_time_s"])}
+
+    def _load(self):
+        if not os.path.exists(self.stats_path):
+            return
+
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            for model, stats in data.get("models", {}).items():
+                self._models[model] = ModelStats.from_dict(stats, self.window)
+
+            print(f"[ModelTelemetry] Loaded stats for {len(self._models)} models from {self.stats_path}")
+        except Exception as e:
+            print(f"[ModelTelemetry] Could not load stats: {e}")
+
+    def _save(self):
+        with self._lock:
+            data = {
+                "saved_at": time.time(),
+                "models": {model: stats.to_dict() for model, stats in self._models.items()}
+            }
+
+            try:
+                folder = os.path.dirname(self.stats_path)
+                if folder:
+                    os.makedirs(folder, exist_ok=True)
+
+                tmp_path = self.stats_path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.stats_path)
+            except Exception as e:
+                print(f"[ModelTelemetry] Could not save stats: {e}")
+
+
+_telemetry: Optional[ModelTelemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_model_telemetry() -> ModelTelemetry:
+    """Shared telemetry for the whole process (VISION_STATS_PATH enables persistence)."""
+    global _telemetry
+
+    with _telemetry_lock:
+        if _telemetry is None:
+            _telemetry = ModelTelemetry(stats_path=os.getenv("VISION_STATS_PATH") or None)
+        return _telemetry
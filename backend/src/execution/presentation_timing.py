@@ -0,0 +1,71 @@
+import os
+import time
+from dataclasses import dataclass, fields, replace
+
+
+@dataclass
+class PresentationTiming:
+    """
+    The only source of deliberate pacing in the input path.
+
+    Every pause that exists so a viewer can follow the recording lives here.
+    Functional waits (UI settle, clipboard hand-off) stay where they are;
+    with FAST timing the input path itself adds no delay at all.
+    """
+
+    move_duration: float = 0.0    # animacija kursora do mete
+    before_click: float = 0.0     # kursor stoji na meti prije klika
+    after_click: float = 0.0
+    after_key: float = 0.0
+    after_hotkey: float = 0.0
+    after_scroll: float = 0.0
+    after_type: float = 0.0
+    typing_interval: float = 0.0  # izmedju karaktera kad se tekst kuca
+    between_steps: float = 0.0    # gornja granica settle cekanja izmedju koraka
+
+    def pause(self, name: str):
+        """Sleep for the named pause (e.g. "after_click"); no-op when it is 0."""
+        seconds = getattr(self, name)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    @classmethod
+    def for_mode(cls, slow_mode: bool) -> "PresentationTiming":
+        """
+        Timing for a run, optionally tuned with PRESENTATION_TIMING,
+        e.g. "move_duration=0.5,typing_interval=0.08".
+        """
+        timing = SLOW if slow_mode else FAST
+        overrides = os.getenv("PRESENTATION_TIMING", "").strip()
+        if not overrides:
+            return timing
+
+        names = {f.name for f in fields(cls)}
+        values = {}
+        for item in overrides.split(","):
+            key, _, value = item.partition("=")
+            key = key.strip()
+            try:
+                if key not in names:
+                    raise ValueError("unknown pause")
+                values[key] = float(value)
+            except ValueError:
+                print(f"[PresentationTiming] Ignoring '{item.strip()}'")
+        return replace(timing, **values)
+
+
+# Brzo izvrsavanje - bez ikakvih pauza u ulaznom putu
+FAST = PresentationTiming()
+
+# Snimanje - tempo koji gledalac videa moze da prati
+SLOW = PresentationTiming(
+    move_duration=0.3,
+    before_click=0.1,
+    after_click=0.3,
+    after_key=0.2,
+    after_hotkey=0.3,
+    after_scroll=0.3,
+    after_type=0.3,
+    typing_interval=0.05,
+    between_steps=0.5
+)
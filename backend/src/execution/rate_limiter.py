@@ -0,0 +1,310 @@
+import os
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Any, Mapping, Tuple
+
+
+class TokenBucket:
+    """Token bucket; tokens are reserved up front so waiting callers never race each other."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller has to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.paused_until - now)
+
+    def refund(self):
+        """Return a reserved token that was not used."""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for the given time (server said the quota is used up)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class CircuitBreaker:
+    """Per-model breaker: open after repeated failures or a 429, half-open after the cooldown."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.open_until = 0.0
+        self.trips = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.open_until == 0.0:
+            return self.CLOSED
+        return self.OPEN if time.monotonic() < self.open_until else self.HALF_OPEN
+
+    def allow(self) -> bool:
+        return self.state != self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self._open(self.cooldown)
+
+    def trip(self, seconds: Optional[float] = None):
+        """Open immediately (429), for Retry-After seconds if the server sent it."""
+        with self._lock:
+            self._open(seconds if seconds is not None else self.cooldown)
+
+    def _open(self, seconds: float):
+        self.open_until = time.monotonic() + max(seconds, 0.1)
+        self.failures = 0
+        self.trips += 1
+
+
+def _parse_seconds(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds until a reset, from Retry-After / X-RateLimit-Reset style values:
+    delta seconds, epoch seconds or milliseconds, HTTP date, or durations like "1m30s", "250ms".
+    """
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    now = now if now is not None else time.time()
+
+    try:
+        number = float(value)
+        if number > 1e12:
+            return max(0.0, number / 1000 - now)
+        if number > 1e9:
+            return max(0.0, number - now)
+        return max(0.0, number)
+    except ValueError:
+        pass
+
+    if value.endswith("s") and value[:-1]:
+        total, number = 0.0, ""
+        units = {"h": 3600, "m": 60, "s": 1, "ms": 0.001}
+        i = 0
+        while i < len(value):
+            ch = value[i]
+            if ch.isdigit() or ch == ".":
+                number += ch
+                i += 1
+                continue
+            unit = "ms" if value[i:i + 2] == "ms" else ch
+            if unit not in units or not number:
+                break
+            total += float(number) * units[unit]
+            number = ""
+            i += len(unit)
+        else:
+            return total
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Process-wide request limiter for the vision API, shared by all ScreenAnalyzer instances."""
+
+    def __init__(
+        self,
+        default_rate: float = 1.0,
+        default_burst: int = 1,
+        model_limits: Optional[Dict[str, Tuple[float, int]]] = None,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0
+    ):
+        """
+        Args:
+            default_rate: Requests per second for models without their own limit
+            default_burst: Burst size for models without their own limit
+            model_limits: model -> (rate, burst)
+            failure_threshold: Consecutive errors that open a model's breaker
+            cooldown: How long a breaker stays open without a Retry-After hint
+        """
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.model_limits = model_limits or {}
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, model: str) -> TokenBucket:
+        with self._lock:
+            if model not in self._buckets:
+                rate, burst = self.model_limits.get(model, (self.default_rate, self.default_burst))
+                self._buckets[model] = TokenBucket(rate, burst)
+            return self._buckets[model]
+
+    def _breaker(self, model: str) -> CircuitBreaker:
+        with self._lock:
+            if model not in self._breakers:
+                self._breakers[model] = CircuitBreaker(self.failure_threshold, self.cooldown)
+            return self._breakers[model]
+
+    def _count(self, model: str, wait: Optional[float] = None, **counts: int):
+        """Update the model's counters under the lock (a wait also counts as one request)."""
+        with self._lock:
+            metric = self._metrics.setdefault(model, {
+                "requests": 0, "wait_total": 0.0, "wait_max": 0.0, "throttled": 0, "skipped": 0
+            })
+            for key, amount in counts.items():
+                metric[key] += amount
+            if wait is not None:
+                metric["requests"] += 1
+                metric["wait_total"] += wait
+                metric["wait_max"] = max(metric["wait_max"], wait)
+
+    def available(self, model: str) -> bool:
+        """False while the model's breaker is open (the caller should skip to the next model)."""
+        if self._breaker(model).allow():
+            return True
+        self._count(model, skipped=1)
+        return False
+
+    async def acquire(self, model: str, deadline: Optional[float] = None) -> bool:
+        """
+        Wait for a request slot for the model.
+
+        Args:
+            deadline: Absolute time.time(); if the wait would pass it, nothing is waited
+
+        Returns:
+            False if the slot would only be free after the deadline
+        """
+        bucket = self._bucket(model)
+        wait = bucket.reserve()
+        if deadline is not None and time.time() + wait > deadline:
+            bucket.refund()
+            return False
+
+        self._count(model, wait=wait)
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def update_from_response(self, model: str, status_code: int, headers: Mapping[str, str]):
+        """Feed the response status and rate-limit headers back into the bucket and breaker."""
+        breaker = self._breaker(model)
+
+        if status_code == 429:
+            self._count(model, throttled=1)
+            retry_after = _parse_seconds(headers.get("retry-after"))
+            if retry_after is None:
+                retry_after = _parse_seconds(headers.get("x-ratelimit-reset"))
+            breaker.trip(retry_after)
+            self._bucket(model).pause(retry_after if retry_after is not None else self.cooldown)
+            return
+
+        remaining = headers.get("x-ratelimit-remaining")
+        if remaining is not None and remaining.strip() in ("0", "0.0"):
+            reset = _parse_seconds(headers.get("x-ratelimit-reset"))
+            if reset:
+                self._bucket(model).pause(reset)
+
+        if status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    def record_failure(self, model: str):
+        """Connection errors and timeouts count toward opening the breaker."""
+        self._breaker(model).record_failure()
+
+    def metrics(self) -> Dict[str, Any]:
+        # Kopija pod lock-om - drugi thread-ovi mogu upravo da dodaju model ili broje zahtjev
+        with self._lock:
+            snapshot = {model: dict(metric) for model, metric in self._metrics.items()}
+
+        models = {}
+        for model, metric in snapshot.items():
+            breaker = self._breaker(model)
+            requests = metric["requests"]
+            models[model] = {
+                "requests": requests,
+                "wait_total_s": round(metric["wait_total"], 3),
+                "wait_avg_s": round(metric["wait_total"] / requests, 3) if requests else 0.0,
+                "wait_max_s": round(metric["wait_max"], 3),
+                "throttled": metric["throttled"],
+                "skipped": metric["skipped"],
+                "breaker": breaker.state,
+                "breaker_trips": breaker.trips
+            }
+
+        return {
+            "wait_total_s": round(sum(m["wait_total"] for m in snapshot.values()), 3),
+            "models": models
+        }
+
+
+def _parse_model_limits(value: str) -> Dict[str, Tuple[float, int]]:
+    """VISION_MODEL_LIMITS format: "model=rate[:burst],model=rate[:burst]"."""
+    limits = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        model, limit = item.rsplit("=", 1)
+        rate, _, burst = limit.partition(":")
+        try:
+            limits[model.strip()] = (float(rate), int(burst or 1))
+        except ValueError:
+            print(f"[RateLimiter] Invalid limit '{item.strip()}', ignored")
+    return limits
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Shared limiter for the whole process, configured from environment variables."""
+    global _limiter
+
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(
+                default_rate=float(os.getenv("VISION_RATE_LIMIT", "1.0")),
+                default_burst=int(os.getenv("VISION_RATE_BURST", "1")),
+                model_limits=_parse_model_limits(os.getenv("VISION_MODEL_LIMITS", "")),
+                failure_threshold=int(os.getenv("VISION_BREAKER_FAILURES", "3")),
+                cooldown=float(os.getenv("VISION_BREAKER_COOLDOWN", "30"))
+            )
+        return _limiter
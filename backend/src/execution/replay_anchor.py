@@ -0,0 +1,106 @@
+import io
+import base64
+from typing import Optional, Dict, Any, Tuple
+import numpy as np
+from PIL import Image
+
+from .grounding_cache import screen_fingerprint, fingerprint_distance
+from .template_locator import normalized_cross_correlation
+
+
+def capture_anchor(
+    screenshot: Image.Image,
+    x: int,
+    y: int,
+    crop_sizes: Tuple[Tuple[int, int], ...] = ((120, 40), (240, 80))
+) -> Optional[Dict[str, Any]]:
+    """
+    Everything a replay needs to find a grounded element again without vision:
+    the resolved point, a grayscale crop around it and the frame fingerprint.
+
+    Args:
+        screenshot: Frame the element was located on (before the action)
+        x, y: Resolved screen coordinates
+        crop_sizes: (width, height) tried in order - a larger crop is used if the small one is uniform
+
+    Returns:
+        {"x", "y", "crop" (base64 PNG), "box", "fingerprint", "screen"} or None if the
+        neighbourhood is too uniform to be recognized
+    """
+    for crop_w, crop_h in crop_sizes:
+        left = max(0, min(x - crop_w // 2, screenshot.width - crop_w))
+        top = max(0, min(y - crop_h // 2, screenshot.height - crop_h))
+        box = (left, top, min(screenshot.width, left + crop_w), min(screenshot.height, top + crop_h))
+
+        crop = screenshot.crop(box).convert("L")
+
+        # Jednolicna povrsina (prazno polje) ne moze pouzdano da se prepozna
+        if np.asarray(crop, dtype=np.float32).std() < 8:
+            continue
+
+        buffer = io.BytesIO()
+        crop.save(buffer, format="PNG", optimize=True)
+
+        return {
+            "x": int(x),
+            "y": int(y),
+            "crop": base64.b64encode(buffer.getvalue()).decode("ascii"),
+            "box": box,
+            "fingerprint": screen_fingerprint(screenshot),
+            "screen": f"{screenshot.width}x{screenshot.height}"
+        }
+
+    return None
+
+
+def match_anchor(
+    anchor: Dict[str, Any],
+    screenshot: Image.Image,
+    threshold: float = 0.9,
+    margin: int = 32
+) -> Optional[Dict[str, Any]]:
+    """
+    Local pixel check that the anchored element is (still) where the previous run found it.
+
+    Args:
+        anchor: Result of capture_anchor (as persisted in the executed ontology)
+        screenshot: Current frame
+        threshold: Minimum correlation score
+        margin: How far (pixels) the element may have moved
+
+    Returns:
+        Element dict ({"found", "x", "y", "confidence", "source": "replay", ...}) or None on mismatch
+    """
+    if anchor.get("screen") != f"{screenshot.width}x{screenshot.height}":
+        return None
+
+    crop = np.asarray(Image.open(io.BytesIO(base64.b64decode(anchor["crop"]))).convert("L"), dtype=np.float32)
+    left, top, right, bottom = anchor["box"]
+
+    area_box = (
+        max(0, left - margin), max(0, top - margin),
+        min(screenshot.width, right + margin), min(screenshot.height, bottom + margin)
+    )
+    area = np.asarray(screenshot.crop(area_box).convert("L"), dtype=np.float32)
+
+    if crop.shape[0] > area.shape[0] or crop.shape[1] > area.shape[1]:
+        return None
+
+    scores = normalized_cross_correlation(area, crop)
+    row, col = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    score = float(scores[row, col])
+
+    if score < threshold:
+        return None
+
+    fingerprint = screen_fingerprint(screenshot)
+    return {
+        "found": True,
+        "x": int(area_box[0] + col + anchor["x"] - left),
+        "y": int(area_box[1] + row + anchor["y"] - top),
+        "confidence": round(score, 3),
+        "description": f"Replay anchor (score {round(score, 3)})",
+        "fingerprint": fingerprint,
+        "screen_distance": fingerprint_distance(fingerprint, anchor.get("fingerprint", "")),
+        "source": "replay"
+    }
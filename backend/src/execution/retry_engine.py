@@ -0,0 +1,312 @@
+import os
+import time
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from .screen_analyzer import ScreenAnalyzer
+from .screen_settle import ScreenSettle
+
+# Strategije trazenja elementa, od najjeftinije ka najskupljoj
+INITIAL = "initial"                # uobicajeno trazenje (prefetch, cache, template, ROI, progresivno)
+NEXT_CANDIDATE = "next_candidate"  # sljedeci kandidat iz istog Vision odgovora, bez novog poziva
+REGROUND = "reground"              # novo trazenje mimo cache-a
+SYNONYM = "synonym"                # isti element pod drugim nazivom iz ontologije
+FULL_SCREEN = "full_screen"        # cijeli ekran u vecoj rezoluciji (bez ROI i progresivnog trazenja)
+MARKS = "marks"                    # Set-of-Mark trazenje (model bira numerisani okvir)
+
+# Korak bez elementa na ekranu (open_application, key_press, wait...)
+DIRECT = "direct"
+
+
+class RetryEngine:
+    """
+    Retry policy shared by Executor and OntologyExecutor.
+
+    Every retry escalates the grounding strategy instead of repeating the same
+    request, and the backoff between retries is an upper bound: it ends as soon
+    as the screen has changed and settled. Each attempt and its cost are
+    appended to the step result under "attempts".
+    """
+
+    def __init__(
+        self,
+        analyzer: ScreenAnalyzer,
+        settle: ScreenSettle,
+        synonyms: Optional[Callable[[str], List[str]]] = None,
+        max_attempts: Optional[int] = None,
+        direct_attempts: Optional[int] = None,
+        max_candidates: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None
+    ):
+        """
+        Args:
+            analyzer: ScreenAnalyzer used for the escalated grounding
+            settle: ScreenSettle used for the backoff waits
+            synonyms: Alternative labels for a target (e.g. OntologyManager.get_target_synonyms)
+            max_attempts: Grounding attempts per step (default RETRY_MAX_ATTEMPTS, or one per
+                          strategy in the escalation chain); next candidates do not count
+            direct_attempts: Attempts for a step without an element (default RETRY_DIRECT_ATTEMPTS or 3)
+            max_candidates: Next candidates tried per step (default RETRY_MAX_CANDIDATES or 2)
+            base_delay: First backoff in seconds, doubled on every retry (default RETRY_BASE_DELAY or 0.5)
+            max_delay: Backoff cap in seconds (default RETRY_MAX_DELAY or 4)
+        """
+        self.analyzer = analyzer
+        self.settle = settle
+        self.synonyms = synonyms
+        self.max_attempts = max_attempts or int(os.getenv("RETRY_MAX_ATTEMPTS", "0")) or None
+        self.direct_attempts = direct_attempts or int(os.getenv("RETRY_DIRECT_ATTEMPTS", "3"))
+        self.max_candidates = max_candidates if max_candidates is not None else \
+            int(os.getenv("RETRY_MAX_CANDIDATES", "2"))
+        self.base_delay = base_delay if base_delay is not None else float(os.getenv("RETRY_BASE_DELAY", "0.5"))
+        self.max_delay = max_delay if max_delay is not None else float(os.getenv("RETRY_MAX_DELAY", "4"))
+        self.max_synonyms = 2
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.steps = 0
+        self.retried_steps = 0
+        self.recovered_steps = 0
+        self.backoff_seconds = 0.0
+        self.by_strategy: Dict[str, Dict[str, int]] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "steps": self.steps,
+            "retried_steps": self.retried_steps,
+            "recovered_steps": self.recovered_steps,
+            "backoff_s": round(self.backoff_seconds, 2),
+            "by_strategy": self.by_strategy
+        }
+
+    def run(
+        self,
+        target: str,
+        context: Optional[str],
+        perform: Callable[[Optional[Dict[str, Any]]], bool],
+        locate: Optional[Callable[[str, str], Optional[Dict[str, Any]]]] = None,
+        result: Optional[Dict[str, Any]] = None,
+        max_attempts: Optional[int] = None,
+        optional_target: bool = False
+    ) -> bool:
+        """
+        Execute one step with retries.
+
+        Args:
+            target: Step target (element label)
+            context: Grounding context, or None if the step needs no element (the same
+                     action is repeated up to direct_attempts times)
+            perform: perform(element) -> success; runs the action and its verification
+            locate: First-attempt grounding locate(target, context), e.g. prefetch + lookahead
+            result: Step result; gets "attempts", "retries" and "error" on failure
+            max_attempts: Per-step limit (e.g. cu:retryCount), default self.max_attempts
+            optional_target: The action can run without the element (type_text focus click);
+                             if no strategy finds it, perform(None) runs once at the end
+
+        Returns:
+            True if an attempt succeeded
+        """
+        result = result if result is not None else {}
+        attempts = result.setdefault("attempts", [])
+        self.steps += 1
+
+        if context is None:
+            return self._run_direct(target, perform, result, attempts, max_attempts)
+
+        escalation = self._escalation(target)
+        # Podrazumijevano po jedan pokusaj za svaku strategiju lanca, da lanac stvarno dodje do kraja
+        limit = max(1, max_attempts or self.max_attempts or len(escalation) + 1)
+        previous: Optional[Tuple[str, Dict[str, Any]]] = None
+        success = False
+        found_any = False
+        stages = 0
+        candidates = 0
+
+        while True:
+            if not attempts:
+                strategy, label, element = INITIAL, target, None
+            else:
+                strategy, label, element = self._next_strategy(
+                    previous, escalation, with_candidate=candidates < self.max_candidates
+                )
+                if strategy is None or (strategy != NEXT_CANDIDATE and stages >= limit):
+                    break
+
+            waited = 0.0
+            if strategy == NEXT_CANDIDATE:
+                # Kandidati iz istog odgovora vaze samo dok se ekran ne promijeni - za njih nema
+                # cekanja, i ne trose pokusaje lanca
+                candidates += 1
+            else:
+                if stages > 0:
+                    waited = self._backoff(stages)
+                stages += 1
+
+            ground = (lambda: element) if element is not None else \
+                (lambda: self._ground(strategy, label, target, context, locate))
+            success = self._attempt(attempts, strategy, label, perform, ground, waited=waited)
+
+            last = attempts[-1]
+            found_any = found_any or last["found"]
+            if success:
+                break
+
+            previous = (label, last.pop("_element", None))
+            if previous[1] and previous[1].get("found"):
+                # Lokacija nije dala rezultat - zaboravi je (cache, template) i javi telemetriji
+                self.analyzer.reject_element(label, previous[1])
+
+        for attempt in attempts:
+            attempt.pop("_element", None)
+
+        if not success and optional_target and not found_any:
+            print(f"[RetryEngine] '{target}' not found, running the action without it")
+            success = self._attempt(attempts, DIRECT, target, perform, lambda: None, grounded=False)
+
+        result["retries"] = len(attempts) - 1
+        if len(attempts) > 1:
+            self.retried_steps += 1
+            if success:
+                self.recovered_steps += 1
+        if not success and not found_any and not optional_target:
+            result["error"] = f"Element not found: {target}"
+        return success
+
+    def _run_direct(self, target: str, perform: Callable[[Optional[Dict[str, Any]]], bool],
+                    result: Dict[str, Any], attempts: List[Dict[str, Any]],
+                    max_attempts: Optional[int]) -> bool:
+        """Step without an element: the same action again after the backoff."""
+        limit = max(1, max_attempts or self.direct_attempts)
+        success = False
+
+        for number in range(limit):
+            waited = self._backoff(number) if number > 0 else 0.0
+            success = self._attempt(attempts, DIRECT, target, perform, lambda: None,
+                                    waited=waited, grounded=False)
+            if success:
+                break
+
+        result["retries"] = len(attempts) - 1
+        if len(attempts) > 1:
+            self.retried_steps += 1
+            if success:
+                self.recovered_steps += 1
+        return success
+
+    def _attempt(self, attempts: List[Dict[str, Any]], strategy: str, label: str,
+                 perform: Callable[[Optional[Dict[str, Any]]], bool],
+                 ground: Callable[[], Optional[Dict[str, Any]]],
+                 waited: float = 0.0, grounded: bool = True) -> bool:
+        """One attempt: ground (if needed) and perform, with its cost recorded."""
+        record = {"attempt": len(attempts) + 1, "strategy": strategy, "label": label,
+                  "found": False, "success": False}
+        # Samo zahtjevi ovog thread-a - prefetch u pozadini ima svoj trosak
+        images, payload = self.analyzer.thread_usage()
+        start = time.time()
+
+        if len(attempts) > 0:
+            print(f"[RetryEngine] Attempt {record['attempt']}: {strategy} '{label}'")
+
+        try:
+            element = ground() if grounded else None
+            record["found"] = bool(element and element.get("found"))
+            if record["found"]:
+                record.update({"x": element["x"], "y": element["y"],
+                               "source": self._source(element), "_element": element})
+
+            if record["found"] or not grounded:
+                record["success"] = bool(perform(element))
+        except Exception as e:
+            record["error"] = str(e)
+            print(f"[RetryEngine] Attempt {record['attempt']} error: {e}")
+
+        images_after, payload_after = self.analyzer.thread_usage()
+        record.update({
+            "wait_s": round(waited, 3),
+            "seconds": round(time.time() - start, 3),
+            "vision_images": images_after - images,
+            "payload_bytes": payload_after - payload
+        })
+        attempts.append(record)
+
+        counts = self.by_strategy.setdefault(strategy, {"attempts": 0, "successes": 0})
+        counts["attempts"] += 1
+        counts["successes"] += int(record["success"])
+        return record["success"]
+
+    @staticmethod
+    def _source(element: Dict[str, Any]) -> str:
+        if element.get("prefetched"):
+            return "prefetch"
+        if element.get("cached"):
+            return "cache"
+        return element.get("source") or element.get("model") or "vision"
+
+    def _backoff(self, retry: int) -> float:
+        """Exponential upper bound; ends once the screen has changed and is stable again."""
+        delay = min(self.base_delay * (2 ** (retry - 1)), self.max_delay)
+        start = time.time()
+        self.settle.wait(delay, require_change=True)
+        waited = time.time() - start
+        self.backoff_seconds += waited
+        return waited
+
+    def _next_strategy(
+        self,
+        previous: Optional[Tuple[str, Dict[str, Any]]],
+        escalation: List[Tuple[str, str]],
+        with_candidate: bool = True
+    ) -> Tuple[Optional[str], str, Optional[Dict[str, Any]]]:
+        """
+        (strategy, label, element) for the next attempt; element is set only for NEXT_CANDIDATE.
+        Strategies are taken off the front of escalation.
+        """
+        if with_candidate and previous and previous[1] and previous[1].get("found"):
+            candidate = self.analyzer.next_candidate(previous[0], previous[1])
+            if candidate is not None:
+                return NEXT_CANDIDATE, previous[0], candidate
+
+        if escalation:
+            strategy, label = escalation.pop(0)
+            return strategy, label, None
+        return None, "", None
+
+    def _escalation(self, target: str) -> List[Tuple[str, str]]:
+        """Grounding strategies after INITIAL, in order."""
+        chain = [(REGROUND, target)]
+        chain += [(SYNONYM, label) for label in self._synonyms(target)[:self.max_synonyms]]
+        chain.append((FULL_SCREEN, target))
+
+        if self.analyzer.grounding_mode != "marks":
+            chain.append((MARKS, target))
+        return chain
+
+    def _synonyms(self, target: str) -> List[str]:
+        if not self.synonyms:
+            return []
+        try:
+            return [label for label in self.synonyms(target) if label.strip().lower() != target.strip().lower()]
+        except Exception as e:
+            print(f"[RetryEngine] Synonym lookup failed: {e}")
+            return []
+
+    def _ground(self, strategy: str, label: str, target: str, context: str,
+                locate: Optional[Callable[[str, str], Optional[Dict[str, Any]]]]) -> Optional[Dict[str, Any]]:
+        if strategy == INITIAL:
+            if locate:
+                return locate(target, context)
+            return self.analyzer.find_element_coordinates(target, context)
+
+        if strategy == REGROUND:
+            return self.analyzer.find_element_coordinates(target, context, use_cache=False)
+
+        if strategy == SYNONYM:
+            # Context koraka opisuje originalni naziv - za sinonim samo napomena
+            return self.analyzer.find_element_coordinates(label, f"It may also be labeled '{target}'.")
+
+        if strategy == FULL_SCREEN:
+            return self.analyzer.find_element_coordinates(target, context, use_cache=False, full_screen=True)
+
+        if strategy == MARKS:
+            return self.analyzer.find_element_coordinates(target, context, use_cache=False, grounding_mode="marks")
+
+        return None
@@ -1,14 +1,25 @@
 import os
 import base64
-import requests
-import re
+import asyncio
 import json
 import time
+import threading
 from io import BytesIO
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from PIL import Image
-import pyautogui
 from dotenv import load_dotenv
+from .grounding_cache import GroundingCache, screen_fingerprint, fingerprint_distance
+from .template_locator import TemplateLocator
+from .screen_capture import Frame, CaptureBackend, create_capture_backend
+from .vision_client import get_vision_client
+from .json_stream import JsonStreamScanner
+from .rate_limiter import get_rate_limiter
+from .model_telemetry import get_model_telemetry
+from .element_boxes import propose_boxes, dedupe_boxes, clip_box, refine_point
+from .set_of_mark import draw_marks, box_center
+from .screen_regions import (
+    CHANGE_DRIVEN_CLASSES, element_class_for, region_for_class, changed_region, expand_box, thumbnail
+)
 
 load_dotenv()
 
@@ -16,7 +27,13 @@ load_dotenv()
 class ScreenAnalyzer:
     """Analizira screenshot ekrana pomocu Vision AI."""
     
-    def __init__(self):
+    def __init__(self, screen_size: Optional[Tuple[int, int]] = None, capture: Optional[CaptureBackend] = None):
+        """
+        Args:
+            screen_size: Screen (width, height); default is the real screen size
+            capture: Capture backend; default SCREEN_CAPTURE_BACKEND
+                     (both are injected where there is no display, e.g. the grounding benchmark)
+        """
         self.api_key = os.getenv("OPENROUTER_API_KEY")
         if not self. api_key: 
             raise ValueError(
@@ -32,129 +49,754 @@ class ScreenAnalyzer:
         ]
         self.current_model = self.vision_models[0]
         
-        self.screen_width, self.screen_height = pyautogui.size()
+        if screen_size is None:
+            import pyautogui
+            screen_size = pyautogui.size()
+        self.screen_width, self.screen_height = screen_size
+        
+        # Screen capture (jedan frame po trenutku, dijele ga grounding, verifikacija i arhiviranje)
+        self.capture = capture or create_capture_backend()
+        
+        # Region of interest - slanje samo dijela ekrana gdje se element vjerovatno nalazi
+        self.use_roi = os.getenv("VISION_ROI", "1") != "0"
+        self.roi_max_pixels = 800 * 450
+        self._reference_thumbnail = None
+        
+        # Progresivno trazenje (mala slika, pa zum samo kad je odgovor nesiguran)
+        self.progressive = os.getenv("VISION_PROGRESSIVE", "1") != "0"
+        self.coarse_size = 480
+        self.fine_size = 1280
+        self.confidence_threshold = float(os.getenv("VISION_CONFIDENCE_THRESHOLD", "0.75"))
+        
+        # Nacin trazenja: "coordinates" (model vraca x, y) ili "marks" (lokalno predlozeni
+        # okviri se numerisu na slici, model vraca samo broj oznake)
+        self.grounding_mode = os.getenv("VISION_GROUNDING_MODE", "coordinates").lower()
+        
+        # Broj kandidata po odgovoru (retry probava sljedeci bez novog Vision poziva)
+        self.top_k = int(os.getenv("VISION_TOP_K", "3"))
+        self.max_marks = 60
+        
+        # Kodiranje slike za Vision API (najveca dimenzija, resampling, JPEG kvalitet)
+        self.image_max_size = int(os.getenv("VISION_MAX_SIZE", "800"))
+        self.resample = getattr(Image.Resampling, os.getenv("VISION_RESAMPLE", "lanczos").upper())
+        self.jpeg_quality = int(os.getenv("VISION_JPEG_QUALITY", "85"))
+        
+        # Statistika poslatih slika
+        self.encoded_images = 0
+        self.payload_bytes = 0
+        self.encode_seconds = 0.0
+        
+        # Prefetch trazi u svom thread-u - brojaci i referentni thumbnail se mijenjaju pod lock-om,
+        # a trosak, posljednji frame i geometrija zahtjeva su po thread-u (prefetch koji jos radi
+        # dok se korak ponavlja ne smije da podmetne svoj isjecak trazenju u prvom planu)
+        self._state_lock = threading.Lock()
+        self._usage = threading.local()
+        
+        # Lokalno dotjerivanje tacke na najblizi element u punoj rezoluciji
+        self.refine = os.getenv("VISION_REFINE", "1") != "0"
+        
+        # Zajednicki async HTTP klijent (keep-alive pool, HTTP/2 ako je dostupan)
+        self.base_url = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
+        self.client = get_vision_client(self.api_key, self.base_url)
+        
+        # Streaming - odgovor se parsira dok stize, stream se zatvara cim su koordinate kompletne
+        self.streaming = os.getenv("VISION_STREAMING", "1") != "0"
+        self.streams_stopped_early = 0
+        
+        # Spojeni pozivi verifikacija + trazenje sljedeceg elementa (verify_and_locate)
+        self.fused_calls = 0
+        self.request_deadline = float(os.getenv("VISION_DEADLINE", "120"))
+        
+        # Hedging - ako model kasni preko percentila svoje latencije, isti zahtjev ide sljedecem modelu
+        self.hedging = os.getenv("VISION_HEDGING", "0") == "1"
+        self.hedge_percentile = float(os.getenv("VISION_HEDGE_PERCENTILE", "90"))
+        self.hedge_default_delay = float(os.getenv("VISION_HEDGE_DELAY", "8"))
+        
+        # Telemetrija po modelu (latencija, greske, tacnost) - redoslijed modela se bira po ocekivanom vremenu
+        self.telemetry = get_model_telemetry()
+        self.adaptive_routing = os.getenv("VISION_ADAPTIVE_ROUTING", "1") != "0"
         
-        # Rate limiting
-        self. last_request_time = 0
-        self.min_request_interval = 1.0
+        # Rate limiting - zajednicki za sve analyzere u procesu (token bucket + circuit breaker po modelu)
+        self.rate_limiter = get_rate_limiter()
         
-        print(f"[ScreenAnalyzer] Initialized (OpenRouter)")
+        # Cache lokacija elemenata (kljuc je target + context + fingerprint ekrana)
+        self.cache = GroundingCache(
+            max_entries=int(os.getenv("GROUNDING_CACHE_SIZE", "256")),
+            cache_path=os.getenv("GROUNDING_CACHE_PATH") or None
+        )
+        
+        # Lokalni locator - isjecci vec pronadjenih elemenata (prije Vision API-ja)
+        self.locator = TemplateLocator(
+            threshold=float(os.getenv("TEMPLATE_MATCH_THRESHOLD", "0.9")),
+            crops_dir=os.getenv("TEMPLATE_CROPS_DIR") or None
+        )
+        
+        print(f"[ScreenAnalyzer] Initialized (OpenRouter: {self.base_url})")
         print(f"[ScreenAnalyzer] Model:  {self.current_model}")
         print(f"[ScreenAnalyzer] Screen: {self.screen_width}x{self.screen_height}")
+        print(f"[ScreenAnalyzer] Capture backend: {self.capture.name}")
+    
+    @property
+    def last_frame(self) -> Optional[Frame]:
+        """Posljednji frame koji je uhvatio ovaj thread."""
+        return getattr(self._usage, "last_frame", None)
+    
+    @last_frame.setter
+    def last_frame(self, frame: Optional[Frame]):
+        self._usage.last_frame = frame
     
-    def _wait_for_rate_limit(self):
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self. min_request_interval:
-            time. sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+    @property
+    def last_request_geometry(self) -> Optional[Dict[str, Any]]:
+        """Geometrija posljednjeg zahtjeva ovog thread-a (offset, scale_factor, size; za grounding benchmark)."""
+        return getattr(self._usage, "last_request_geometry", None)
+    
+    @last_request_geometry.setter
+    def last_request_geometry(self, geometry: Optional[Dict[str, Any]]):
+        self._usage.last_request_geometry = geometry
+    
+    def capture_frame(self) -> Frame:
+        """Uhvati novi frame ekrana i zapamti ga kao posljednji."""
+        self.last_frame = self.capture.grab()
+        return self.last_frame
     
     def take_screenshot(self) -> Image.Image:
-        return pyautogui. screenshot()
+        return self.capture_frame().image
+    
+    def flush(self):
+        """Upisi nesacuvane promjene cache-a na disk (kraj izvrsavanja)."""
+        self.cache.flush()
+    
+    def thread_usage(self) -> Tuple[int, int]:
+        """(encoded images, payload bytes) of the calling thread - the cost of foreground requests alone."""
+        return getattr(self._usage, "images", 0), getattr(self._usage, "payload_bytes", 0)
     
-    def _get_screenshot_base64(self, screenshot: Image.Image = None, max_size: int = 800) -> tuple: 
-        """Napravi ili obradi screenshot i vraca kao base64."""
+    def _get_screenshot_base64(self, screenshot: Image.Image = None, max_size: Optional[int] = None,
+                               max_pixels: Optional[int] = None) -> tuple: 
+        """
+        Napravi ili obradi screenshot i vraca kao base64.
+        
+        Args:
+            max_size: Najveca dimenzija slike (podrazumijevano image_max_size)
+            max_pixels: Budzet piksela umjesto max_size (za isjecke ekrana - bez nepotrebnog smanjivanja)
+        """
         if screenshot is None:
             screenshot = self.take_screenshot()
         
+        max_size = max_size or self.image_max_size
+        started = time.perf_counter()
+        
         # Izracunaj scale factor
-        scale_factor = min(max_size / screenshot.width, max_size / screenshot.height)
+        if max_pixels:
+            scale_factor = min(1.0, (max_pixels / (screenshot.width * screenshot.height)) ** 0.5)
+        else:
+            scale_factor = min(max_size / screenshot.width, max_size / screenshot.height)
         new_width = int(screenshot.width * scale_factor)
         new_height = int(screenshot.height * scale_factor)
         
         # Smanji sliku
-        screenshot_small = screenshot.resize((new_width, new_height), Image.Resampling. LANCZOS)
+        screenshot_small = screenshot.resize((new_width, new_height), self.resample)
         
         # Konvertuj u base64 JPEG
         buffered = BytesIO()
-        screenshot_small.save(buffered, format="JPEG", quality=85)
+        screenshot_small.convert("RGB").save(buffered, format="JPEG", quality=self.jpeg_quality)
         image_base64 = base64.b64encode(buffered.getvalue()).decode("utf-8")
         
+        with self._state_lock:
+            self.encoded_images += 1
+            self.payload_bytes += len(image_base64)
+            self.encode_seconds += time.perf_counter() - started
+        self._usage.images = getattr(self._usage, "images", 0) + 1
+        self._usage.payload_bytes = getattr(self._usage, "payload_bytes", 0) + len(image_base64)
+        
         return image_base64, scale_factor, new_width, new_height, screenshot
     
-    def _call_vision_api(self, image_base64: str, prompt: str, max_retries: int = 3) -> Optional[dict]:
-        """Pozovi Vision API"""
-        
-        self._wait_for_rate_limit()
-        
-        for model in self.vision_models:
-            for attempt in range(max_retries):
-                try:
-                    response = requests.post(
-                        "https://openrouter.ai/api/v1/chat/completions",
-                        headers={
-                            "Authorization": f"Bearer {self.api_key}",
-                            "Content-Type": "application/json",
-                            "HTTP-Referer": "http://localhost",
-                            "X-Title": "ComputeUse"
-                        },
-                        json={
-                            "model":  model,
-                            "messages": [{
-                                "role": "user",
-                                "content":  [
-                                    {"type": "text", "text": prompt},
-                                    {
-                                        "type": "image_url",
-                                        "image_url": {
-                                            "url": f"data:image/jpeg;base64,{image_base64}"
-                                        }
-                                    }
-                                ]
-                            }],
-                            "max_tokens": 300
-                        },
-                        timeout=60
+    def _call_vision_api(self, image_base64: str, prompt: str, max_retries: int = 3,
+                         deadline: Optional[float] = None, max_tokens: int = 300,
+                         stop_when: Optional[Callable[[JsonStreamScanner], bool]] = None,
+                         expect_json: bool = True) -> Optional[dict]:
+        """Pozovi Vision API (sinhroni omotac oko _call_vision_api_async)"""
+        return self.client.run(
+            self._call_vision_api_async(image_base64, prompt, max_retries, deadline, max_tokens, stop_when,
+                                        expect_json)
+        )
+    
+    async def _call_vision_api_async(self, image_base64: str, prompt: str, max_retries: int = 3,
+                                     deadline: Optional[float] = None, max_tokens: int = 300,
+                                     stop_when: Optional[Callable[[JsonStreamScanner], bool]] = None,
+                                     expect_json: bool = True) -> Optional[dict]:
+        """
+        Pozovi Vision API preko zajednickog connection pool-a.
+        
+        Args:
+            deadline: Ukupno vrijeme (sekunde) za sve modele i pokusaje; podrazumijevano request_deadline
+            max_tokens: Najveca duzina odgovora (kratki odgovori su brzi)
+            stop_when: Kod streaminga - kada je odgovor dovoljan (podrazumijevano: prvi JSON je zatvoren)
+            expect_json: Odgovor je JSON; za slobodan tekst (describe_screen) hedging prihvata svaki
+                         neprazan odgovor
+        """
+        deadline = time.time() + (deadline if deadline is not None else self.request_deadline)
+        
+        messages = [{
+            "role": "user",
+            "content":  [
+                {"type": "text", "text": prompt},
+                {
+                    "type": "image_url",
+                    "image_url": {
+                        "url": f"data:image/jpeg;base64,{image_base64}"
+                    }
+                }
+            ]
+        }]
+        
+        models = self.telemetry.rank(self.vision_models) if self.adaptive_routing else list(self.vision_models)
+        
+        if self.hedging:
+            return await self._call_hedged(messages, models, max_retries, deadline, max_tokens, stop_when,
+                                           expect_json)
+        
+        for model in models:
+            result = await self._request_model(model, messages, max_retries, deadline, max_tokens, stop_when)
+            if result is not None:
+                return result
+            if time.time() >= deadline:
+                break
+        
+        return None
+    
+    async def _request_model(self, model: str, messages: List[Dict[str, Any]], max_retries: int,
+                             deadline: float, max_tokens: int = 300,
+                             stop_when: Optional[Callable[[JsonStreamScanner], bool]] = None) -> Optional[dict]:
+        """Jedan model, sa ponavljanjem; None ako model nije dao odgovor."""
+        if not self.rate_limiter.available(model):
+            print(f"[ScreenAnalyzer] {model} is throttled, skipping")
+            return None
+        
+        for attempt in range(max_retries):
+            if time.time() >= deadline:
+                print(f"[ScreenAnalyzer] Deadline exceeded")
+                return None
+            
+            if not await self.rate_limiter.acquire(model, deadline):
+                print(f"[ScreenAnalyzer] No request slot for {model} before the deadline")
+                return None
+            
+            try:
+                started = time.time()
+                if self.streaming:
+                    status_code, headers, content, stopped_early = await self.client.chat_stream(
+                        model, messages, max_tokens=max_tokens, deadline=deadline, stop_when=stop_when
                     )
+                else:
+                    response = await self.client.chat(model, messages, max_tokens=max_tokens, deadline=deadline)
+                    status_code, headers = response.status_code, response.headers
+                self.rate_limiter.update_from_response(model, status_code, headers)
+                self.telemetry.record_response(model, time.time() - started, status_code)
+                
+                if status_code == 200:
+                    if self.streaming:
+                        # Isti oblik kao odgovor bez streaminga
+                        result = {"choices": [{"message": {"role": "assistant", "content": content}}],
+                                  "stopped_early": stopped_early}
+                        if stopped_early:
+                            self.streams_stopped_early += 1
+                    else:
+                        result = response.json()
+                    result["requested_model"] = model
+                    return result
+                elif status_code == 429:
+                    # Breaker je otvoren do Retry-After, odmah na sljedeci model
+                    print(f"[ScreenAnalyzer] Rate limit on {model}, trying next model")
+                    return None
+                else: 
+                    print(f"[ScreenAnalyzer] Error {status_code} on {model}")
+                    return None  # Try next model
                     
-                    if response.status_code == 200:
-                        return response.json()
-                    elif response.status_code == 429:
-                        print(f"[ScreenAnalyzer] Rate limit on {model}, waiting...")
-                        time. sleep(30)
-                        continue
-                    else: 
-                        print(f"[ScreenAnalyzer] Error {response.status_code} on {model}")
-                        break  # Try next model
-                        
-                except Exception as e:
-                    print(f"[ScreenAnalyzer] Error:  {e}")
-                    time.sleep(2)
+            except Exception as e:
+                print(f"[ScreenAnalyzer] Error:  {e}")
+                self.rate_limiter.record_failure(model)
+                self.telemetry.record_error(model)
+                if not self.rate_limiter.available(model):
+                    return None
+                await asyncio.sleep(2)
+        
+        return None
+    
+    def _hedge_delay(self, model: str) -> float:
+        """Koliko se ceka na model prije nego sto se isti zahtjev posalje sljedecem (percentil latencije)."""
+        delay = self.telemetry.latency_percentile(model, self.hedge_percentile)
+        return delay if delay is not None else self.hedge_default_delay
+    
+    @staticmethod
+    def _extract_json(text: str, opening: str = "{") -> Optional[Any]:
+        """
+        Prvi validan JSON objekat (ili niz, opening="[") u tekstu odgovora.
+        Radi i sa ugnijezdenim objektima, markdown blokovima i tekstom oko JSON-a.
+        """
+        decoder = json.JSONDecoder()
+        text = text or ""
+        index = text.find(opening)
+        
+        while index != -1:
+            try:
+                value, _ = decoder.raw_decode(text, index)
+                return value
+            except json.JSONDecodeError:
+                index = text.find(opening, index + 1)
         
         return None
     
+    @classmethod
+    def _has_answer(cls, result: Optional[dict], expect_json: bool = True) -> bool:
+        """Da li odgovor modela sadrzi JSON koji pozivaoci mogu da parsiraju (ili tekst, za expect_json=False)."""
+        try:
+            text = result["choices"][0]["message"]["content"]
+        except (KeyError, IndexError, TypeError):
+            return False
+        
+        if not expect_json:
+            return bool((text or "").strip())
+        return cls._extract_json(text, "{") is not None or cls._extract_json(text, "[") is not None
+    
+    async def _call_hedged(self, messages: List[Dict[str, Any]], models: List[str], max_retries: int,
+                           deadline: float, max_tokens: int = 300,
+                           stop_when: Optional[Callable[[JsonStreamScanner], bool]] = None,
+                           expect_json: bool = True) -> Optional[dict]:
+        """
+        Hedged zahtjev: ako primarni model ne odgovori za hedge delay, isti zahtjev ide
+        sljedecem modelu. Pobjedjuje prvi validan odgovor (JSON, ili tekst kad expect_json=False),
+        ostali se otkazuju.
+        """
+        models = list(models)
+        tasks: Dict[asyncio.Task, str] = {}
+        fallback = None
+        
+        def launch():
+            model = models.pop(0)
+            task = asyncio.ensure_future(
+                self._request_model(model, messages, max_retries, deadline, max_tokens, stop_when)
+            )
+            tasks[task] = model
+            return model
+        
+        current = launch()
+        
+        try:
+            while tasks:
+                remaining = max(0.0, deadline - time.time())
+                timeout = min(self._hedge_delay(current), remaining) if models else remaining
+                
+                done, _ = await asyncio.wait(list(tasks), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    if not models or time.time() >= deadline:
+                        break
+                    print(f"[ScreenAnalyzer] {current} is slow, hedging with {models[0]}")
+                    current = launch()
+                    continue
+                
+                for task in done:
+                    model = tasks.pop(task)
+                    result = task.result()
+                    if self._has_answer(result, expect_json):
+                        if tasks:
+                            print(f"[ScreenAnalyzer] {model} answered first, cancelling {len(tasks)} request(s)")
+                        return result
+                    fallback = fallback or result
+                
+                # Neuspjeh bez odgovora - sljedeci model odmah
+                if models and not tasks:
+                    current = launch()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        
+        return fallback
+    
+    def _to_screen(self, small_x, small_y, scale_factor: float,
+                   offset: Tuple[int, int] = (0, 0)) -> Tuple[int, int]:
+        """Preracunaj koordinate sa smanjene slike (ili isjecka na poziciji offset) na koordinate ekrana."""
+        original_x = offset[0] + int(int(small_x) / scale_factor)
+        original_y = offset[1] + int(int(small_y) / scale_factor)
+        
+        # Validacija
+        original_x = max(0, min(original_x, self.screen_width - 1))
+        original_y = max(0, min(original_y, self.screen_height - 1))
+        return original_x, original_y
+    
     def find_element_coordinates(
         self,
         element_description: str,
         context: str = "",
-        screenshot: Optional[Image.Image] = None
+        screenshot: Optional[Image.Image] = None,
+        use_cache: bool = True,
+        lookahead: Optional[List[Tuple[str, str]]] = None,
+        full_screen: bool = False,
+        grounding_mode: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Pronadji koordinate UI elementa na screenshotu.
         
+        Args:
+            use_cache: Da li koristiti rezultat iz cache-a ako se ekran nije promijenio
+            lookahead: (target, context) parovi narednih koraka - traze se u istom zahtjevu
+            full_screen: Cijeli ekran u vecoj rezoluciji, bez ROI i progresivnog trazenja (retry)
+            grounding_mode: "coordinates" ili "marks" samo za ovaj poziv (default VISION_GROUNDING_MODE)
+        
         Returns:
             {"found": True, "x": int, "y": int, "description": str} ili {"found": False}
         """
-        image_base64, scale_factor, w, h, _ = self._get_screenshot_base64(screenshot)
+        if screenshot is None:
+            screenshot = self.take_screenshot()
+        
+        fingerprint = screen_fingerprint(screenshot)
+        
+        # Referentni frame za detekciju promjena izmedju dva trazenja
+        current_thumbnail = thumbnail(screenshot)
+        with self._state_lock:
+            previous_thumbnail, self._reference_thumbnail = self._reference_thumbnail, current_thumbnail
+        
+        if use_cache:
+            cached = self.cache.get(element_description, context, fingerprint, screenshot)
+            if cached:
+                print(f"[ScreenAnalyzer] Cache hit for '{element_description}' at ({cached['x']}, {cached['y']})")
+                cached["cached"] = True
+                return cached
+        
+        # Lokalno poredjenje sa sacuvanim isjeccima elementa
+        local = self.locator.locate(element_description, screenshot)
+        if local:
+            print(f"[ScreenAnalyzer] Template match for '{element_description}' at ({local['x']}, {local['y']}) "
+                  f"score {local['confidence']}")
+            local.update({
+                "description": f"Template match (score {local['confidence']})",
+                "fingerprint": fingerprint,
+                "source": "template"
+            })
+            self.cache.put(element_description, context, fingerprint, local, screenshot)
+            return local
+        
+        # Elementi narednih koraka koji jos nisu u cache-u za ovaj ekran
+        pending = [
+            (target, target_context) for target, target_context in (lookahead or [])
+            if target.strip().lower() != element_description.strip().lower()
+            and not self.cache.contains(target, target_context, fingerprint, screenshot)
+        ]
+        
+        mode = grounding_mode or self.grounding_mode
+        if pending and not full_screen and mode != "marks":
+            # Jedan zahtjev i za naredne elemente (oni ostaju u cache-u); ako ovog nema u odgovoru,
+            # trazi se uobicajenim putem (ROI, progresivno)
+            batch = self.find_elements_batch([(element_description, context)] + pending, screenshot, fingerprint)
+            element = batch.get(element_description)
+            if element and element.get("found"):
+                return element
+            print(f"[ScreenAnalyzer] '{element_description}' missing from batch response, locating it alone")
+        
+        region = None if full_screen else self._propose_region(element_description, context, screenshot,
+                                                               previous_thumbnail, current_thumbnail)
+        
+        element = None
+        if mode == "marks":
+            element = self._locate_with_marks(element_description, context, screenshot, fingerprint, region)
+        
+        if not element or not element.get("found"):
+            if full_screen:
+                element = self._locate_with_vision(element_description, context, screenshot, fingerprint,
+                                                   max_size=self.fine_size)
+            else:
+                element = self._locate_with_coordinates(element_description, context, screenshot, fingerprint, region)
+            if element.get("found"):
+                self._refine_element(element_description, element, screenshot)
+        
+        if element.get("found"):
+            self.cache.put(element_description, context, fingerprint, element, screenshot)
+            self.locator.remember(element_description, screenshot, element["x"], element["y"])
+        
+        return element
+    
+    def _refine_element(self, element_description: str, element: Dict[str, Any], screenshot: Image.Image):
+        """
+        Pomjeri tacku iz Vision odgovora (smanjena slika) na centar najblizeg elementa
+        u punoj rezoluciji. Originalna tacka i pomak ostaju u rezultatu.
+        """
+        if not self.refine:
+            return
+        
+        refined = refine_point(screenshot, element["x"], element["y"])
+        if refined is None:
+            element["refine_shift"] = 0.0
+            return
+        
+        print(f"[ScreenAnalyzer] Refined '{element_description}' ({element['x']}, {element['y']}) -> "
+              f"({refined['x']}, {refined['y']}), moved {refined['shift']}px")
+        
+        element.update({
+            "raw_x": element["x"],
+            "raw_y": element["y"],
+            "x": refined["x"],
+            "y": refined["y"],
+            "box": list(refined["box"]),
+            "refine_shift": refined["shift"]
+        })
+        if element.get("candidates"):
+            element["candidates"][0] = dict(element["candidates"][0], x=refined["x"], y=refined["y"],
+                                            box=list(refined["box"]))
+    
+    def _locate_with_coordinates(
+        self,
+        element_description: str,
+        context: str,
+        screenshot: Image.Image,
+        fingerprint: str,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Dict[str, Any]:
+        """Trazenje u kojem model vraca koordinate (progresivno ili region pa cijeli ekran)."""
+        if self.progressive:
+            return self._locate_progressive(element_description, context, screenshot, fingerprint, region)
+        
+        element = None
+        if region:
+            element = self._locate_with_vision(element_description, context, screenshot, fingerprint, region)
+            if not element.get("found"):
+                print(f"[ScreenAnalyzer] '{element_description}' not in region {region}, trying full screen")
+        
+        if not element or not element.get("found"):
+            element = self._locate_with_vision(element_description, context, screenshot, fingerprint)
+        
+        return element
+    
+    def _locate_progressive(
+        self,
+        element_description: str,
+        context: str,
+        screenshot: Image.Image,
+        fingerprint: str,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Dvostepeno trazenje: prvo mala (jeftina) slika, a tek ako je odgovor nesiguran
+        ili element nije pronadjen - isjecak visoke rezolucije oko kandidata.
+        """
+        if region:
+            coarse = self._locate_with_vision(
+                element_description, context, screenshot, fingerprint, region,
+                max_pixels=self.coarse_size * self.coarse_size * 9 // 16, max_retries=1
+            )
+        else:
+            coarse = self._locate_with_vision(
+                element_description, context, screenshot, fingerprint,
+                max_size=self.coarse_size, max_retries=1
+            )
+        
+        if coarse.get("found") and coarse.get("confidence", 1.0) >= self.confidence_threshold:
+            return coarse
+        
+        if coarse.get("found"):
+            # Nesiguran odgovor - zumiraj oko kandidata u punoj rezoluciji
+            zoom = expand_box(
+                (coarse["x"], coarse["y"], coarse["x"] + 1, coarse["y"] + 1),
+                640, 360, screenshot.width, screenshot.height
+            )
+            print(f"[ScreenAnalyzer] Low confidence ({coarse.get('confidence')}), zooming into {zoom}")
+            fine = self._locate_with_vision(element_description, context, screenshot, fingerprint, zoom)
+            return fine if fine.get("found") else coarse
+        
+        # Nije pronadjen na maloj slici - cijeli ekran u vecoj rezoluciji
+        print(f"[ScreenAnalyzer] '{element_description}' not found on coarse image, trying full screen")
+        return self._locate_with_vision(
+            element_description, context, screenshot, fingerprint, max_size=self.fine_size
+        )
+    
+    def _locate_with_marks(
+        self,
+        element_description: str,
+        context: str,
+        screenshot: Image.Image,
+        fingerprint: str,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Set-of-Mark trazenje: lokalno predlozeni okviri elemenata se nacrtaju kao
+        numerisane oznake, a model odgovara samo brojem oznake.
+        
+        Returns:
+            None ako nema dovoljno okvira (pozivalac prelazi na trazenje koordinata)
+        """
+        boxes = self.locator.candidate_boxes(element_description, screenshot)
+        if region:
+            # Okviri iz template-a mogu biti van isjecka - model bi birao oznake koje ne vidi
+            boxes = [clipped for clipped in (clip_box(box, region) for box in boxes) if clipped]
+        boxes = dedupe_boxes(boxes + propose_boxes(screenshot, region))[:self.max_marks]
+        
+        if len(boxes) < 2:
+            return None
+        
+        image = screenshot.crop(region) if region else screenshot
+        offset = (region[0], region[1]) if region else (0, 0)
+        marked = draw_marks(image, boxes, offset)
+        
+        if region:
+            image_base64, scale_factor, w, h, _ = self._get_screenshot_base64(marked, max_pixels=self.roi_max_pixels * 2)
+        else:
+            image_base64, scale_factor, w, h, _ = self._get_screenshot_base64(marked, max_size=self.fine_size)
+        
+        self.last_request_geometry = {"offset": offset, "scale_factor": scale_factor, "size": (w, h),
+                                      "marks": boxes}
+        
+        prompt = f"""The screenshot has {len(boxes)} numbered boxes (marks) drawn on UI elements.
+                    Which mark is the UI element: "{element_description}"?
+
+                    {context}
+
+                    RESPOND WITH ONLY JSON:
+                    {{"marks": [<best mark id>, <second best id>], "confidence": <0.0-1.0>}}
+
+                    Or if no mark is on this element:
+                    {{"marks": [], "confidence": 0}}
+
+                    RULES:
+                    - Up to {self.top_k} mark ids, BEST FIRST
+                    - ONLY JSON, no other text"""
+        
+        print(f"[ScreenAnalyzer] Set-of-Mark request with {len(boxes)} marks")
+        result = self._call_vision_api(image_base64, prompt, max_retries=1, max_tokens=40)
+        if not result:
+            return None
+        
+        try:
+            parsed = self._extract_json(result["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError):
+            parsed = None
+        
+        if not isinstance(parsed, dict):
+            self._record_parse_failure(result)
+            return None
+        
+        # Model daje jednu ocjenu - za najbolju oznaku; ostali kandidati su bez ocjene
+        confidence = float(parsed.get("confidence", 1.0) or 0)
+        candidates = []
+        for mark_id in parsed.get("marks") or []:
+            try:
+                box = boxes[int(mark_id) - 1]
+            except (ValueError, TypeError, IndexError):
+                continue
+            x, y = box_center(box)
+            candidate = {"x": x, "y": y, "box": list(box), "description": f"Mark {mark_id}"}
+            if not candidates:
+                candidate["confidence"] = round(confidence, 3)
+            candidates.append(candidate)
+        
+        if not candidates:
+            print(f"[ScreenAnalyzer] No mark for '{element_description}'")
+            return {"found": False, "description": "No matching mark"}
+        
+        best = candidates[0]
+        print(f"[ScreenAnalyzer] Found '{element_description}' at mark {best['description']} ({best['x']}, {best['y']})")
+        
+        return {
+            "found": True,
+            "x": best["x"],
+            "y": best["y"],
+            "box": best["box"],
+            "confidence": best["confidence"],
+            "description": best["description"],
+            "fingerprint": fingerprint,
+            "model": result.get("requested_model"),
+            "source": "marks",
+            "candidates": candidates[:self.top_k],
+            "candidate_index": 0
+        }
+    
+    def _propose_region(
+        self,
+        element_description: str,
+        context: str,
+        screenshot: Image.Image,
+        previous_thumbnail,
+        current_thumbnail
+    ) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Odredi dio ekrana u kome se element vjerovatno nalazi.
+        Izvori: promjena u odnosu na prethodni frame (dropdown, novi dijalog)
+        i tipican polozaj UIElement klase (menu bar, toolbar, address bar...).
+        """
+        if not self.use_roi:
+            return None
+        
+        element_class = element_class_for(element_description, context)
+        region = None
+        
+        if element_class in CHANGE_DRIVEN_CLASSES:
+            region = changed_region(previous_thumbnail, current_thumbnail)
+        
+        if region is None:
+            region = region_for_class(element_class, screenshot.width, screenshot.height)
+        
+        if region is None:
+            return None
+        
+        return expand_box(region, 480, 270, screenshot.width, screenshot.height)
+    
+    def _locate_with_vision(
+        self,
+        element_description: str,
+        context: str,
+        screenshot: Image.Image,
+        fingerprint: str,
+        region: Optional[Tuple[int, int, int, int]] = None,
+        max_size: Optional[int] = None,
+        max_pixels: Optional[int] = None,
+        max_retries: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Jedan Vision API poziv za element (na cijelom ekranu ili na isjecku region).
+        
+        Args:
+            max_size: Najveca dimenzija poslate slike (podrazumijevano image_max_size za cijeli ekran)
+            max_pixels: Budzet piksela (podrazumijevano roi_max_pixels za isjecak)
+        """
+        if region:
+            if max_size is None and max_pixels is None:
+                max_pixels = self.roi_max_pixels
+            image_base64, scale_factor, w, h, _ = self._get_screenshot_base64(
+                screenshot.crop(region), max_size=max_size, max_pixels=max_pixels
+            )
+            offset = (region[0], region[1])
+            area_note = "This image is a CROPPED PART of the screen."
+        else:
+            image_base64, scale_factor, w, h, _ = self._get_screenshot_base64(screenshot, max_size=max_size)
+            offset = (0, 0)
+            area_note = ""
+        
+        self.last_request_geometry = {"offset": offset, "scale_factor": scale_factor, "size": (w, h)}
         
         prompt = f"""Find the UI element: "{element_description}" in this screenshot.
-                    Image size: {w}x{h} pixels. 
+                    Image size: {w}x{h} pixels. {area_note}
 
                     {context}
 
                     RESPOND WITH ONLY JSON: 
-                    {{"found": true, "x": <center_x>, "y": <center_y>, "description": "<what you found>"}}
+                    {{"found": true, "candidates": [
+                        {{"x": <center_x>, "y": <center_y>, "box": [<left>, <top>, <right>, <bottom>], "confidence": <0.0-1.0>, "description": "<what you found>"}}
+                    ]}}
 
                     Or if not found:
-                    {{"found": false, "x": 0, "y": 0, "description": "<reason>"}}
+                    {{"found": false, "candidates": [], "description": "<reason>"}}
 
                     RULES:
                     - x=0 is LEFT edge, x={w} is RIGHT edge
                     - y=0 is TOP edge, y={h} is BOTTOM edge
-                    - Return CENTER coordinates of the element
+                    - List up to {self.top_k} candidates that could be this element, BEST FIRST
+                    - x, y are CENTER coordinates, box is the element's bounding box
+                    - confidence is how sure you are that x, y is on the element
                     - ONLY JSON, no other text
                     - Check twice before answering"""
 
-        result = self._call_vision_api(image_base64, prompt)
+        result = self._call_vision_api(image_base64, prompt, max_retries=max_retries,
+                                       stop_when=self._grounding_answer_ready)
         
         if not result:
             return {"found": False, "description": "API did not respond"}
@@ -163,37 +805,227 @@ class ScreenAnalyzer:
             response_text = result["choices"][0]["message"]["content"]. strip()
             
             # Izvuci JSON
-            json_match = re.search(r'\{[^{}]*\}', response_text)
-            if not json_match: 
+            parsed = self._extract_json(response_text)
+            if not isinstance(parsed, dict): 
+                self._record_parse_failure(result)
                 return {"found":  False, "description":  "Nema JSON u odgovoru"}
             
-            parsed = json.loads(json_match.group())
-            
-            if parsed.get("found"):
-                # Skaliraj koordinate na originalni ekran
-                small_x, small_y = int(parsed["x"]), int(parsed["y"])
-                original_x = int(small_x / scale_factor)
-                original_y = int(small_y / scale_factor)
+            return self._element_from_answer(parsed, element_description, scale_factor, offset,
+                                             fingerprint, result.get("requested_model"))
                 
-                # Validacija
-                original_x = max(0, min(original_x, self. screen_width - 1))
-                original_y = max(0, min(original_y, self. screen_height - 1))
+        except Exception as e:
+            print(f"[ScreenAnalyzer] Error parsing response:  {e}")
+            self._record_parse_failure(result)
+            return {"found": False, "description": str(e)}
+    
+    def _element_from_answer(self, parsed: Dict[str, Any], element_description: str, scale_factor: float,
+                             offset: Tuple[int, int], fingerprint: str, model: Optional[str]) -> Dict[str, Any]:
+        """Rezultat trazenja iz parsiranog odgovora ({"found", "candidates"} ili stari format sa x, y)."""
+        # Stari format (samo x, y) je jedan kandidat
+        raw_candidates = parsed.get("candidates")
+        if not raw_candidates and "x" in parsed and "y" in parsed:
+            raw_candidates = [parsed]
+        
+        candidates = []
+        for raw in (raw_candidates or [])[:self.top_k]:
+            try:
+                candidates.append(self._candidate_to_screen(raw, scale_factor, offset))
+            except (KeyError, TypeError, ValueError):
+                continue
+        
+        if not parsed.get("found") or not candidates:
+            print(f"[ScreenAnalyzer] Element '{element_description}' not found")
+            return {"found": False, "description": parsed.get("description", "")}
+        
+        # Najsigurniji kandidat prvi (model ih vraca po redu, sort je stabilan)
+        candidates.sort(key=lambda c: c["confidence"], reverse=True)
+        best = candidates[0]
+        
+        print(f"[ScreenAnalyzer] Found '{element_description}' at ({best['x']}, {best['y']})"
+              f"{f' (+{len(candidates) - 1} candidates)' if len(candidates) > 1 else ''}")
+        
+        return {
+            "found": True,
+            "x": best["x"],
+            "y": best["y"],
+            "box": best["box"],
+            "confidence": best["confidence"],
+            "description": best["description"],
+            "fingerprint": fingerprint,
+            "model": model,
+            "candidates": candidates,
+            "candidate_index": 0
+        }
+    
+    @staticmethod
+    def _grounding_answer_ready(scanner: JsonStreamScanner) -> bool:
+        """Stream se prekida cim stignu kandidati (ili x, y starog formata) - ostatak teksta se ne ceka."""
+        if scanner.complete:
+            return True
+        fields = scanner.fields
+        if fields.get("found") is not True:
+            return False
+        return "candidates" in fields or ("x" in fields and "y" in fields)
+    
+    def _candidate_to_screen(self, raw: Dict[str, Any], scale_factor: float,
+                             offset: Tuple[int, int]) -> Dict[str, Any]:
+        """Kandidat iz odgovora modela u koordinatama ekrana."""
+        x, y = self._to_screen(raw["x"], raw["y"], scale_factor, offset)
+        
+        box = None
+        if isinstance(raw.get("box"), (list, tuple)) and len(raw["box"]) == 4:
+            left, top = self._to_screen(raw["box"][0], raw["box"][1], scale_factor, offset)
+            right, bottom = self._to_screen(raw["box"][2], raw["box"][3], scale_factor, offset)
+            box = [left, top, right, bottom]
+        
+        return {
+            "x": x,
+            "y": y,
+            "box": box,
+            "confidence": float(raw.get("confidence", 1.0)),
+            "description": raw.get("description", "")
+        }
+    
+    def next_candidate(self, element_description: str, element: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Sljedeci kandidat iz istog Vision odgovora, bez novog poziva.
+        
+        Returns:
+            None ako su kandidati potroseni ili se ekran u medjuvremenu promijenio
+        """
+        candidates = element.get("candidates") or []
+        index = element.get("candidate_index", 0) + 1
+        if index >= len(candidates):
+            return None
+        
+        current = screen_fingerprint(self.take_screenshot())
+        if fingerprint_distance(current, element.get("fingerprint", "")) > self.cache.max_distance:
+            print(f"[ScreenAnalyzer] Screen changed, candidates of '{element_description}' are stale")
+            return None
+        
+        candidate = candidates[index]
+        print(f"[ScreenAnalyzer] Trying candidate {index + 1}/{len(candidates)} for '{element_description}' "
+              f"at ({candidate['x']}, {candidate['y']})")
+        
+        retry = dict(element, **candidate, candidate_index=index)
+        if "confidence" not in candidate:
+            retry.pop("confidence", None)
+        retry.pop("cached", None)
+        retry.pop("prefetched", None)
+        return retry
+    
+    def _record_parse_failure(self, result: dict):
+        if result.get("requested_model"):
+            self.telemetry.record_parse_failure(result["requested_model"])
+    
+    def _report_outcome(self, element: Dict[str, Any], correct: bool):
+        # Samo lokacije koje je upravo vratio model (ne cache ni template)
+        if element.get("model") and not element.get("cached"):
+            self.telemetry.record_verification(element["model"], correct)
+    
+    def confirm_element(self, element: Dict[str, Any]):
+        """Akcija na lokaciji elementa je verifikovana kao uspjesna."""
+        self._report_outcome(element, True)
+    
+    def reject_element(self, element_description: str, element: Dict[str, Any]):
+        """Zaboravi lokaciju elementa koja se pokazala kao pogresna (cache i template)."""
+        self._report_outcome(element, False)
+        self.cache.invalidate(element_description, element.get("fingerprint"))
+        if "x" in element and "y" in element:
+            self.locator.forget(element_description, element["x"], element["y"])
+    
+    def find_elements_batch(
+        self,
+        targets: List[Tuple[str, str]],
+        screenshot: Optional[Image.Image] = None,
+        fingerprint: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Pronadji vise UI elemenata jednim Vision API pozivom.
+        Pronadjeni elementi se upisuju u cache za trenutni ekran.
+        
+        Args:
+            targets: Lista (target, context) parova
+            
+        Returns:
+            Dict target -> {"found": True, "x": int, "y": int} ili {"found": False}
+        """
+        if screenshot is None:
+            screenshot = self.take_screenshot()
+        if fingerprint is None:
+            fingerprint = screen_fingerprint(screenshot)
+        
+        image_base64, scale_factor, w, h, _ = self._get_screenshot_base64(screenshot)
+        
+        element_list = "\n".join(
+            f'{i}. "{target}" - {context or "Any visible UI element with this label."}'
+            for i, (target, context) in enumerate(targets, start=1)
+        )
+        
+        prompt = f"""Find each of these UI elements in this screenshot:
+                    {element_list}
+
+                    Image size: {w}x{h} pixels.
+
+                    RESPOND WITH ONLY A JSON ARRAY, one object per element, in the same order:
+                    [{{"id": 1, "found": true, "x": <center_x>, "y": <center_y>}}, ...]
+
+                    For an element that is not visible use:
+                    {{"id": <id>, "found": false, "x": 0, "y": 0}}
+
+                    RULES:
+                    - x=0 is LEFT edge, x={w} is RIGHT edge
+                    - y=0 is TOP edge, y={h} is BOTTOM edge
+                    - Return CENTER coordinates of each element
+                    - Mark an element as found ONLY if it is visible right now
+                    - ONLY JSON, no other text"""
+        
+        print(f"[ScreenAnalyzer] Batch request for {len(targets)} elements")
+        
+        results = {target: {"found": False, "description": "Not found in batch"} for target, _ in targets}
+        result = self._call_vision_api(image_base64, prompt)
+        
+        if not result:
+            for target in results:
+                results[target]["description"] = "API did not respond"
+            return results
+        
+        try:
+            response_text = result["choices"][0]["message"]["content"].strip()
+            
+            items = self._extract_json(response_text, "[")
+            if not isinstance(items, list):
+                self._record_parse_failure(result)
+                return results
+            
+            for item in items:
+                index = int(item.get("id", 0)) - 1
+                if not 0 <= index < len(targets) or not item.get("found"):
+                    continue
                 
-                print(f"[ScreenAnalyzer] Found '{element_description}' at ({original_x}, {original_y})")
+                target, context = targets[index]
+                original_x, original_y = self._to_screen(item["x"], item["y"], scale_factor)
                 
-                return {
+                element = {
                     "found": True,
                     "x": original_x,
                     "y": original_y,
-                    "description": parsed.get("description", "")
+                    "description": item.get("description", ""),
+                    "fingerprint": fingerprint,
+                    "model": result.get("requested_model")
                 }
-            else: 
-                print(f"[ScreenAnalyzer] Element '{element_description}' not found")
-                return {"found": False, "description": parsed.get("description", "")}
+                self._refine_element(target, element, screenshot)
+                self.cache.put(target, context, fingerprint, element, screenshot)
+                self.locator.remember(target, screenshot, element["x"], element["y"])
+                results[target] = element
                 
+                print(f"[ScreenAnalyzer] Batch found '{target}' at ({element['x']}, {element['y']})")
+        
         except Exception as e:
-            print(f"[ScreenAnalyzer] Error parsing response:  {e}")
-            return {"found": False, "description": str(e)}
+            print(f"[ScreenAnalyzer] Error parsing batch response: {e}")
+            self._record_parse_failure(result)
+        
+        return results
     
     def verify_action_result(
         self,
@@ -221,10 +1053,9 @@ class ScreenAnalyzer:
         
         try:
             response_text = result["choices"][0]["message"]["content"].strip()
-            json_match = re. search(r'\{[^{}]*\}', response_text)
+            parsed = self._extract_json(response_text)
             
-            if json_match:
-                parsed = json.loads(json_match. group())
+            if isinstance(parsed, dict):
                 status = "SATISFIED" if parsed.get("satisfied") else "NOT SATISFIED"
                 print(f"[ScreenAnalyzer] Verification '{expected_result}':  {status}")
                 return parsed
@@ -234,6 +1065,84 @@ class ScreenAnalyzer:
         
         return {"satisfied": False, "confidence": 0, "description": "Error parsing response"}
     
+    def verify_and_locate(
+        self,
+        expected_result: str,
+        next_target: str,
+        next_context: str = "",
+        screenshot: Optional[Image.Image] = None
+    ) -> Dict[str, Any]:
+        """
+        Verifikacija prethodnog koraka i trazenje elementa sljedeceg koraka u jednom Vision pozivu.
+        
+        Pronadjeni element ide u cache, pa ga find_element_coordinates za sljedeci
+        korak na istom ekranu uzima bez novog poziva.
+        
+        Returns:
+            Rezultat kao verify_action_result + "next_element"
+        """
+        if screenshot is None:
+            screenshot = self.take_screenshot()
+        
+        fingerprint = screen_fingerprint(screenshot)
+        image_base64, scale_factor, w, h, _ = self._get_screenshot_base64(screenshot)
+        
+        prompt = f"""Analyze this screenshot. Image size: {w}x{h} pixels.
+
+                    TASK 1 - Expected state: "{expected_result}"
+                    Is this condition satisfied?
+
+                    TASK 2 - Find the UI element: "{next_target}"
+                    {next_context}
+
+                    RESPOND WITH ONLY JSON:
+                    {{"satisfied": true, "confidence": 0.9, "description": "<what you see>",
+                      "next": {{"found": true, "candidates": [
+                        {{"x": <center_x>, "y": <center_y>, "box": [<left>, <top>, <right>, <bottom>], "confidence": <0.0-1.0>, "description": "<what you found>"}}
+                      ]}}}}
+
+                    If the element is not visible use "next": {{"found": false, "candidates": []}}
+
+                    RULES:
+                    - x=0 is LEFT edge, x={w} is RIGHT edge
+                    - y=0 is TOP edge, y={h} is BOTTOM edge
+                    - List up to {self.top_k} candidates, BEST FIRST
+                    - ONLY JSON, no other text"""
+        
+        self.fused_calls += 1
+        result = self._call_vision_api(image_base64, prompt)
+        
+        if not result:
+            return {"satisfied": False, "confidence": 0, "description": "API did not respond",
+                    "next_element": {"found": False}}
+        
+        try:
+            parsed = self._extract_json(result["choices"][0]["message"]["content"])
+        except (KeyError, IndexError, TypeError):
+            parsed = None
+        
+        if not isinstance(parsed, dict):
+            self._record_parse_failure(result)
+            return {"satisfied": False, "confidence": 0, "description": "Error parsing response",
+                    "next_element": {"found": False}}
+        
+        next_answer = parsed.get("next") if isinstance(parsed.get("next"), dict) else {}
+        element = self._element_from_answer(next_answer, next_target, scale_factor, (0, 0),
+                                            fingerprint, result.get("requested_model"))
+        if element.get("found"):
+            self._refine_element(next_target, element, screenshot)
+            self.cache.put(next_target, next_context, fingerprint, element, screenshot)
+        
+        status = "SATISFIED" if parsed.get("satisfied") else "NOT SATISFIED"
+        print(f"[ScreenAnalyzer] Verification '{expected_result}':  {status} (fused with '{next_target}')")
+        
+        return {
+            "satisfied": bool(parsed.get("satisfied")),
+            "confidence": parsed.get("confidence", 0),
+            "description": parsed.get("description", ""),
+            "next_element": element
+        }
+    
     def describe_screen(self, screenshot: Optional[Image.Image] = None) -> str:
         """Dobijanje opisa trenutnog ekrana"""
         
@@ -243,7 +1152,8 @@ class ScreenAnalyzer:
                     What application is open? 
                     What is visible on screen?"""
 
-        result = self._call_vision_api(image_base64, prompt)
+        # Odgovor je slobodan tekst - stream se ne prekida na prvoj [...] ili {...} u recenici
+        result = self._call_vision_api(image_base64, prompt, stop_when=lambda scanner: False, expect_json=False)
         
         if result: 
             try:
@@ -0,0 +1,140 @@
+import os
+import time
+import threading
+from typing import Optional, Dict, Type
+import numpy as np
+from PIL import Image
+try:
+    import pyautogui
+except Exception:
+    # Bez ekrana (headless, CI) pyautogui pada vec pri importu (nema DISPLAY)
+    pyautogui = None
+
+try:
+    import mss
+except ImportError:
+    mss = None
+
+
+class Frame:
+    """One captured screen frame, shared between grounding, verification and archiving."""
+
+    def __init__(self, pixels: np.ndarray, channel_order: str = "RGB", timestamp: Optional[float] = None,
+                 image: Optional[Image.Image] = None):
+        """
+        Args:
+            pixels: (height, width, channels) uint8 buffer as returned by the backend
+            channel_order: "RGB" or "BGRA" (raw layout of the buffer)
+            timestamp: Capture time (time.time())
+            image: PIL image of the same frame if the backend already has one
+        """
+        self.pixels = pixels
+        self.channel_order = channel_order
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self._image = image
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    @property
+    def rgb(self) -> np.ndarray:
+        """RGB view of the buffer (no copy)."""
+        if self.channel_order == "BGRA":
+            return self.pixels[:, :, 2::-1]
+        return self.pixels
+
+    @property
+    def image(self) -> Image.Image:
+        """PIL image of the frame, converted once on first use."""
+        if self._image is None:
+            size = (self.width, self.height)
+            if self.channel_order == "BGRA":
+                self._image = Image.frombuffer("RGB", size, np.ascontiguousarray(self.pixels), "raw", "BGRX", 0, 1)
+            else:
+                self._image = Image.fromarray(np.ascontiguousarray(self.pixels), "RGB")
+        return self._image
+
+
+class CaptureBackend:
+    """Base class for screen capture backends."""
+
+    name = "base"
+
+    def grab(self) -> Frame:
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PyAutoGUICapture(CaptureBackend):
+    """Original capture path (pyautogui.screenshot, PIL image)."""
+
+    name = "pyautogui"
+
+    def __init__(self):
+        if pyautogui is None:
+            raise RuntimeError("pyautogui is not available (no display)")
+
+    def grab(self) -> Frame:
+        image = pyautogui.screenshot()
+        return Frame(np.asarray(image), "RGB", image=image)
+
+
+class MSSCapture(CaptureBackend):
+    """Direct capture through mss (XGetImage / GDI / CoreGraphics), no subprocess and no PIL round trip."""
+
+    name = "mss"
+
+    def __init__(self, monitor: int = 1):
+        if mss is None:
+            raise ImportError("mss is not installed (pip install mss)")
+        self.monitor = monitor
+        # mss instance nije thread-safe, svaki thread dobija svoj
+        self._local = threading.local()
+
+    def _session(self):
+        if not hasattr(self._local, "sct"):
+            self._local.sct = mss.mss()
+        return self._local.sct
+
+    def grab(self) -> Frame:
+        sct = self._session()
+        shot = sct.grab(sct.monitors[self.monitor])
+        pixels = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        return Frame(pixels, "BGRA")
+
+    def close(self):
+        if hasattr(self._local, "sct"):
+            self._local.sct.close()
+            del self._local.sct
+
+
+CAPTURE_BACKENDS: Dict[str, Type[CaptureBackend]] = {
+    PyAutoGUICapture.name: PyAutoGUICapture,
+    MSSCapture.name: MSSCapture,
+}
+
+
+def create_capture_backend(name: Optional[str] = None) -> CaptureBackend:
+    """
+    Create a capture backend by name (SCREEN_CAPTURE_BACKEND env variable by default).
+    Falls back to pyautogui if the requested backend is not available.
+    """
+    name = (name or os.getenv("SCREEN_CAPTURE_BACKEND") or ("mss" if mss else "pyautogui")).lower()
+    backend_class = CAPTURE_BACKENDS.get(name)
+
+    if backend_class is None:
+        print(f"[ScreenCapture] Unknown backend '{name}', using pyautogui")
+        backend_class = PyAutoGUICapture
+
+    try:
+        return backend_class()
+    except Exception as e:
+        print(f"[ScreenCapture] Backend '{name}' not available ({e}), using pyautogui")
+        return PyAutoGUICapture()
@@ -0,0 +1,145 @@
+import re
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+Box = Tuple[int, int, int, int]
+
+# Tipicni polozaj elementa na ekranu po klasi UIElement iz ontologije
+# (left, top, right, bottom) kao udio sirine/visine ekrana
+UI_ELEMENT_REGIONS = {
+    "Menu": (0.0, 0.0, 1.0, 0.15),
+    "Toolbar": (0.0, 0.0, 1.0, 0.22),
+    "AddressBar": (0.0, 0.0, 1.0, 0.18),
+    "Tab": (0.0, 0.0, 1.0, 0.3),
+}
+
+# Klase koje se obicno pojavljuju tek nakon prethodne akcije (dropdown, novi dijalog)
+CHANGE_DRIVEN_CLASSES = {"MenuItem", "Dropdown", "Dialog", "Button"}
+
+
+def _split_class_name(name: str) -> str:
+    return re.sub(r"(?<=[a-z])(?=[A-Z])", " ", name).lower()
+
+
+def _ontology_classes() -> Tuple[Dict[str, List[str]], Dict[str, str]]:
+    """
+    UIElement klase i nazivi elemenata iz ontologije. Ako se ontologija ne ucita,
+    koriste se samo klase koje ovaj modul poznaje, sa nazivom izvedenim iz imena klase.
+    """
+    try:
+        # Uvoz ovdje: src.ontology uvozi execution paket (ontology_executor -> screen_analyzer)
+        from ..ontology.ontology_manager import OntologyManager
+        classes = OntologyManager.get_ui_element_classes()
+        if classes:
+            return classes, OntologyManager.get_ui_element_names()
+    except Exception as e:
+        print(f"[ScreenRegions] Ontology classes not available: {e}")
+
+    known = set(UI_ELEMENT_REGIONS) | CHANGE_DRIVEN_CLASSES
+    return {name: [_split_class_name(name)] for name in known}, {}
+
+
+def _mentioned_class(text: str, classes: Dict[str, List[str]]) -> Optional[str]:
+    """Klasa ciji se naziv pojavljuje u tekstu; najduzi naziv ima prednost ("menu item" prije "menu")"""
+    best, best_len = None, 0
+    for name, labels in classes.items():
+        for label in labels:
+            if len(label) > best_len and re.search(rf"\b{re.escape(label)}\b", text):
+                best, best_len = name, len(label)
+    return best
+
+
+def element_class_for(
+    target: str,
+    context: str = "",
+    classes: Optional[Dict[str, List[str]]] = None,
+    names: Optional[Dict[str, str]] = None
+) -> Optional[str]:
+    """
+    Map a target and its context hint (_get_click_context / _build_context)
+    to the ontology UIElement class it most likely belongs to.
+
+    The hint is checked first for a class name ("TOP MENU BAR" -> Menu), with the quoted
+    target removed so a target like 'Terminal' does not decide the class. Then the target
+    itself: a known element label ("URL bar" -> AddressBar), or a class name inside it.
+    """
+    if classes is None:
+        classes, ontology_names = _ontology_classes()
+        names = ontology_names if names is None else names
+    names = names or {}
+
+    hint = re.sub(r"'[^']*'", " ", context.lower()).replace("-", " ")
+    t = target.lower().strip()
+
+    return (
+        _mentioned_class(hint, classes)
+        or names.get(t)
+        or _mentioned_class(t, classes)
+    )
+
+
+def region_for_class(element_class: Optional[str], width: int, height: int) -> Optional[Box]:
+    """Static screen region for a UIElement class, or None if the class can be anywhere."""
+    fractions = UI_ELEMENT_REGIONS.get(element_class or "")
+    if fractions is None:
+        return None
+
+    left, top, right, bottom = fractions
+    return int(left * width), int(top * height), int(right * width), int(bottom * height)
+
+
+def thumbnail(screenshot: Image.Image, factor: int = 8) -> np.ndarray:
+    """Downscaled grayscale copy used for cheap frame comparisons."""
+    size = (max(1, screenshot.width // factor), max(1, screenshot.height // factor))
+    return np.asarray(screenshot.convert("L").resize(size, Image.Resampling.BILINEAR), dtype=np.int16)
+
+
+def changed_region(
+    previous: np.ndarray,
+    current: np.ndarray,
+    factor: int = 8,
+    threshold: int = 24,
+    padding: int = 24,
+    max_fraction: float = 0.7
+) -> Optional[Box]:
+    """
+    Bounding box (in full-screen pixels) of the area that changed between two thumbnails.
+
+    Returns:
+        None if nothing changed or if most of the screen changed (no useful region)
+    """
+    if previous is None or previous.shape != current.shape:
+        return None
+
+    changed = np.abs(current - previous) > threshold
+    if not changed.any():
+        return None
+
+    rows = np.where(changed.any(axis=1))[0]
+    cols = np.where(changed.any(axis=0))[0]
+
+    height, width = current.shape
+    box_w = cols[-1] - cols[0] + 1
+    box_h = rows[-1] - rows[0] + 1
+    if box_w * box_h > max_fraction * width * height:
+        return None
+
+    return (
+        max(0, int(cols[0]) * factor - padding),
+        max(0, int(rows[0]) * factor - padding),
+        min(width * factor, (int(cols[-1]) + 1) * factor + padding),
+        min(height * factor, (int(rows[-1]) + 1) * factor + padding)
+    )
+
+
+def expand_box(box: Box, min_width: int, min_height: int, width: int, height: int) -> Box:
+    """Grow a box around its center to at least min_width x min_height, kept inside the screen."""
+    left, top, right, bottom = box
+    center_x, center_y = (left + right) // 2, (top + bottom) // 2
+    box_w = min(width, max(right - left, min_width))
+    box_h = min(height, max(bottom - top, min_height))
+
+    left = max(0, min(center_x - box_w // 2, width - box_w))
+    top = max(0, min(center_y - box_h // 2, height - box_h))
+    return left, top, left + box_w, top + box_h
@@ -0,0 +1,150 @@
+import os
+import math
+import time
+from typing import Optional, Dict, Any
+import numpy as np
+
+from .screen_capture import CaptureBackend, Frame
+
+
+class ScreenSettle:
+    """
+    Event-driven wait: ends as soon as the screen stops changing.
+
+    Consecutive frames are compared as downscaled grayscale arrays; the wait
+    ends after stable_samples comparisons in a row stay below the threshold.
+    The requested duration is only an upper bound.
+
+    WAIT steps (page loads, spinners) use wait_for_load: a longer stability
+    window and a minimum duration, because loading UIs often pause for longer
+    than the default window between two changes.
+
+    Waits that expect a change (require_change) give up once nothing has
+    changed for change_timeout, so a screen that is already settled does not
+    cost the whole planned duration.
+    """
+
+    def __init__(
+        self,
+        capture: CaptureBackend,
+        interval: float = 0.1,
+        threshold: float = 1.5,
+        stable_samples: int = 3,
+        factor: int = 8,
+        load_stable_seconds: Optional[float] = None,
+        load_min_seconds: Optional[float] = None,
+        change_timeout: Optional[float] = None
+    ):
+        """
+        Args:
+            capture: Backend used to grab frames
+            interval: Seconds between samples
+            threshold: Mean absolute grayscale difference (0-255) that counts as "no change"
+            stable_samples: Consecutive stable comparisons needed to end the wait
+            factor: Downscale factor of the compared frames
+            load_stable_seconds: Stability window of WAIT steps (default WAIT_STABLE_SECONDS or 1.0)
+            load_min_seconds: Minimum duration of WAIT steps (default WAIT_MIN_SECONDS or 1.0)
+            change_timeout: How long a require_change wait waits for the first change
+                            (default SETTLE_CHANGE_TIMEOUT or 0.5)
+        """
+        self.capture = capture
+        self.interval = interval
+        self.threshold = threshold
+        self.stable_samples = stable_samples
+        self.factor = factor
+        self.load_stable_seconds = load_stable_seconds if load_stable_seconds is not None else \
+            float(os.getenv("WAIT_STABLE_SECONDS", "1.0"))
+        self.load_min_seconds = load_min_seconds if load_min_seconds is not None else \
+            float(os.getenv("WAIT_MIN_SECONDS", "1.0"))
+        self.change_timeout = change_timeout if change_timeout is not None else \
+            float(os.getenv("SETTLE_CHANGE_TIMEOUT", "0.5"))
+
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.waits = 0
+        self.early_exits = 0
+        self.planned_seconds = 0.0
+        self.waited_seconds = 0.0
+
+    def _sample(self, frame: Frame) -> np.ndarray:
+        return frame.rgb[::self.factor, ::self.factor].mean(axis=2, dtype=np.float32)
+
+    def wait(self, max_seconds: float, min_seconds: float = 0.0, require_change: bool = False,
+             change_timeout: Optional[float] = None, stable_seconds: Optional[float] = None) -> Frame:
+        """
+        Wait until the screen is stable, for at most max_seconds.
+
+        Args:
+            max_seconds: Upper bound (the planned or previously fixed wait)
+            min_seconds: Never return before this
+            require_change: Only accept stability after the screen has changed at least once
+                            (for waits on something that is still loading)
+            change_timeout: With require_change, stop after this many seconds without any change
+                            (the action had no visible effect, the screen is already settled);
+                            default self.change_timeout
+            stable_seconds: Stability window for this wait instead of stable_samples * interval
+
+        Returns:
+            Last captured frame
+        """
+        start = time.time()
+        deadline = start + max_seconds
+
+        frame = self.capture.grab()
+        previous = self._sample(frame)
+        stable = 0
+        changed = not require_change
+        stable_samples = self.stable_samples
+        if change_timeout is None:
+            change_timeout = self.change_timeout
+        # Bez ijedne promjene ne ceka se duze od min_seconds, ako je on duzi od change_timeout
+        change_timeout = max(change_timeout, min_seconds)
+        if stable_seconds is not None:
+            stable_samples = max(1, math.ceil(stable_seconds / self.interval))
+
+        while time.time() < deadline:
+            time.sleep(max(0.0, min(self.interval, deadline - time.time())))
+            frame = self.capture.grab()
+            current = self._sample(frame)
+
+            if float(np.abs(current - previous).mean()) < self.threshold:
+                stable += 1
+            else:
+                stable = 0
+                changed = True
+            previous = current
+
+            if changed and stable >= stable_samples and time.time() - start >= min_seconds:
+                break
+            if not changed and time.time() - start >= change_timeout:
+                break
+
+        elapsed = time.time() - start
+        self.waits += 1
+        self.planned_seconds += max_seconds
+        self.waited_seconds += min(elapsed, max_seconds)
+        if elapsed < max_seconds - self.interval:
+            self.early_exits += 1
+
+        return frame
+
+    def wait_for_load(self, max_seconds: float) -> Frame:
+        """
+        WAIT step: ends once loading has visibly finished, never before load_min_seconds
+        and only after the screen has been still for load_stable_seconds. If nothing
+        changes at all, it ends after the stability window (nothing is loading).
+        """
+        min_seconds = min(self.load_min_seconds, max_seconds)
+        return self.wait(max_seconds, min_seconds=min_seconds, require_change=True,
+                         change_timeout=max(min_seconds, self.load_stable_seconds),
+                         stable_seconds=self.load_stable_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "waits": self.waits,
+            "early_exits": self.early_exits,
+            "planned_s": round(self.planned_seconds, 2),
+            "waited_s": round(self.waited_seconds, 2),
+            "saved_s": round(self.planned_seconds - self.waited_seconds, 2)
+        }
@@ -0,0 +1,42 @@
+from typing import List, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+Box = Tuple[int, int, int, int]
+
+# Boje oznaka (naizmjenicno, da se susjedne oznake razlikuju)
+MARK_COLORS = [(230, 25, 75), (0, 130, 200), (60, 180, 75), (245, 130, 48), (145, 30, 180)]
+
+
+def draw_marks(image: Image.Image, boxes: List[Box], offset: Tuple[int, int] = (0, 0)) -> Image.Image:
+    """
+    Copy of the image with each box outlined and labeled with its mark id (1, 2, ...).
+
+    Args:
+        image: Screenshot or screenshot crop
+        boxes: Boxes in screen pixels
+        offset: Screen position of the image's top-left corner (for crops)
+    """
+    marked = image.convert("RGB")
+    draw = ImageDraw.Draw(marked)
+    font = ImageFont.load_default()
+
+    for mark_id, (left, top, right, bottom) in enumerate(boxes, start=1):
+        color = MARK_COLORS[(mark_id - 1) % len(MARK_COLORS)]
+        box = (left - offset[0], top - offset[1], right - offset[0] - 1, bottom - offset[1] - 1)
+        draw.rectangle(box, outline=color, width=2)
+
+        label = str(mark_id)
+        text_left, text_top, text_right, text_bottom = draw.textbbox((0, 0), label, font=font)
+        label_w, label_h = text_right - text_left + 4, text_bottom - text_top + 4
+
+        # Oznaka iznad gornjeg lijevog ugla (unutar slike ako nema mjesta)
+        label_x = max(0, box[0])
+        label_y = box[1] - label_h if box[1] - label_h >= 0 else box[1]
+        draw.rectangle((label_x, label_y, label_x + label_w, label_y + label_h), fill=color)
+        draw.text((label_x + 2 - text_left, label_y + 2 - text_top), label, fill=(255, 255, 255), font=font)
+
+    return marked
+
+
+def box_center(box: Box) -> Tuple[int, int]:
+    return (box[0] + box[2]) // 2, (box[1] + box[3]) // 2
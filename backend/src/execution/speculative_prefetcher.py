@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Dict, Any, List, Tuple
+
+from .grounding_cache import screen_fingerprint, fingerprint_distance
+from .screen_settle import ScreenSettle
+
+
+class SpeculativePrefetcher:
+    """
+    Locates the next step's target in a background thread while the current
+    action (cursor animation, typing, pauses between steps) is still running.
+
+    The prefetched location is only used if the screen fingerprint at the
+    start of that step still matches the frame it was computed on.
+    """
+
+    def __init__(
+        self,
+        analyzer,
+        settle_interval: float = 0.1,
+        settle_timeout: float = 3.0,
+        settle_threshold: float = 1.5,
+        change_timeout: float = 1.0,
+        max_distance: int = 3
+    ):
+        """
+        Args:
+            analyzer: ScreenAnalyzer used for grounding
+            settle_interval: Seconds between frames while waiting for the screen to settle
+            settle_timeout: Maximum time to wait for a settled screen
+            settle_threshold: Mean absolute frame difference that counts as "no change"
+            change_timeout: Started right after an input - how long to wait for the screen to react
+            max_distance: Fingerprint distance that still counts as the same screen
+        """
+        self.analyzer = analyzer
+        self.settle_timeout = settle_timeout
+        self.change_timeout = change_timeout
+        self.max_distance = max_distance
+        self.settle = ScreenSettle(analyzer.capture, interval=settle_interval, threshold=settle_threshold,
+                                   stable_samples=1)
+
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._pending: Optional[Dict[str, Any]] = None
+
+        self.started = 0
+        self.hits = 0
+        self.stale = 0
+        self.discarded = 0
+
+    def _run(self, target: str, context: str, lookahead: Optional[List[Tuple[str, str]]],
+             after_input: bool) -> Dict[str, Any]:
+        if after_input:
+            # Ulaz je upravo poslat - ekran se tek mijenja, trazi se tek kad se smiri
+            screenshot = self.settle.wait(self.settle_timeout, require_change=True,
+                                          change_timeout=self.change_timeout).image
+        else:
+            screenshot = self.settle.wait(self.settle_timeout).image
+        element = self.analyzer.find_element_coordinates(
+            target, context, screenshot=screenshot, lookahead=lookahead
+        )
+        return {"fingerprint": screen_fingerprint(screenshot), "element": element}
+
+    def start(self, target: str, context: str, lookahead: Optional[List[Tuple[str, str]]] = None,
+              after_input: bool = False):
+        """
+        Start locating a target in the background (replaces any earlier prefetch).
+        
+        Args:
+            after_input: Started right after the current action's input, before the UI has
+                         reacted - grounding waits for the screen to change and settle
+        """
+        if self._pending is not None:
+            self.discarded += 1
+
+        self.started += 1
+        self._pending = {
+            "target": target,
+            "context": context,
+            "future": self._pool.submit(self._run, target, context, lookahead, after_input)
+        }
+
+    def take(self, target: str, context: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Prefetched location for the target, if the screen still matches.
+
+        Waits for a prefetch that is still running (it is already paid for).
+        Returns None if there is no usable result; the caller then grounds live.
+        """
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return None
+
+        if pending["target"] != target or pending["context"] != context:
+            self.discarded += 1
+            return None
+
+        future: Future = pending["future"]
+        try:
+            prefetched = future.result(timeout=timeout)
+        except Exception as e:
+            print(f"[Prefetch] Failed for '{target}': {e}")
+            return None
+
+        element = prefetched["element"]
+        if not element or not element.get("found"):
+            return None
+
+        current = screen_fingerprint(self.analyzer.capture_frame().image)
+        if fingerprint_distance(current, prefetched["fingerprint"]) > self.max_distance:
+            self.stale += 1
+            print(f"[Prefetch] Screen changed, discarding location of '{target}'")
+            return None
+
+        self.hits += 1
+        print(f"[Prefetch] Using prefetched location of '{target}' ({element['x']}, {element['y']})")
+        return dict(element, prefetched=True)
+
+    def cancel(self):
+        """Drop the pending prefetch (its result is ignored if it is already running)."""
+        if self._pending is not None:
+            self._pending["future"].cancel()
+            self._pending = None
+            self.discarded += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {"started": self.started, "hits": self.hits, "stale": self.stale, "discarded": self.discarded}
+
+    def close(self):
+        self.cancel()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,316 @@
+import os
+import re
+import json
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+def normalized_cross_correlation(image: np.ndarray, template: np.ndarray) -> np.ndarray:
+    """
+    Normalized cross-correlation of a template over every valid position of a grayscale image.
+
+    Returns:
+        Score map of shape (H - h + 1, W - w + 1) with values in [-1, 1]
+    """
+    if cv2 is not None:
+        return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED)
+
+    h, w = template.shape
+    H, W = image.shape
+    n = h * w
+
+    template = template - template.mean()
+    template_norm = np.sqrt((template ** 2).sum())
+
+    # Korelacija preko FFT-a (template je okrenut da bi konvolucija postala korelacija)
+    shape = (H + h - 1, W + w - 1)
+    spectrum = np.fft.rfft2(image, shape) * np.fft.rfft2(template[::-1, ::-1], shape)
+    numerator = np.fft.irfft2(spectrum, shape)[h - 1:H, w - 1:W]
+
+    # Suma i suma kvadrata prozora preko integralnih slika
+    integral = np.pad(image.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    integral_sq = np.pad((image ** 2).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    window_sum = integral[h:, w:] - integral[:-h, w:] - integral[h:, :-w] + integral[:-h, :-w]
+    window_sq = integral_sq[h:, w:] - integral_sq[:-h, w:] - integral_sq[h:, :-w] + integral_sq[:-h, :-w]
+    window_var = np.maximum(window_sq - window_sum ** 2 / n, 0)
+
+    denominator = np.sqrt(window_var) * template_norm
+    scores = np.zeros_like(numerator)
+    valid = denominator > 1e-6
+    scores[valid] = numerator[valid] / denominator[valid]
+    return scores
+
+
+class TemplateLocator:
+    """Local locator that matches stored crops of previously grounded elements against the screen."""
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        scales: Tuple[float, ...] = (1.0, 0.9, 1.1),
+        crop_size: Tuple[int, int] = (120, 40),
+        search_margin: int = 240,
+        max_templates: int = 3,
+        crops_dir: Optional[str] = None
+    ):
+        """
+        Args:
+            threshold: Minimum correlation score accepted as a match
+            scales: Template scales tried for every search
+            crop_size: (width, height) of the crop stored around a grounded point
+            search_margin: How far from the last known position to search (pixels)
+            max_templates: Crops kept per target
+            crops_dir: Optional folder where crops are persisted between runs
+        """
+        self.threshold = threshold
+        self.scales = scales
+        self.crop_size = crop_size
+        self.search_margin = search_margin
+        self.max_templates = max_templates
+        self.crops_dir = crops_dir
+
+        # target -> lista {"crop": ndarray, "x": int, "y": int, "offset": (dx, dy)}
+        self._templates: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+        self.matches = 0
+        self.misses = 0
+
+        if self.crops_dir:
+            self._load()
+
+    @staticmethod
+    def _key(target: str) -> str:
+        return target.strip().lower()
+
+    def remember(self, target: str, screenshot: Image.Image, x: int, y: int):
+        """Store the crop around a grounded point as a template for the target."""
+        crop_w, crop_h = self.crop_size
+        left = max(0, min(x - crop_w // 2, screenshot.width - crop_w))
+        top = max(0, min(y - crop_h // 2, screenshot.height - crop_h))
+
+        crop = np.asarray(
+            screenshot.crop((left, top, left + crop_w, top + crop_h)).convert("L"),
+            dtype=np.float32
+        )
+
+        # Jednolicna povrsina ne moze pouzdano da se uporedi
+        if crop.std() < 8:
+            return
+
+        template = {"crop": crop, "x": x, "y": y, "offset": (x - left, y - top)}
+
+        with self._lock:
+            templates = self._templates.setdefault(self._key(target), [])
+            templates[:] = [t for t in templates if abs(t["x"] - x) > 4 or abs(t["y"] - y) > 4]
+            templates.insert(0, template)
+            del templates[self.max_templates:]
+
+        if self.crops_dir:
+            self._save()
+
+    def forget(self, target: str, x: Optional[int] = None, y: Optional[int] = None) -> int:
+        """Drop templates of a target (only the one recorded at x, y if given)."""
+        key = self._key(target)
+
+        with self._lock:
+            templates = self._templates.get(key, [])
+            kept = [
+                t for t in templates
+                if x is not None and (abs(t["x"] - x) > 4 or abs(t["y"] - y) > 4)
+            ]
+            removed = len(templates) - len(kept)
+            self._templates[key] = kept
+
+        if removed and self.crops_dir:
+            self._save()
+
+        return removed
+
+    def locate(
+        self,
+        target: str,
+        screenshot: Image.Image,
+        region: Optional[Tuple[int, int, int, int]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Search for the target's stored crops on the screenshot.
+
+        Args:
+            target: Element label
+            screenshot: Current screen
+            region: Optional (left, top, right, bottom) box to search instead of
+                    the neighbourhood of the last known positions
+
+        Returns:
+            {"found": True, "x": int, "y": int, "confidence": float} or None
+        """
+        with self._lock:
+            templates = list(self._templates.get(self._key(target), []))
+
+        if not templates:
+            return None
+
+        best = None
+
+        for template in templates:
+            search_box = region or (
+                template["x"] - self.search_margin,
+                template["y"] - self.search_margin,
+                template["x"] + self.search_margin,
+                template["y"] + self.search_margin
+            )
+            match = self._match(template, screenshot, search_box)
+            if match and (best is None or match["confidence"] > best["confidence"]):
+                best = match
+
+        if best is None or best["confidence"] < self.threshold:
+            self.misses += 1
+            return None
+
+        self.matches += 1
+        return best
+
+    def candidate_boxes(
+        self,
+        target: str,
+        screenshot: Image.Image,
+        min_score: float = 0.6
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Boxes where the target's stored crops match at least min_score
+        (weaker than the locate threshold - used as extra candidate boxes).
+        """
+        with self._lock:
+            templates = list(self._templates.get(self._key(target), []))
+
+        boxes = []
+        crop_w, crop_h = self.crop_size
+
+        for template in templates:
+            match = self._match(template, screenshot, (
+                template["x"] - self.search_margin,
+                template["y"] - self.search_margin,
+                template["x"] + self.search_margin,
+                template["y"] + self.search_margin
+            ))
+            if match and match["confidence"] >= min_score:
+                offset_x, offset_y = template["offset"]
+                left, top = match["x"] - offset_x, match["y"] - offset_y
+                boxes.append((left, top, left + crop_w, top + crop_h))
+
+        return boxes
+
+    def _match(
+        self,
+        template: Dict[str, Any],
+        screenshot: Image.Image,
+        search_box: Tuple[int, int, int, int]
+    ) -> Optional[Dict[str, Any]]:
+        left = max(0, int(search_box[0]))
+        top = max(0, int(search_box[1]))
+        right = min(screenshot.width, int(search_box[2]))
+        bottom = min(screenshot.height, int(search_box[3]))
+
+        if right - left < 8 or bottom - top < 8:
+            return None
+
+        area = np.asarray(screenshot.crop((left, top, right, bottom)).convert("L"), dtype=np.float32)
+        crop = template["crop"]
+        best = None
+
+        for scale in self.scales:
+            if scale == 1.0:
+                scaled = crop
+            else:
+                size = (max(8, int(crop.shape[1] * scale)), max(8, int(crop.shape[0] * scale)))
+                scaled = np.asarray(
+                    Image.fromarray(crop.astype(np.uint8)).resize(size, Image.Resampling.BILINEAR),
+                    dtype=np.float32
+                )
+
+            if scaled.shape[0] > area.shape[0] or scaled.shape[1] > area.shape[1]:
+                continue
+
+            scores = normalized_cross_correlation(area, scaled)
+            row, col = np.unravel_index(int(np.argmax(scores)), scores.shape)
+            score = float(scores[row, col])
+
+            if best is None or score > best["confidence"]:
+                offset_x, offset_y = template["offset"]
+                best = {
+                    "found": True,
+                    "x": int(left + col + offset_x * scale),
+                    "y": int(top + row + offset_y * scale),
+                    "confidence": round(score, 3)
+                }
+
+        return best
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "targets": len(self._templates),
+            "templates": sum(len(t) for t in self._templates.values()),
+            "matches": self.matches,
+            "misses": self.misses
+        }
+
+    def _load(self):
+        index_path = os.path.join(self.crops_dir, "index.json")
+        if not os.path.exists(index_path):
+            return
+
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+
+            for key, entries in index.items():
+                for entry in entries[:self.max_templates]:
+                    crop_path = os.path.join(self.crops_dir, entry["file"])
+                    if not os.path.exists(crop_path):
+                        continue
+                    crop = np.asarray(Image.open(crop_path).convert("L"), dtype=np.float32)
+                    self._templates.setdefault(key, []).append({
+                        "crop": crop,
+                        "x": entry["x"],
+                        "y": entry["y"],
+                        "offset": tuple(entry["offset"])
+                    })
+
+            print(f"[TemplateLocator] Loaded templates for {len(self._templates)} targets")
+        except Exception as e:
+            print(f"[TemplateLocator] Could not load templates: {e}")
+
+    def _save(self):
+        with self._lock:
+            try:
+                os.makedirs(self.crops_dir, exist_ok=True)
+                index = {}
+
+                for n, (key, templates) in enumerate(self._templates.items()):
+                    slug = re.sub(r"[^a-z0-9]+", "_", key).strip("_") or "element"
+                    index[key] = []
+
+                    for i, template in enumerate(templates):
+                        filename = f"{slug}_{n}_{i}.png"
+                        Image.fromarray(template["crop"].astype(np.uint8)).save(
+                            os.path.join(self.crops_dir, filename)
+                        )
+                        index[key].append({
+                            "file": filename,
+                            "x": template["x"],
+                            "y": template["y"],
+                            "offset": list(template["offset"])
+                        })
+
+                with open(os.path.join(self.crops_dir, "index.json"), "w", encoding="utf-8") as f:
+                    json.dump(index, f, ensure_ascii=False, indent=2)
+            except Exception as e:
+                print(f"[TemplateLocator] Could not save templates: {e}")
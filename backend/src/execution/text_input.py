@@ -0,0 +1,189 @@
+import os
+import sys
+import time
+import shutil
+import subprocess
+from typing import Optional, List
+
+from .input_backend import InputBackend, create_input_backend
+
+try:
+    import pyperclip
+except ImportError:
+    pyperclip = None
+
+# Nacini unosa teksta za type_text
+TYPE = "type"            # Kucanje karakter po karakter (input backend)
+CLIPBOARD = "clipboard"  # Paste iz clipboard-a (bez auto-indent i auto-zagrada u IDE-u)
+INJECT = "inject"        # Jedan red jednim pozivom xdotool-a (XTest); vise redova ide preko paste-a
+VISUAL = "visual"        # Kratak prefiks se kuca (vidi se u videu), ostatak se paste-uje
+
+TEXT_INPUT_MODES = (TYPE, CLIPBOARD, INJECT, VISUAL)
+
+
+class Clipboard:
+    """
+    System clipboard through pyperclip or a local helper
+    (xclip / xsel on X11, pbcopy on macOS, clip on Windows).
+    """
+
+    def __init__(self):
+        self.write_cmd: Optional[List[str]] = None
+        self.read_cmd: Optional[List[str]] = None
+
+        if pyperclip is not None:
+            self.name = "pyperclip"
+        elif sys.platform.startswith("linux") and shutil.which("xclip"):
+            self.name = "xclip"
+            self.write_cmd = ["xclip", "-selection", "clipboard", "-in"]
+            self.read_cmd = ["xclip", "-selection", "clipboard", "-out"]
+        elif sys.platform.startswith("linux") and shutil.which("xsel"):
+            self.name = "xsel"
+            self.write_cmd = ["xsel", "--clipboard", "--input"]
+            self.read_cmd = ["xsel", "--clipboard", "--output"]
+        elif sys.platform == "darwin":
+            self.name = "pbcopy"
+            self.write_cmd = ["pbcopy"]
+            self.read_cmd = ["pbpaste"]
+        elif sys.platform == "win32":
+            self.name = "clip"
+            self.write_cmd = ["clip"]
+        else:
+            self.name = None
+
+    @property
+    def available(self) -> bool:
+        return self.name is not None
+
+    def get(self) -> Optional[str]:
+        """Current clipboard text (None if it cannot be read)."""
+        try:
+            if pyperclip is not None:
+                return pyperclip.paste()
+            if self.read_cmd:
+                return subprocess.run(self.read_cmd, capture_output=True, timeout=2).stdout.decode("utf-8", "replace")
+        except Exception:
+            pass
+        return None
+
+    def set(self, text: str) -> bool:
+        try:
+            if pyperclip is not None:
+                pyperclip.copy(text)
+                return True
+            if self.write_cmd:
+                # clip.exe ocekuje UTF-16 sa BOM-om za ne-ASCII tekst
+                data = text.encode("utf-16") if self.name == "clip" else text.encode("utf-8")
+                subprocess.run(self.write_cmd, input=data, timeout=2, check=True)
+                return True
+        except Exception as e:
+            print(f"[TextInput] Clipboard error: {e}")
+        return False
+
+
+class TextInput:
+    """
+    Pluggable text entry for type_text.
+
+    The mode is chosen per call (step or plan setting) with TEXT_INPUT_MODE as
+    the default. Modes that need a helper fall back to typing when it is missing.
+
+    Inject still sends one key event per character, so an IDE applies its
+    auto-indent and auto-closing to it like to typed text. Multi-line text in
+    inject mode is therefore pasted when a clipboard is available.
+    """
+
+    def __init__(
+        self,
+        default_mode: Optional[str] = None,
+        typing_interval: float = 0.05,
+        visual_prefix: Optional[int] = None,
+        paste_settle: float = 0.3,
+        input_backend: Optional[InputBackend] = None
+    ):
+        """
+        Args:
+            default_mode: "type", "clipboard", "inject" or "visual" (default TEXT_INPUT_MODE or clipboard)
+            typing_interval: Seconds between characters for typed text
+            visual_prefix: Characters typed before the rest is pasted in visual mode
+            paste_settle: Seconds the application gets to read the clipboard before it is restored
+            input_backend: Backend for typed text and the paste hotkey (default INPUT_BACKEND)
+        """
+        self.default_mode = (default_mode or os.getenv("TEXT_INPUT_MODE", CLIPBOARD)).lower()
+        self.typing_interval = typing_interval
+        self.visual_prefix = visual_prefix if visual_prefix is not None else int(os.getenv("VISUAL_TYPING_PREFIX", "24"))
+        self.paste_settle = paste_settle
+        self.input = input_backend or create_input_backend()
+
+        self.clipboard = Clipboard()
+        self.inject_helper = shutil.which("xdotool") if sys.platform.startswith("linux") else None
+        self.paste_keys = ("command", "v") if sys.platform == "darwin" else ("ctrl", "v")
+
+        print(f"[TextInput] Default mode: {self.default_mode} "
+              f"(clipboard: {self.clipboard.name or 'none'}, inject helper: {self.inject_helper or 'none'})")
+
+    def resolve_mode(self, mode: Optional[str] = None) -> str:
+        """Requested mode, or the nearest one that works on this machine."""
+        mode = (mode or self.default_mode).lower()
+        if mode not in TEXT_INPUT_MODES:
+            print(f"[TextInput] Unknown input mode '{mode}', using {self.default_mode}")
+            mode = self.default_mode if self.default_mode in TEXT_INPUT_MODES else CLIPBOARD
+
+        if mode in (CLIPBOARD, VISUAL) and not self.clipboard.available:
+            return TYPE
+        if mode == INJECT and not self.inject_helper:
+            return CLIPBOARD if self.clipboard.available else TYPE
+        return mode
+
+    def type_text(self, text: str, mode: Optional[str] = None) -> str:
+        """
+        Enter text in the focused field.
+
+        Returns:
+            The mode that was actually used
+        """
+        mode = self.resolve_mode(mode)
+
+        if mode == CLIPBOARD:
+            self._paste(text)
+        elif mode == INJECT and "\n" in text and self.clipboard.available:
+            # Enter preko XTest-a pokrece auto-indent, paste ubacuje kod kakav jeste
+            self._paste(text)
+            mode = CLIPBOARD
+        elif mode == INJECT:
+            self._inject(text)
+        elif mode == VISUAL:
+            prefix = self._visual_prefix(text)
+            self._type(prefix)
+            if len(prefix) < len(text):
+                self._paste(text[len(prefix):])
+        else:
+            self._type(text)
+
+        return mode
+
+    def _visual_prefix(self, text: str) -> str:
+        """Dio teksta koji se kuca - do visual_prefix karaktera, ali ne preko prvog reda (auto-indent)."""
+        prefix = text[:self.visual_prefix]
+        return prefix.split("\n", 1)[0]
+
+    def _type(self, text: str):
+        self.input.write(text, interval=self.typing_interval)
+
+    def _paste(self, text: str):
+        previous = self.clipboard.get()
+        if not self.clipboard.set(text):
+            self._type(text)
+            return
+
+        self.input.hotkey(*self.paste_keys)
+
+        # Aplikacija cita clipboard asinhrono - prethodni sadrzaj se vraca tek nakon toga
+        time.sleep(self.paste_settle)
+        if previous is not None:
+            self.clipboard.set(previous)
+
+    def _inject(self, text: str):
+        # xdotool salje cijeli tekst preko XTest-a bez pauza izmedju karaktera
+        subprocess.run([self.inject_helper, "type", "--delay", "0", "--file", "-"],
+                       input=text.encode("utf-8"), timeout=60, check=True)
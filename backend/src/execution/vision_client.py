@@ -0,0 +1,182 @@
+import asyncio
+import json
+import threading
+import time
+from typing import Optional, Dict, Any, List, Tuple, Callable
+import httpx
+
+from .json_stream import JsonStreamScanner
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class VisionClient:
+    """
+    Pooled async HTTP client for an OpenAI-compatible chat completions API.
+
+    The client runs its own event loop in a background thread so synchronous
+    code (the executors) can use it through run() while async callers share
+    the same keep-alive connection pool.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://openrouter.ai/api/v1",
+        max_connections: int = 8,
+        timeout: float = 60.0
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="vision-client", daemon=True)
+        self._thread.start()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Kreira se unutar event loop-a klijenta
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=120
+                ),
+                timeout=httpx.Timeout(self.timeout, connect=10.0),
+                headers={
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json",
+                    "HTTP-Referer": "http://localhost",
+                    "X-Title": "ComputeUse"
+                }
+            )
+        return self._client
+
+    async def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: int = 300,
+        deadline: Optional[float] = None
+    ) -> httpx.Response:
+        """
+        POST /chat/completions.
+
+        Args:
+            deadline: Absolute time.time() after which the request is abandoned
+
+        Raises:
+            httpx.TimeoutException if the deadline passes before the response arrives
+        """
+        timeout = self.timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.time())
+            if timeout <= 0:
+                raise httpx.TimeoutException("Deadline exceeded before request was sent")
+
+        return await self._get_client().post(
+            "/chat/completions",
+            json={"model": model, "messages": messages, "max_tokens": max_tokens},
+            timeout=httpx.Timeout(timeout, connect=min(10.0, timeout))
+        )
+
+    async def chat_stream(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        max_tokens: int = 300,
+        deadline: Optional[float] = None,
+        stop_when: Optional[Callable[[JsonStreamScanner], bool]] = None
+    ) -> Tuple[int, httpx.Headers, str, bool]:
+        """
+        POST /chat/completions with "stream": true (server-sent events).
+
+        The answer is scanned while it arrives; the stream is closed as soon as
+        stop_when(scanner) is true (default: the first JSON value is closed),
+        so the model stops generating text nobody reads. Callers expecting free
+        text pass stop_when=lambda scanner: False.
+
+        Returns:
+            (status_code, headers, content, stopped_early); when stopped early the
+            content is the JSON received so far (closed as a valid value)
+
+        Raises:
+            httpx.TimeoutException if the deadline passes before the answer is complete
+        """
+        timeout = self.timeout
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.time())
+            if timeout <= 0:
+                raise httpx.TimeoutException("Deadline exceeded before request was sent")
+
+        stop_when = stop_when or (lambda scanner: scanner.complete)
+        scanner = JsonStreamScanner()
+
+        async with self._get_client().stream(
+            "POST",
+            "/chat/completions",
+            json={"model": model, "messages": messages, "max_tokens": max_tokens, "stream": True},
+            timeout=httpx.Timeout(timeout, connect=min(10.0, timeout))
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                return response.status_code, response.headers, response.text, False
+
+            async for line in response.aiter_lines():
+                if deadline is not None and time.time() > deadline:
+                    raise httpx.TimeoutException("Deadline exceeded while streaming")
+
+                # SSE komentari (": OPENROUTER PROCESSING") i prazne linije se preskacu
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+
+                event = json.loads(payload)
+                if "error" in event:
+                    raise RuntimeError(f"Stream error: {event['error']}")
+
+                choices = event.get("choices") or [{}]
+                scanner.feed((choices[0].get("delta") or {}).get("content") or "")
+
+                if stop_when(scanner):
+                    # Izlazak iz "async with" zatvara stream (HTTP/2: samo taj stream)
+                    return response.status_code, response.headers, scanner.snapshot() or scanner.text, True
+
+            return response.status_code, response.headers, scanner.text, False
+
+    def run(self, coroutine, timeout: Optional[float] = None):
+        """Run a coroutine on the client loop and wait for its result (sync wrapper)."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def close(self):
+        if self._client is not None:
+            self.run(self._client.aclose())
+            self._client = None
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+
+_clients: Dict[Tuple[str, str], VisionClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_vision_client(api_key: str, base_url: str = "https://openrouter.ai/api/v1") -> VisionClient:
+    """Process-wide client per (base_url, api_key), so all analyzers share one connection pool."""
+    key = (base_url.rstrip("/"), api_key)
+
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = VisionClient(api_key, base_url)
+            print(f"[VisionClient] Connection pool for {key[0]} (HTTP/2: {_clients[key].http2})")
+        return _clients[key]
@@ -14,7 +14,8 @@ class InputProcessor:
         if not api_key: 
             raise ValueError("GROQ_API_KEY is not set in the .env file!")
         
-        self.client = Groq(api_key=api_key)
+        # GROQ_BASE_URL - npr. lokalni stand-in server za testiranje opterecenja
+        self.client = Groq(api_key=api_key, base_url=os.getenv("GROQ_BASE_URL") or None)
         self.model = "llama-3.3-70b-versatile"
         print(f"Groq initialized (model: {self.model})")
     
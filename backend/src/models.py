@@ -24,6 +24,7 @@ class Step(BaseModel):
     description: str
     expected_result:  str
     is_optional: bool = False
+    input_mode: Optional[str] = None  # type_text: "clipboard", "inject", "visual" ili "type"
 
 
 class TaskPlan(BaseModel):
@@ -32,6 +33,7 @@ class TaskPlan(BaseModel):
     prerequisites: List[str]
     steps: List[Step]
     success_criteria: str
+    input_mode: Optional[str] = None  # Podrazumijevani nacin unosa teksta za cijeli plan
 
 class ParsedInput(BaseModel):
     raw_input: str
@@ -1,8 +1,8 @@
 import os
 import time
 import json
-from typing import Dict, Any, List, Optional
-from rdflib import Graph, Namespace, RDF, URIRef
+from typing import Dict, Any, List, Optional, Tuple, Callable
+from rdflib import Graph, Namespace, RDF, URIRef, Literal
 from rdflib.namespace import XSD
 
 from .ontology_manager import OntologyManager
@@ -10,6 +10,12 @@ from .plan_mapper import PlanMapper
 from .plan_validator import PlanValidator
 from ..execution.screen_analyzer import ScreenAnalyzer
 from ..execution.action_performer import ActionPerformer
+from ..execution.speculative_prefetcher import SpeculativePrefetcher
+from ..execution.screen_settle import ScreenSettle
+from ..execution.action_verifier import ActionVerifier
+from ..execution.retry_engine import RetryEngine
+from ..execution.screen_capture import Frame
+from ..execution.replay_anchor import capture_anchor, match_anchor
 from ..screen_recorder import ScreenRecorder
 
 
@@ -18,38 +24,74 @@ class OntologyExecutor:
     
     CU = Namespace("http://example.org/computer-use#")
     
-    def __init__(self, slow_mode: bool = True, record_video: bool = True):
+    # Steps that edit content; repeating them in a resume prefix would duplicate their input
+    NON_REPEATABLE_ACTIONS = ("type_text", "key_press", "key_combination")
+    
+    def __init__(self, slow_mode: bool = True, record_video: bool = True, lookahead_steps: int = 3,
+                 prefetch: bool = True, verify_steps: bool = False, resume_prefix: Optional[int] = None):
         """
         Initialize the ontology executor.
         
         Args:
             slow_mode: Add delays between actions for visibility
             record_video: Whether to record screen during execution
+            lookahead_steps: How many upcoming targets to locate in the same vision request (0 disables)
+            prefetch: Locate the next step's target in the background while the current step runs
+            verify_steps: Check each step's expected result (pixel diff first, vision only if ambiguous)
+            resume_prefix: Completed steps replayed (unrecorded) before a resumed run continues
+                           (default RESUME_PREFIX_STEPS or 1)
         """
         self.slow_mode = slow_mode
         self.record_video = record_video
+        self.lookahead_steps = lookahead_steps
+        self.verify_steps = verify_steps
+        self.input_mode: Optional[str] = None
+        self.resume_prefix = resume_prefix if resume_prefix is not None else int(os.getenv("RESUME_PREFIX_STEPS", "1"))
+        
+        # Replay anchors: resolved point, element crop and frame fingerprint stored per step in the
+        # executed ontology; a replay checks them locally and only falls back to vision on mismatch
+        self.record_anchors = os.getenv("REPLAY_ANCHORS", "1") != "0"
+        self.replay_threshold = float(os.getenv("REPLAY_MATCH_THRESHOLD", "0.9"))
+        self.replay_timeout = float(os.getenv("REPLAY_MATCH_TIMEOUT", "3"))
+        self.replay = False
+        self.replay_hits = 0
+        self.replay_misses = 0
         
         # Core components
         self.analyzer = ScreenAnalyzer()
         self.performer = ActionPerformer(slow_mode=slow_mode)
         self.recorder = ScreenRecorder() if record_video else None
+        self.prefetcher = SpeculativePrefetcher(self.analyzer) if prefetch else None
+        self.settle = ScreenSettle(self.analyzer.capture)
+        self.verifier = ActionVerifier(self.analyzer)
         
         # Ontology components
         self.ontology = OntologyManager()
         self.mapper = PlanMapper(self.ontology)
         self.validator = PlanValidator(self.ontology)
         
+        # Retries escalate grounding and fall back to the target's synonyms from the ontology
+        self.retry = RetryEngine(self.analyzer, self.settle, synonyms=OntologyManager.get_target_synonyms)
+        
         print("[OntologyExecutor] Initialized")
         print(f"[OntologyExecutor] Slow mode: {slow_mode}")
         print(f"[OntologyExecutor] Video recording: {record_video}")
+        print(f"[OntologyExecutor] Speculative prefetch: {prefetch}")
+        print(f"[OntologyExecutor] Step verification: {verify_steps}")
     
-    def execute_from_owl(self, owl_path: str, video_name: Optional[str] = None) -> Dict[str, Any]:
+    def execute_from_owl(self, owl_path: str, video_name: Optional[str] = None, resume: bool = False,
+                         append_to: Optional[str] = None, replay: bool = False) -> Dict[str, Any]:
         """
         Execute steps from an OWL ontology file.
         
         Args:
             owl_path: Path to the OWL/TTL file
             video_name: Name for the output video
+            resume: Continue from the first step not in CompletedState in the executed ontology
+                    (<owl_path>_executed), after replaying a short prefix to restore preconditions
+            append_to: Existing video the resumed part is appended to
+            replay: Reuse the replay anchors of the executed ontology (local pixel check,
+                    live grounding only where the element is not where it was)
             
         Returns:
             Execution results dictionary
@@ -64,14 +106,25 @@ class OntologyExecutor:
             "owl_path": owl_path
         }
         
-        # Load ontology from file
-        print(f"\n[OntologyExecutor] Loading ontology from: {owl_path}")
+        self.settle.reset_stats()
+        self.retry.reset_stats()
+        self.replay_hits = 0
+        self.replay_misses = 0
         
         if not os.path.exists(owl_path):
             print(f"[OntologyExecutor] ERROR: File not found: {owl_path}")
             results["error"] = f"OWL file not found: {owl_path}"
             return results
         
+        # Execution states are written next to the plan; a resumed run continues from them
+        updated_owl_path = owl_path.replace(".owl", "_executed.owl").replace(".ttl", "_executed.ttl")
+        source_path = self._resume_source(owl_path, updated_owl_path) if resume or replay else owl_path
+        resumed = resume and source_path == updated_owl_path
+        self.replay = replay and source_path == updated_owl_path
+        
+        # Load ontology from file
+        print(f"\n[OntologyExecutor] Loading ontology from: {source_path}")
+        
         # Create a new graph and load the OWL file
         graph = Graph()
         
@@ -84,7 +137,7 @@ class OntologyExecutor:
             file_format = "turtle"
         
         try:
-            graph.parse(owl_path, format=file_format)
+            graph.parse(source_path, format=file_format)
             print(f"[OntologyExecutor] Loaded {len(graph)} triples")
         except Exception as e:
             print(f"[OntologyExecutor] ERROR loading ontology: {e}")
@@ -104,6 +157,9 @@ class OntologyExecutor:
         task_goal = self._get_literal(graph, task_uri, self.CU.taskGoal)
         print(f"[OntologyExecutor] Goal: {task_goal}")
         
+        # Plan-level text input mode (steps can override it with cu:inputMode)
+        self.input_mode = self._get_literal(graph, task_uri, self.CU.inputMode) or None
+        
         # Get steps from ontology using SPARQL
         steps = self._get_steps_from_graph(graph, task_uri)
         results["total_steps"] = len(steps)
@@ -115,14 +171,36 @@ class OntologyExecutor:
         
         print(f"[OntologyExecutor] Found {len(steps)} steps")
         
+        start_index = 0
+        if resumed:
+            start_index = self._resume_index(steps)
+            # Completed steps are already in the existing video
+            results["successful_steps"] = start_index
+            results["resumed_from"] = steps[start_index]["id"] if start_index < len(steps) else None
+            
+            if start_index >= len(steps):
+                print("[OntologyExecutor] All steps already completed, nothing to resume")
+                results["success"] = True
+                results["video_path"] = append_to
+                results["updated_owl_path"] = updated_owl_path
+                return results
+            
+            print(f"[OntologyExecutor] Resuming from step {steps[start_index]['id']} "
+                  f"({start_index} completed steps skipped)")
+            results["prefix_steps"] = self._replay_prefix(steps, start_index, graph)
+        
         # Start video recording
         video_path = None
+        append = bool(resumed and append_to and os.path.exists(append_to))
         if self.record_video and self.recorder:
             print("\n[OntologyExecutor] Starting screen recording...")
             if video_name is None:
                 # Extract ID from task URI
                 task_id = str(task_uri).split("_")[-1]
                 video_name = f"tutorial_{task_id}"
+            if append:
+                # Resumed part is recorded separately and appended to the existing video at the end
+                video_name = f"{video_name}_resume"
             video_path = self.recorder.start_recording(video_name)
             #time.sleep(2)
         
@@ -135,14 +213,27 @@ class OntologyExecutor:
         print("=" * 60)
         
         try:
-            for step in steps:
-                step_result = self._execute_step(step, graph)
+            for index in range(start_index, len(steps)):
+                step = steps[index]
+                step_result = self._execute_step(
+                    step, graph, lookahead=self._lookahead_targets(steps, index),
+                    next_target=self._next_target(steps, index + 1),
+                    prefetch=lambda: self._start_prefetch(steps, index + 1, after_input=True)
+                )
                 results["steps"].append(step_result)
                 
+                # Steps without input (wait, open_application, fused verification) start it once they are done
+                if not step_result.pop("prefetch_started", False):
+                    self._start_prefetch(steps, index + 1)
+                
                 # Update state in graph
                 step_uri = URIRef(step["uri"])
                 state = self.CU.CompletedState if step_result["success"] else self.CU.FailedState
                 
+                anchor = step_result.pop("anchor", None)
+                if anchor:
+                    self._store_anchor(graph, step_uri, anchor)
+                
                 # Remove old state
                 graph.remove((step_uri, self.CU.hasState, None))
                 # Add new state
@@ -153,9 +244,9 @@ class OntologyExecutor:
                 else:
                     results["failed_steps"] += 1
                 
-                # Delay between steps
-                if self.slow_mode:
-                    time.sleep(0.5)
+                # Delay between steps comes from the presentation timing (ends early once the screen is stable)
+                if self.performer.timing.between_steps > 0:
+                    self.settle.wait(self.performer.timing.between_steps)
                     
         except Exception as e:
             print(f"[OntologyExecutor] Execution error: {e}")
@@ -163,15 +254,26 @@ class OntologyExecutor:
             traceback.print_exc()
         
         finally:
+            if self.prefetcher:
+                self.prefetcher.cancel()
+                results["prefetch"] = self.prefetcher.stats()
+            results["settle"] = self.settle.stats()
+            results["verification"] = self.verifier.stats()
+            results["retry"] = self.retry.stats()
+            results["replay"] = {"enabled": self.replay, "hits": self.replay_hits, "misses": self.replay_misses}
+            self.analyzer.flush()
+            
             # Stop recording
             if self.record_video and self.recorder and self.recorder.is_recording:
                 #time.sleep(2)
                 final_video = self.recorder.stop_recording()
-                if final_video:
+                if final_video and append:
+                    merged = self.recorder.append_video(append_to, final_video)
+                    results["video_path"] = merged or final_video
+                elif final_video:
                     results["video_path"] = final_video
             
             # Save updated ontology with execution states
-            updated_owl_path = owl_path.replace(".owl", "_executed.owl").replace(".ttl", "_executed.ttl")
             try:
                 graph.serialize(destination=updated_owl_path, format=file_format)
                 results["updated_owl_path"] = updated_owl_path
@@ -188,6 +290,7 @@ class OntologyExecutor:
         print(f"Successful: {results['successful_steps']}/{results['total_steps']}")
         print(f"Failed: {results['failed_steps']}")
         print(f"Status: {'SUCCESS' if results['success'] else 'FAILED'}")
+        print(f"Time saved by settle waits: {results['settle']['saved_s']}s")
         if results.get("video_path"):
             print(f"Video: {results['video_path']}")
         print("=" * 60)
@@ -244,22 +347,75 @@ class OntologyExecutor:
     #     # Execute from OWL
     #     return self.execute_from_owl(owl_path, video_name)
     
+    def _resume_source(self, owl_path: str, executed_path: str) -> str:
+        """Executed ontology to resume from, or the plan itself if there is no usable checkpoint."""
+        if not os.path.exists(executed_path):
+            print("[OntologyExecutor] No executed ontology found, running from the first step")
+            return owl_path
+        
+        # The plan was edited after the last run - its states no longer describe this plan
+        if os.path.getmtime(owl_path) > os.path.getmtime(executed_path):
+            print("[OntologyExecutor] Plan changed since the last run, running from the first step")
+            return owl_path
+        
+        return executed_path
+    
+    def _resume_index(self, steps: List[Dict[str, Any]]) -> int:
+        """Index of the first step that is not in CompletedState."""
+        for index, step in enumerate(steps):
+            if step["state"] != "CompletedState":
+                return index
+        return len(steps)
+    
+    def _replay_prefix(self, steps: List[Dict[str, Any]], start_index: int, graph: Graph) -> List[Dict[str, Any]]:
+        """
+        Replay the last completed steps before the resume point (not recorded, states unchanged)
+        so the screen is back in the state the next step expects. Steps that edit content
+        are skipped - their effect is already on screen.
+        """
+        prefix = [
+            step for step in steps[max(0, start_index - self.resume_prefix):start_index]
+            if step["action"] not in self.NON_REPEATABLE_ACTIONS
+        ]
+        if not prefix:
+            return []
+        
+        print(f"[OntologyExecutor] Replaying {len(prefix)} prefix step(s) to restore preconditions")
+        replayed = []
+        for step in prefix:
+            step_result = self._execute_step(step, graph)
+            replayed.append({"step_id": step["id"], "success": step_result["success"]})
+            if not step_result["success"]:
+                print(f"[OntologyExecutor] Prefix step {step['id']} failed, resuming anyway")
+        return replayed
+    
     def _find_task(self, graph: Graph) -> Optional[URIRef]:
-        """Find the Task individual in the graph"""
+        """
+        Find the job's Task individual in the graph.
+        
+        A plan's Task has steps (cu:hasStep); Task_<id> individuals are preferred over other Tasks
+        the file may carry (e.g. the schema's example workflows in ontologies saved earlier).
+        """
         query = """
         PREFIX cu: <http://example.org/computer-use#>
         PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
         
-        SELECT ?task WHERE {
+        SELECT ?task (COUNT(?step) AS ?steps) WHERE {
             ?task rdf:type cu:Task .
+            OPTIONAL { ?task cu:hasStep ?step }
         }
-        LIMIT 1
+        GROUP BY ?task
         """
         
-        results = list(graph.query(query))
-        if results:
-            return results[0][0]
-        return None
+        tasks = [(row.task, int(row.steps)) for row in graph.query(query)]
+        if not tasks:
+            return None
+        
+        def rank(item):
+            task, steps = item
+            return (steps > 0, str(task).startswith(str(self.CU["Task_"])), steps)
+        
+        return max(tasks, key=rank)[0]
     
     def _get_literal(self, graph: Graph, subject: URIRef, predicate: URIRef) -> str:
         """Get a literal value from the graph."""
@@ -274,7 +430,8 @@ class OntologyExecutor:
         PREFIX cu: <http://example.org/computer-use#>
         PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
         
-        SELECT ?step ?order ?action ?target ?description ?expected ?inputVal ?waitVal ?keyVal ?state
+        SELECT ?step ?order ?action ?target ?description ?expected ?inputVal ?waitVal ?keyVal ?state ?inputMode ?retryCount
+               ?resolvedX ?resolvedY ?elementCrop ?cropBox ?fingerprint ?screenSize
         WHERE {{
             <{task_uri}> cu:hasStep ?step .
             ?step cu:stepOrder ?order .
@@ -286,6 +443,16 @@ class OntologyExecutor:
             OPTIONAL {{ ?step cu:waitDuration ?waitVal }}
             OPTIONAL {{ ?step cu:keyName ?keyVal }}
             OPTIONAL {{ ?step cu:hasState ?state }}
+            OPTIONAL {{ ?step cu:inputMode ?inputMode }}
+            OPTIONAL {{ ?step cu:retryCount ?retryCount }}
+            OPTIONAL {{
+                ?step cu:resolvedX ?resolvedX ;
+                      cu:resolvedY ?resolvedY ;
+                      cu:elementCrop ?elementCrop ;
+                      cu:elementCropBox ?cropBox ;
+                      cu:frameFingerprint ?fingerprint ;
+                      cu:screenSize ?screenSize .
+            }}
         }}
         ORDER BY ?order
         """
@@ -315,13 +482,144 @@ class OntologyExecutor:
                 "value": value,
                 "description": str(row.description) if row.description else "",
                 "expected_result": str(row.expected) if row.expected else "",
-                "state": str(row.state).split("#")[-1] if row.state else "PendingState"
+                "state": str(row.state).split("#")[-1] if row.state else "PendingState",
+                "input_mode": str(row.inputMode) if row.inputMode else None,
+                "retry_count": int(row.retryCount) if row.retryCount else None,
+                "anchor": {
+                    "x": int(row.resolvedX),
+                    "y": int(row.resolvedY),
+                    "crop": str(row.elementCrop),
+                    "box": tuple(int(v) for v in str(row.cropBox).split(",")),
+                    "fingerprint": str(row.fingerprint),
+                    "screen": str(row.screenSize)
+                } if row.elementCrop else None
             })
         
         return steps
     
-    def _execute_step(self, step: Dict[str, Any], graph: Graph) -> Dict[str, Any]:
-        """Execute a single step."""
+    def _grounding_context(self, step: Dict[str, Any]) -> Optional[str]:
+        """Context hint used to locate the step's target, or None if the step needs no vision."""
+        action = step["action"]
+        target = step.get("target", "")
+        
+        if action == "click":
+            return self._build_context(target)
+        if action in ["double_click", "right_click"]:
+            return ""
+        if action == "type_text" and target and target.lower() not in ["editor", "screen", ""]:
+            return ""
+        return None
+    
+    def _lookahead_targets(self, steps: List[Dict[str, Any]], index: int) -> List[Tuple[str, str]]:
+        """Targets of the upcoming steps that may already be visible on the current screen."""
+        targets = []
+        
+        for step in steps[index + 1:]:
+            if len(targets) >= self.lookahead_steps or step["action"] == "open_application":
+                break
+            
+            context = self._grounding_context(step)
+            # Replayed steps are checked locally, they do not need a place in a vision request
+            if context is not None and not (self.replay and step.get("anchor")):
+                targets.append((step["target"], context))
+        
+        return targets
+    
+    def _next_grounding_index(self, steps: List[Dict[str, Any]], index: int) -> Optional[int]:
+        """
+        Index of the next step (from steps[index] on) whose target needs vision, or None.
+        Wait steps are skipped so grounding overlaps with the wait itself.
+        """
+        while index < len(steps) and steps[index]["action"] == "wait":
+            index += 1
+        if index >= len(steps) or self._grounding_context(steps[index]) is None:
+            return None
+        return index
+    
+    def _next_target(self, steps: List[Dict[str, Any]], index: int) -> Optional[Tuple[str, str]]:
+        """(target, context) located together with the previous step's verification."""
+        index = self._next_grounding_index(steps, index)
+        if index is None:
+            return None
+        return steps[index]["target"], self._grounding_context(steps[index])
+    
+    def _start_prefetch(self, steps: List[Dict[str, Any]], index: int, after_input: bool = False):
+        """Start locating the next target that needs vision, from steps[index] on."""
+        if not self.prefetcher:
+            return
+        
+        index = self._next_grounding_index(steps, index)
+        if index is not None and not (self.replay and steps[index].get("anchor")):
+            self.prefetcher.start(steps[index]["target"], self._grounding_context(steps[index]),
+                                  self._lookahead_targets(steps, index), after_input=after_input)
+    
+    def _locate(self, target: str, context: str,
+                lookahead: Optional[List[Tuple[str, str]]] = None,
+                anchor: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Replay anchor or prefetched location if the screen still matches, otherwise live grounding."""
+        if self.replay and anchor:
+            element = self._replay_locate(target, anchor)
+            if element:
+                return element
+        
+        element = self.prefetcher.take(target, context) if self.prefetcher else None
+        if element is None:
+            element = self.analyzer.find_element_coordinates(target, context, lookahead=lookahead)
+        return element
+    
+    def _replay_locate(self, target: str, anchor: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Wait (up to replay_timeout) for the anchored element to appear where the previous run
+        found it. The screen may still be changing after the previous step, so frames are
+        checked until the element matches.
+        """
+        deadline = time.time() + self.replay_timeout
+        
+        while True:
+            frame = self.analyzer.capture_frame()
+            element = match_anchor(anchor, frame.image, self.replay_threshold)
+            if element or time.time() >= deadline:
+                break
+            time.sleep(0.1)
+        
+        if element:
+            self.replay_hits += 1
+            print(f"[OntologyExecutor] Replay anchor for '{target}' at ({element['x']}, {element['y']}) "
+                  f"score {element['confidence']}")
+        else:
+            self.replay_misses += 1
+            print(f"[OntologyExecutor] Replay anchor for '{target}' does not match, grounding live")
+        return element
+    
+    def _store_anchor(self, graph: Graph, step_uri: URIRef, anchor: Dict[str, Any]):
+        """Persist the step's replay anchor in the executed ontology (replacing an older one)."""
+        values = {
+            self.CU.resolvedX: Literal(anchor["x"], datatype=XSD.integer),
+            self.CU.resolvedY: Literal(anchor["y"], datatype=XSD.integer),
+            self.CU.elementCrop: Literal(anchor["crop"], datatype=XSD.base64Binary),
+            self.CU.elementCropBox: Literal(",".join(str(v) for v in anchor["box"])),
+            self.CU.frameFingerprint: Literal(anchor["fingerprint"]),
+            self.CU.screenSize: Literal(anchor["screen"])
+        }
+        for predicate, value in values.items():
+            graph.remove((step_uri, predicate, None))
+            graph.add((step_uri, predicate, value))
+    
+    def _execute_step(self, step: Dict[str, Any], graph: Graph,
+                      lookahead: Optional[List[Tuple[str, str]]] = None,
+                      next_target: Optional[Tuple[str, str]] = None,
+                      prefetch: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+        """
+        Execute a single step.
+        
+        Args:
+            step: Step dictionary read from the graph
+            graph: Ontology graph being executed
+            lookahead: Upcoming (target, context) pairs located in the same vision request
+            next_target: Next step's (target, context), located in the same request as this step's verification
+            prefetch: Starts locating the next target; called as soon as this step's input is sent,
+                      so grounding overlaps the presentation pauses and the verification
+        """
         
         result = {
             "step_id": step["id"],
@@ -334,90 +632,57 @@ class OntologyExecutor:
         
         action = step["action"]
         target = step.get("target", "")
-        value = step.get("value")
         description = step.get("description", "")
         
         print(f"\n[Step {step['id']}] {action.upper()} -> {target}")
         if description:
             print(f"{description}")
         
-        try:
-            if action == "open_application":
-                self.performer.minimize_all()
-                time.sleep(0.5)
-                success = self.performer.open_application(target)
-                
-            elif action == "wait":
-                duration = int(value) if value else 3
-                print(f"Waiting {duration} seconds...")
-                success = self.performer.wait(duration)
-                
-            elif action == "click":
-                context = self._build_context(target)
-                element = self.analyzer.find_element_coordinates(target, context)
-                if element and element.get("found"):
-                    success = self.performer.click(element["x"], element["y"])
-                else:
-                    print(f"Element '{target}' not found")
-                    success = False
-                    result["error"] = f"Element not found: {target}"
-                    
-            elif action == "double_click":
-                element = self.analyzer.find_element_coordinates(target)
-                if element and element.get("found"):
-                    success = self.performer.double_click(element["x"], element["y"])
-                else:
-                    success = False
-                    result["error"] = f"Element not found: {target}"
-                    
-            elif action == "right_click":
-                element = self.analyzer.find_element_coordinates(target)
-                if element and element.get("found"):
-                    success = self.performer.right_click(element["x"], element["y"])
-                else:
-                    success = False
-                    result["error"] = f"Element not found: {target}"
-                    
-            elif action == "type_text":
-                # Click on target first if specified
-                if target and target.lower() not in ["editor", "screen", ""]:
-                    element = self.analyzer.find_element_coordinates(target)
-                    if element and element.get("found"):
-                        self.performer.click(element["x"], element["y"])
-                        time.sleep(0.3)
-                
-                success = self.performer.type_text_with_clipboard(value or "")
-                
-            elif action == "key_press":
-                key = value or target
-                success = self.performer.press_key(key.lower())
-                
-            elif action == "key_combination":
-                keys_str = value or target
-                keys = keys_str.lower().replace(" ", "").split("+")
-                success = self.performer.key_combination(*keys)
-                
-            elif action == "scroll":
-                amount = int(value) if value else -3
-                success = self.performer.scroll(amount)
-                
-            elif action == "move_mouse":
-                # Parse coordinates from value (format: "x,y")
-                if value and "," in value:
-                    x, y = map(int, value.split(","))
-                    success = self.performer.move_mouse(x, y)
-                else:
-                    success = False
-                    result["error"] = "Invalid coordinates for move_mouse"
-                    
-            else:
-                print(f"Unknown action: {action}")
-                success = False
-                result["error"] = f"Unknown action: {action}"
+        expected = step.get("expected_result", "")
+        context = self._grounding_context(step)
+        verify = bool(self.verify_steps and expected)
+        
+        def on_input():
+            result["prefetch_started"] = True
+            prefetch()
+        
+        def perform(element: Optional[Dict[str, Any]]) -> bool:
+            located = bool(element and element.get("found"))
             
+            # Frame before the action, for local verification and the replay anchor
+            frame = None
+            if verify or (located and self.record_anchors):
+                frame = self.analyzer.capture_frame()
+            
+            # A fused verification already locates the next target - no parallel request for it
+            fire = on_input if prefetch and not (verify and next_target) else None
+            try:
+                success = self._perform_action(step, element, result, on_input=fire)
+            finally:
+                self.performer.after_input = None
+            if success and frame is not None and verify:
+                success = self._verify_step(step, frame, element, result, next_target)
+            
+            if not success and result.pop("prefetch_started", False) and self.prefetcher:
+                # The step is retried - a prefetch started on this attempt's screen is stale
+                self.prefetcher.cancel()
+            
+            if success and located and frame is not None and self.record_anchors:
+                result["anchor"] = capture_anchor(frame.image, element["x"], element["y"])
+            return success
+        
+        try:
+            success = self.retry.run(
+                target, context, perform,
+                locate=lambda t, c: self._locate(t, c, lookahead, step.get("anchor")),
+                result=result,
+                max_attempts=step.get("retry_count"),
+                optional_target=action == "type_text"
+            )
             result["success"] = success
             
             if success:
+                result["error"] = None
                 print(f"[OK]")
             else:
                 print(f"[FAILED]")
@@ -429,6 +694,103 @@ class OntologyExecutor:
         
         return result
     
+    def _perform_action(self, step: Dict[str, Any], element: Optional[Dict[str, Any]],
+                        result: Dict[str, Any], on_input: Optional[Callable[[], None]] = None) -> bool:
+        """
+        Perform the step's action once (element is the located target, if the action needs one).
+        on_input is called by the performer right after the step's input is sent.
+        """
+        action = step["action"]
+        target = step.get("target", "")
+        value = step.get("value")
+        
+        if action not in ("open_application", "wait", "type_text"):
+            self.performer.after_input = on_input
+        
+        if action == "open_application":
+            self.performer.minimize_all()
+            self.settle.wait(1.5, require_change=True)
+            return self.performer.open_application(target)
+            
+        elif action == "wait":
+            # Planned duration is an upper bound, the wait ends once loading is done
+            duration = int(value) if value else 3
+            print(f"Waiting up to {duration} seconds...")
+            self.settle.wait_for_load(duration)
+            return True
+            
+        elif action == "click":
+            return self.performer.click(element["x"], element["y"])
+                
+        elif action == "double_click":
+            return self.performer.double_click(element["x"], element["y"])
+                
+        elif action == "right_click":
+            return self.performer.right_click(element["x"], element["y"])
+                
+        elif action == "type_text":
+            # Click on target first if it was located
+            if element and element.get("found"):
+                self.performer.click(element["x"], element["y"])
+                # Field needs focus before typing
+                self.settle.wait(0.3)
+            
+            # The screen only reaches its next state once the text is entered
+            self.performer.after_input = on_input
+            return self.performer.type_text_with_clipboard(value or "", step.get("input_mode") or self.input_mode)
+            
+        elif action == "key_press":
+            key = value or target
+            return self.performer.press_key(key.lower())
+            
+        elif action == "key_combination":
+            keys_str = value or target
+            keys = keys_str.lower().replace(" ", "").split("+")
+            return self.performer.key_combination(*keys)
+            
+        elif action == "scroll":
+            amount = int(value) if value else -3
+            return self.performer.scroll(amount)
+            
+        elif action == "move_mouse":
+            # Parse coordinates from value (format: "x,y")
+            if value and "," in value:
+                x, y = map(int, value.split(","))
+                return self.performer.move_mouse(x, y)
+            result["error"] = "Invalid coordinates for move_mouse"
+            return False
+                
+        print(f"Unknown action: {action}")
+        result["error"] = f"Unknown action: {action}"
+        return False
+    
+    def _verify_step(self, step: Dict[str, Any], before: Frame, element: Optional[Dict[str, Any]],
+                     result: Dict[str, Any], next_target: Optional[Tuple[str, str]] = None) -> bool:
+        """
+        Check the step's expected result and feed the outcome back to the analyzer.
+        If vision is needed, the next step's target is located in the same request
+        (it lands in the grounding cache for the next step).
+        """
+        after = self.settle.wait(1, require_change=True)
+        point = (element["x"], element["y"]) if element and element.get("found") else None
+        
+        verification = self.verifier.verify(step["expected_result"], before, after, point, step["action"],
+                                            next_target=next_target)
+        result["verification"] = {
+            "satisfied": bool(verification.get("satisfied")),
+            "effect": bool(verification.get("effect")),
+            "source": verification.get("source")
+        }
+        
+        # A rejected location is forgotten by the retry engine before the next attempt
+        if point is not None and verification.get("satisfied"):
+            self.analyzer.confirm_element(element)
+        
+        if not verification.get("satisfied"):
+            result["error"] = f"Verification failed: {verification.get('description', '')}"
+            return False
+        return True
+    
     def _build_context(self, target: str) -> str:
         """Build context hint for vision model."""
         t = target.lower()
@@ -1,9 +1,15 @@
 import os
+import threading
 from rdflib import Graph, Namespace, RDF, RDFS, OWL, Literal, URIRef
 from rdflib.namespace import XSD
 from typing import Optional, List, Dict, Any
 
 
+# Shema sa primjerima (UI elementi, nazivi, primjeri Task-ova) - cita se odvojeno i nikad se ne
+# kopira u graf task ontologije, inace bi njeni Task individual-i zavrsili u svakom sacuvanom planu
+VOCABULARY_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "ontology_files", "computer_use.ttl")
+
+
 class OntologyManager:
     """Upravlja Computer Use ontologijom"""
     
@@ -18,6 +24,16 @@ class OntologyManager:
         "close_application", "scroll", "move_mouse"
     ]
     
+    # Rijeci koje opisuju vrstu elementa, a ne njegov natpis ("Next button" = "Next")
+    UI_CLASS_WORDS = {"button", "field", "box", "tab", "menu", "icon", "link", "item", "template"}
+    
+    # Vocabulary graph and label index, shared by all instances (parsed once per process)
+    _vocabulary: Optional[Graph] = None
+    _label_index: Optional[Dict[str, List[List[str]]]] = None
+    _ui_classes: Optional[Dict[str, List[str]]] = None
+    _ui_elements: Optional[Dict[str, str]] = None
+    _vocabulary_lock = threading.Lock()
+    
     def __init__(self, ontology_path: str = None):
         """
         Inicijalizuj ontology manager.
@@ -112,6 +128,146 @@ class OntologyManager:
         """Provjeri da li je akcija validna"""
         return action_name.lower() in [a.lower() for a in self.get_valid_actions()]
     
+    @staticmethod
+    def _label_key(label: str) -> str:
+        return " ".join(label.lower().replace("'", "").replace('"', "").split())
+    
+    @classmethod
+    def _target_keys(cls, target: str) -> List[str]:
+        """
+        Kljucevi pod kojima se trazi naziv iz plana: cijeli naziv i naziv bez jedne zavrsne
+        rijeci vrste elementa ("Next button" -> "next"). Nazivi iz ontologije se porede cijeli,
+        inace bi "New" odgovaralo "New tab" (dugme za novi tab u browseru).
+        """
+        key = cls._label_key(target)
+        words = key.split()
+        if len(words) > 1 and words[-1] in cls.UI_CLASS_WORDS:
+            return [key, " ".join(words[:-1])]
+        return [key]
+    
+    @classmethod
+    def vocabulary(cls) -> Graph:
+        """
+        Schema graph with the UI element individuals and their labels (ontology_files/computer_use.ttl).
+        Loaded on first use and kept separate from self.graph, so nothing from it is saved into a task ontology.
+        """
+        with cls._vocabulary_lock:
+            if cls._vocabulary is None:
+                graph = Graph()
+                path = os.path.abspath(VOCABULARY_PATH)
+                try:
+                    graph.parse(path, format="turtle")
+                    print(f"[OntologyManager] Loaded vocabulary: {len(graph)} triples")
+                except Exception as e:
+                    print(f"[OntologyManager] Vocabulary not loaded ({path}): {e}")
+                cls._vocabulary = graph
+            return cls._vocabulary
+    
+    @classmethod
+    def _build_label_index(cls, graph: Graph) -> Dict[str, List[List[str]]]:
+        """Svi nazivi (rdfs:label i cu:alternativeLabel) svakog UIElement individual-a, po normalizovanom nazivu"""
+        query = """
+        PREFIX cu: <http://example.org/computer-use#>
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+        
+        SELECT ?element ?label WHERE {
+            ?element rdf:type ?cls .
+            ?cls rdfs:subClassOf* cu:UIElement .
+            { ?element rdfs:label ?label } UNION { ?element cu:alternativeLabel ?label }
+        }
+        """
+        
+        labels_by_element: Dict[str, List[str]] = {}
+        try:
+            for row in graph.query(query):
+                labels = labels_by_element.setdefault(str(row.element), [])
+                if str(row.label) not in labels:
+                    labels.append(str(row.label))
+        except Exception as e:
+            print(f"[OntologyManager] SPARQL error: {e}")
+        
+        index: Dict[str, List[List[str]]] = {}
+        for labels in labels_by_element.values():
+            for label in labels:
+                index.setdefault(cls._label_key(label), []).append(labels)
+        return index
+    
+    @classmethod
+    def get_target_synonyms(cls, target: str) -> List[str]:
+        """
+        Drugi nazivi istog UI elementa iz ontologije (npr. "Console App" -> "Console Application").
+        Koristi ih RetryEngine kada element nije pronadjen pod nazivom iz plana.
+        """
+        if cls._label_index is None:
+            cls._label_index = cls._build_label_index(cls.vocabulary())
+        
+        keys = cls._target_keys(target)
+        synonyms = []
+        for labels in next((cls._label_index[key] for key in keys if key in cls._label_index), []):
+            for label in labels:
+                if cls._label_key(label) not in keys and label not in synonyms:
+                    synonyms.append(label)
+        return synonyms
+    
+    @classmethod
+    def _load_ui_classes(cls):
+        """
+        Nazivi podklasa UIElement (rdfs:label klase) i nazivi njihovih individual-a, mala slova.
+        Kategorije odmah ispod UIElement (ClickableElement, InputElement...) se preskacu - ne govore
+        gdje je element na ekranu, a "clickable element" u hint-u bi zasjenio konkretniju klasu.
+        """
+        query = """
+        PREFIX cu: <http://example.org/computer-use#>
+        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+        PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+        
+        SELECT ?cls ?classLabel ?label WHERE {
+            ?cls rdfs:subClassOf/rdfs:subClassOf+ cu:UIElement .
+            { ?cls rdfs:label ?classLabel }
+            UNION
+            {
+                ?element rdf:type ?cls .
+                { ?element rdfs:label ?label } UNION { ?element cu:alternativeLabel ?label }
+            }
+        }
+        """
+        
+        classes: Dict[str, List[str]] = {}
+        elements: Dict[str, str] = {}
+        try:
+            for row in cls.vocabulary().query(query):
+                name = str(row.cls).replace(str(cls.CU), "")
+                labels = classes.setdefault(name, [])
+                if row.classLabel is not None and str(row.classLabel).lower() not in labels:
+                    labels.append(str(row.classLabel).lower())
+                if row.label is not None:
+                    elements.setdefault(str(row.label).lower(), name)
+        except Exception as e:
+            print(f"[OntologyManager] SPARQL error: {e}")
+        
+        cls._ui_classes, cls._ui_elements = classes, elements
+    
+    @classmethod
+    def get_ui_element_classes(cls) -> Dict[str, List[str]]:
+        """
+        Podklase UIElement iz ontologije sa svojim nazivima,
+        npr. {"AddressBar": ["address bar"], "MenuItem": ["menu item"], ...}.
+        """
+        if cls._ui_classes is None:
+            cls._load_ui_classes()
+        return cls._ui_classes
+    
+    @classmethod
+    def get_ui_element_names(cls) -> Dict[str, str]:
+        """
+        Nazivi UI element individual-a (rdfs:label i cu:alternativeLabel) -> njihova klasa,
+        npr. {"url bar": "AddressBar", "back": "Button", ...}.
+        """
+        if cls._ui_elements is None:
+            cls._load_ui_classes()
+        return cls._ui_elements
+    
     def get_action_uri(self, action_name: str) -> URIRef:
         """Dobij URI akcije"""
         return self.CU[action_name]
@@ -144,6 +300,10 @@ class OntologyManager:
             self.graph.add((task_uri, self.CU.successCriteria, 
                            Literal(task_data["success_criteria"])))
         
+        # Podrazumijevani nacin unosa teksta (clipboard, inject, visual, type)
+        if task_data.get("input_mode"):
+            self.graph.add((task_uri, self.CU.inputMode, Literal(task_data["input_mode"])))
+        
         # Dodaj prerequisite-e
         for prereq in task_data.get("prerequisites", []):
             self.graph.add((task_uri, self.CU.hasPrerequisite, Literal(prereq)))
@@ -205,6 +365,10 @@ class OntologyManager:
             else:
                 self.graph.add((step_uri, self.CU.inputValue, Literal(value)))
         
+        # Nacin unosa teksta samo za ovaj korak
+        if step.get("input_mode"):
+            self.graph.add((step_uri, self.CU.inputMode, Literal(step["input_mode"])))
+        
         # Sekvenca koja je veza sa prethodnim korakom
         if previous_step:
             self.graph.add((previous_step, self.CU.nextStep, step_uri))
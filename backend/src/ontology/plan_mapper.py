@@ -61,6 +61,7 @@ class PlanMapper:
             "goal": plan.get("goal", ""),
             "prerequisites": plan.get("prerequisites", []),
             "success_criteria": plan.get("success_criteria", ""),
+            "input_mode": plan.get("input_mode"),
             "steps": []
         }
         
@@ -99,5 +100,6 @@ class PlanMapper:
             "target": step.get("target", ""),
             "value": value,
             "description": step.get("description", ""),
-            "expected_result": step.get("expected_result", "")
+            "expected_result": step.get("expected_result", ""),
+            "input_mode": step.get("input_mode")
         }
\ No newline at end of file
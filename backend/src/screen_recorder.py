@@ -5,7 +5,12 @@ import shutil
 import signal
 from datetime import datetime
 from typing import Optional
-import pyautogui
+
+try:
+    import pyautogui
+except Exception:
+    # Bez ekrana (headless, CI) pyautogui pada vec pri importu (nema DISPLAY)
+    pyautogui = None
 
 
 class ScreenRecorder:  
@@ -271,6 +276,70 @@ class ScreenRecorder:
         print("[ScreenRecorder] Video not created")
         return None
     
+    def append_video(self, base_path: str, part_path: str) -> Optional[str]:
+        """
+        Nadovezi novi snimak na postojeci video bez ponovnog kodiranja (concat demuxer).
+        Oba snimka dolaze iz istog recorder-a, pa imaju isti kodek i rezoluciju.
+        
+        Returns:
+            base_path sa nadovezanim snimkom ili None ako spajanje nije uspjelo
+        """
+        if self.ffmpeg_path is None or not os.path.exists(base_path) or not os.path.exists(part_path):
+            return None
+        
+        root, ext = os.path.splitext(base_path)
+        list_path = f"{root}_concat.txt"
+        merged_path = f"{root}_merged{ext}"
+        
+        print(f"[ScreenRecorder] Appending {os.path.basename(part_path)} to {os.path.basename(base_path)}...")
+        
+        try:
+            with open(list_path, "w", encoding="utf-8") as f:
+                for path in (base_path, part_path):
+                    escaped = os.path.abspath(path).replace("\\", "/").replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+            
+            result = subprocess.run(
+                [
+                    self.ffmpeg_path,
+                    "-y",
+                    "-f", "concat",
+                    "-safe", "0",
+                    "-i", list_path,
+                    "-c", "copy",
+                    "-movflags", "+faststart",
+                    merged_path
+                ],
+                capture_output=True,
+                text=True,
+                startupinfo=startupinfo,
+                timeout=600
+            )
+            
+            if result.returncode != 0 or not os.path.exists(merged_path):
+                print(f"[ScreenRecorder] Append failed:  {result.stderr[: 200]}")
+                return None
+            
+            os.replace(merged_path, base_path)
+            os.remove(part_path)
+            
+            duration = self._get_video_duration(base_path)
+            print(f"[ScreenRecorder] Video appended: {base_path}")
+            if duration:
+                print(f"[ScreenRecorder] Duration: {duration:.1f} seconds")
+            return base_path
+            
+        except Exception as e:
+            print(f"[ScreenRecorder] Append error:  {e}")
+            return None
+        finally:
+            if os.path.exists(list_path):
+                os.remove(list_path)
+    
     def __del__(self):
         if self.is_recording:
             self.stop_recording()
\ No newline at end of file
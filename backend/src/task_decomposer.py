@@ -17,7 +17,8 @@ class TaskDecomposer:
         if not api_key:
             raise ValueError("GROQ_API_KEY nije postavljen!")
         
-        self.client = Groq(api_key=api_key)
+        # GROQ_BASE_URL - npr. lokalni stand-in server za testiranje opterecenja
+        self.client = Groq(api_key=api_key, base_url=os.getenv("GROQ_BASE_URL") or None)
         self.model = "llama-3.3-70b-versatile"
         
         # Ontologija za validaciju
@@ -251,7 +252,8 @@ class TaskDecomposer:
                 target=step_data.get("target", "screen"),
                 value=value,
                 description=step_data.get("description", ""),
-                expected_result=step_data.get("expected_result", "")
+                expected_result=step_data.get("expected_result", ""),
+                input_mode=step_data.get("input_mode")
             ))
         
         return TaskPlan(
@@ -259,7 +261,8 @@ class TaskDecomposer:
             goal=plan_data.get("goal", ""),
             prerequisites=plan_data.get("prerequisites", []),
             steps=steps,
-            success_criteria=plan_data.get("success_criteria", "")
+            success_criteria=plan_data.get("success_criteria", ""),
+            input_mode=plan_data.get("input_mode")
         )
 
     def print_plan(self, plan:  TaskPlan) -> None:
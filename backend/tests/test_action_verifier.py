@@ -0,0 +1,95 @@
+import numpy as np
+
+from src.execution.action_verifier import ActionVerifier, CHANGED, UNCHANGED, AMBIGUOUS
+from src.execution.screen_capture import Frame
+
+
+class FakeAnalyzer:
+    def __init__(self, satisfied):
+        self.satisfied = satisfied
+        self.checked = []
+        self.fused = []
+
+    def verify_action_result(self, expected_result, screenshot):
+        self.checked.append(expected_result)
+        return {"satisfied": self.satisfied, "confidence": 0.9, "description": "vision"}
+
+    def verify_and_locate(self, expected_result, target, context, screenshot):
+        self.fused.append((expected_result, target))
+        return {"satisfied": self.satisfied, "confidence": 0.9, "description": "vision"}
+
+
+def _frame(level=40, box=None, box_level=220):
+    pixels = np.full((200, 300, 3), level, dtype=np.uint8)
+    if box:
+        left, top, right, bottom = box
+        pixels[top:bottom, left:right] = box_level
+    return Frame(pixels)
+
+
+def test_classify_verdicts():
+    verifier = ActionVerifier(FakeAnalyzer(True))
+
+    assert verifier.classify(_frame(), _frame(box=(0, 0, 150, 100)))["verdict"] == CHANGED
+    assert verifier.classify(_frame(), _frame(), (50, 50), "click")["verdict"] == UNCHANGED
+    assert verifier.classify(_frame(), _frame(), (50, 50), "wait")["verdict"] == AMBIGUOUS
+
+
+def test_unchanged_screen_fails_without_vision():
+    analyzer = FakeAnalyzer(True)
+    result = ActionVerifier(analyzer).verify("Dialog opens", _frame(), _frame(), (50, 50), "click")
+
+    assert not result["satisfied"]
+    assert result["source"] == "pixel_diff"
+    assert not result["effect"]
+    assert analyzer.checked == []
+
+
+def test_strong_change_at_the_point_passes_locally():
+    analyzer = FakeAnalyzer(False)
+    result = ActionVerifier(analyzer).verify("Menu opens", _frame(), _frame(box=(0, 0, 150, 100)),
+                                             (50, 50), "click")
+
+    assert result["effect"] and result["satisfied"]
+    assert result["source"] == "pixel_diff"
+    assert analyzer.checked == []
+
+
+def test_expected_new_element_is_checked_by_vision():
+    # Promjena ekrana moze biti i dijalog sa greskom
+    analyzer = FakeAnalyzer(False)
+    verifier = ActionVerifier(analyzer)
+    after = _frame(box=(0, 0, 150, 100))
+
+    assert not verifier.verify("Create new project dialog appears", _frame(), after, (50, 50), "click")["satisfied"]
+    assert not verifier.verify("'Program.cs' is shown", _frame(), after, (50, 50), "click")["satisfied"]
+    assert analyzer.checked == ["Create new project dialog appears", "'Program.cs' is shown"]
+
+
+def test_change_away_from_the_point_is_checked_by_vision():
+    # Promjena samo daleko od tacke klika - granicni slucaj
+    analyzer = FakeAnalyzer(True)
+    result = ActionVerifier(analyzer).verify("Menu opens", _frame(), _frame(box=(150, 100, 300, 200)),
+                                             (50, 50), "click", next_target=("New", "menu"))
+
+    assert result["effect"] and result["satisfied"]
+    assert result["source"] == "vision"
+    assert analyzer.fused == [("Menu opens", "New")]
+
+
+def test_unchanged_without_a_point_is_checked_by_vision():
+    analyzer = FakeAnalyzer(True)
+    result = ActionVerifier(analyzer).verify("Text is saved", _frame(), _frame(), None, "key_combination")
+
+    assert result["verdict"] == UNCHANGED
+    assert result["satisfied"]
+    assert analyzer.checked == ["Text is saved"]
+
+
+def test_change_without_expected_result_passes_locally():
+    analyzer = FakeAnalyzer(False)
+    result = ActionVerifier(analyzer).verify("", _frame(), _frame(box=(0, 0, 150, 100)), (50, 50), "click")
+
+    assert result["satisfied"]
+    assert result["source"] == "pixel_diff"
+    assert analyzer.checked == []
@@ -0,0 +1,53 @@
+from PIL import Image, ImageDraw
+
+from src.execution.element_boxes import refine_point, nearest_box
+
+
+def _screen(box):
+    image = Image.new("RGB", (800, 600), (245, 245, 245))
+    ImageDraw.Draw(image).rectangle(box, fill=(30, 90, 200))
+    return image
+
+
+def test_refine_snaps_to_a_nearby_button():
+    screen = _screen((380, 290, 440, 310))
+
+    refined = refine_point(screen, 372, 296)
+
+    assert refined is not None
+    assert abs(refined["x"] - 410) <= 2 and abs(refined["y"] - 300) <= 2
+
+
+def test_refine_rejects_an_element_crossing_the_bottom_edge():
+    # Element se nastavlja ispod prozora (100 px visine) - centar isjecka nije centar elementa
+    screen = _screen((380, 270, 440, 450))
+
+    assert refine_point(screen, 410, 300) is None
+
+
+def test_refine_rejects_an_element_crossing_the_top_edge():
+    screen = _screen((380, 100, 440, 296))
+
+    assert refine_point(screen, 410, 300) is None
+
+
+def test_refine_rejects_an_element_crossing_the_right_edge():
+    screen = _screen((380, 290, 700, 310))
+
+    assert refine_point(screen, 410, 300) is None
+
+
+def test_refine_keeps_an_element_at_the_screen_edge():
+    screen = _screen((380, 0, 440, 20))
+
+    refined = refine_point(screen, 412, 14)
+
+    assert refined is not None
+    assert abs(refined["y"] - 10) <= 2
+
+
+def test_nearest_box_respects_max_distance():
+    boxes = [(0, 0, 10, 10), (100, 100, 120, 120)]
+
+    assert nearest_box(boxes, 12, 12, max_distance=5) == (0, 0, 10, 10)
+    assert nearest_box(boxes, 60, 60, max_distance=5) is None
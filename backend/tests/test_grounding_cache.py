@@ -0,0 +1,137 @@
+from PIL import Image, ImageDraw
+
+from src.execution.grounding_cache import GroundingCache, fingerprint_distance, screen_fingerprint
+
+
+RESULT = {"found": True, "x": 120, "y": 48, "confidence": 0.9}
+
+
+def _screen(dialog=False, cursor=False):
+    image = Image.new("RGB", (640, 400), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((0, 0, 640, 30), fill=(40, 40, 60))
+    draw.rectangle((20, 60, 300, 380), fill=(255, 255, 255))
+    if dialog:
+        draw.rectangle((200, 120, 520, 300), fill=(60, 120, 200))
+    if cursor:
+        draw.rectangle((400, 350, 401, 352), fill=(0, 0, 0))
+    return image
+
+
+def test_fingerprint_is_stable_and_sensitive():
+    base = screen_fingerprint(_screen())
+
+    assert screen_fingerprint(_screen()) == base
+    assert len(base) == 64
+    assert fingerprint_distance(base, screen_fingerprint(_screen(cursor=True))) <= 3
+    assert fingerprint_distance(base, screen_fingerprint(_screen(dialog=True))) > 3
+
+
+def test_region_fingerprint_ignores_changes_outside_the_region():
+    region = (0, 0, 640, 40)
+
+    assert screen_fingerprint(_screen(), region) == screen_fingerprint(_screen(dialog=True), region)
+
+
+def test_distance_of_mismatched_lengths_is_maximal():
+    assert fingerprint_distance("ab", "abcd") == 8
+
+
+def test_hit_on_the_same_and_a_nearly_identical_screen():
+    cache = GroundingCache(max_distance=3)
+    cache.put("File", "Look in the menu bar", screen_fingerprint(_screen()), RESULT)
+
+    assert cache.get("file ", "Look in the menu bar", screen_fingerprint(_screen())) == RESULT
+    assert cache.get("File", "Look in the menu bar", screen_fingerprint(_screen(cursor=True))) == RESULT
+    assert cache.stats()["hits"] == 2
+
+
+def test_miss_on_a_different_screen_target_or_context():
+    cache = GroundingCache(max_distance=3)
+    fingerprint = screen_fingerprint(_screen())
+    cache.put("File", "menu bar", fingerprint, RESULT)
+
+    assert cache.get("File", "menu bar", screen_fingerprint(_screen(dialog=True))) is None
+    assert cache.get("Edit", "menu bar", fingerprint) is None
+    assert cache.get("File", "toolbar", fingerprint) is None
+    assert cache.stats() == {"entries": 1, "hits": 0, "misses": 3, "invalidations": 0, "stale_patches": 0,
+                             "hit_rate": 0.0}
+
+
+def test_returned_result_is_a_copy():
+    cache = GroundingCache()
+    cache.put("File", "", "00" * 32, RESULT)
+
+    cache.get("File", "", "00" * 32)["x"] = 0
+
+    assert cache.get("File", "", "00" * 32)["x"] == 120
+
+
+def test_lru_eviction_keeps_recently_used_entries():
+    cache = GroundingCache(max_entries=2, max_distance=0)
+    cache.put("a", "", "00", RESULT)
+    cache.put("b", "", "00", RESULT)
+    cache.get("a", "", "00")
+    cache.put("c", "", "00", RESULT)
+
+    assert cache.contains("a", "", "00")
+    assert not cache.contains("b", "", "00")
+
+
+def test_invalidate_by_target_and_fingerprint():
+    cache = GroundingCache(max_distance=0)
+    cache.put("File", "", "00", RESULT)
+    cache.put("File", "", "ff", RESULT)
+    cache.put("Edit", "", "00", RESULT)
+
+    assert cache.invalidate(target="file", fingerprint="00") == 1
+    assert cache.contains("File", "", "ff") and cache.contains("Edit", "", "00")
+    assert cache.invalidate() == 2
+
+
+def test_hit_is_rejected_when_the_area_around_the_point_changed():
+    # Otisak cijelog ekrana je isti (isti kljuc), ali preko tacke je otvoren dropdown
+    before = _screen()
+    after = _screen()
+    ImageDraw.Draw(after).rectangle((105, 62, 135, 78), fill=(60, 120, 200))
+    fingerprint = screen_fingerprint(before)
+
+    cache = GroundingCache(max_distance=3)
+    cache.put("Save", "menu", fingerprint, {"found": True, "x": 120, "y": 70}, before)
+
+    assert cache.get("Save", "menu", fingerprint, after) is None
+    assert not cache.contains("Save", "menu", fingerprint, after)
+    assert cache.stats()["stale_patches"] == 1
+
+    assert cache.get("Save", "menu", fingerprint, _screen(cursor=True)) == {"found": True, "x": 120, "y": 70}
+
+
+def test_disk_tier_is_written_in_batches(tmp_path):
+    path = tmp_path / "cache" / "grounding.json"
+    cache = GroundingCache(cache_path=str(path), save_every=3)
+    cache.put("a", "", "00", RESULT)
+    cache.put("b", "", "00", RESULT)
+    assert not path.exists()
+
+    cache.put("c", "", "00", RESULT)
+    assert path.exists()
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    path = str(tmp_path / "cache" / "grounding.json")
+    cache = GroundingCache(cache_path=path)
+    cache.put("File", "menu bar", "ab" * 32, RESULT, _screen())
+    cache.flush()
+
+    assert GroundingCache(cache_path=path).get("File", "menu bar", "ab" * 32, _screen()) == RESULT
+
+
+def test_invalidation_is_written_at_once(tmp_path):
+    path = str(tmp_path / "grounding.json")
+    cache = GroundingCache(cache_path=path)
+    cache.put("File", "", "00", RESULT)
+    cache.flush()
+
+    cache.invalidate("File")
+
+    assert GroundingCache(cache_path=path).get("File", "", "00") is None
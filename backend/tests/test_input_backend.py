@@ -0,0 +1,50 @@
+import pytest
+
+from src.execution.input_backend import FailSafeException, InputBackend, PyAutoGUIInput, XTestInput
+
+
+class FakePointer:
+    def __init__(self, x, y):
+        self.root_x, self.root_y = x, y
+
+
+class FakeRoot:
+    def __init__(self, position):
+        self.position = position
+
+    def query_pointer(self):
+        return FakePointer(*self.position)
+
+
+def make_xtest(position):
+    backend = XTestInput.__new__(XTestInput)
+    backend.root = FakeRoot(position)
+    backend.move_rate = 120.0
+    backend.moves = []
+    backend._motion = lambda x, y: backend.moves.append((x, y))
+    return backend
+
+
+def test_xtest_move_and_click_stop_in_top_left_corner():
+    backend = make_xtest((0, 0))
+
+    with pytest.raises(FailSafeException):
+        backend.move(100, 100)
+    with pytest.raises(FailSafeException):
+        backend.click(100, 100)
+    assert backend.moves == []
+
+
+def test_xtest_move_outside_corner_is_not_stopped():
+    backend = make_xtest((400, 300))
+
+    backend.move(100, 100)
+
+    assert backend.moves == [(100, 100)]
+
+
+def test_failsafe_flag_per_backend():
+    # Poruka o gornjem levom uglu se stampa samo za backend koji je podrzava
+    assert InputBackend.failsafe is False
+    assert PyAutoGUIInput.failsafe is True
+    assert XTestInput.failsafe is True
@@ -0,0 +1,75 @@
+import json
+
+from src.execution.json_stream import JsonStreamScanner
+
+
+ANSWER = '{"found": true, "candidates": [{"x": 120, "y": 48, "label": "File {menu}"}], "reasoning": "top bar"}'
+
+
+def _feed(scanner, text, size):
+    for i in range(0, len(text), size):
+        if scanner.feed(text[i:i + size]):
+            return i + size
+    return None
+
+
+def test_whole_value_in_one_chunk():
+    scanner = JsonStreamScanner()
+
+    assert scanner.feed("Here you go:\n```json\n" + ANSWER + "\n```")
+    assert json.loads(scanner.snapshot()) == json.loads(ANSWER)
+
+
+def test_completes_at_the_closing_brace_for_any_chunk_size():
+    for size in (1, 3, 7, 64):
+        scanner = JsonStreamScanner()
+        consumed = _feed(scanner, ANSWER + " trailing text", size)
+
+        assert consumed is not None and consumed >= len(ANSWER)
+        assert consumed - size < len(ANSWER)
+        assert scanner.snapshot() == ANSWER
+
+
+def test_members_are_available_before_the_value_closes():
+    scanner = JsonStreamScanner()
+    scanner.feed('{"found": true, "candidates": [{"x": 120, "y": 48}]')
+
+    assert not scanner.complete
+    assert scanner.fields == {"found": True, "candidates": [{"x": 120, "y": 48}]}
+
+    scanner.feed(', "reasoning": "still wri')
+
+    assert scanner.fields["candidates"] == [{"x": 120, "y": 48}]
+    assert json.loads(scanner.snapshot()) == scanner.fields
+
+
+def test_incomplete_nested_member_is_not_reported():
+    scanner = JsonStreamScanner()
+    scanner.feed('{"found": true, "candidates": [{"x": 120, "y"')
+
+    assert scanner.fields == {"found": True}
+
+
+def test_brackets_and_escapes_inside_strings():
+    scanner = JsonStreamScanner()
+    text = '{"label": "Save \\"as\\" {copy} ]", "x": 5}'
+
+    assert scanner.feed(text)
+    assert json.loads(scanner.snapshot()) == {"label": 'Save "as" {copy} ]', "x": 5}
+
+
+def test_nothing_usable_yet():
+    scanner = JsonStreamScanner()
+    scanner.feed("Let me look at the screen")
+
+    assert scanner.snapshot() is None
+    assert not scanner.complete
+
+
+def test_top_level_array():
+    scanner = JsonStreamScanner()
+
+    assert not scanner.feed("[1, [2, 3]")
+    assert scanner.fields == {}
+    assert scanner.feed(", 4]")
+    assert json.loads(scanner.snapshot()) == [1, [2, 3], 4]
@@ -0,0 +1,83 @@
+import os
+
+from rdflib import Graph, RDF
+
+from src.ontology import OntologyManager, PlanMapper, OntologyExecutor
+
+
+PLAN = {
+    "goal": "Open the File menu",
+    "steps": [{"id": 1, "action": "click", "target": "File", "description": "Click File"}]
+}
+
+
+def _saved_task_graph(tmp_path) -> Graph:
+    manager = OntologyManager()
+    PlanMapper(manager).map_plan_to_ontology(PLAN, task_id="job1")
+
+    path = os.path.join(str(tmp_path), "task_ontology_job1.owl")
+    manager.save_ontology(path)
+
+    graph = Graph()
+    graph.parse(path, format="xml")
+    return graph
+
+
+def _find_task(graph: Graph):
+    # _find_task ne koristi analyzer ni ekran - executor bez __init__ je dovoljan
+    return OntologyExecutor._find_task(OntologyExecutor.__new__(OntologyExecutor), graph)
+
+
+def test_saved_task_ontology_has_only_the_job_task(tmp_path):
+    graph = _saved_task_graph(tmp_path)
+
+    tasks = set(graph.subjects(RDF.type, OntologyManager.CU.Task))
+    assert tasks == {OntologyManager.CU.Task_job1}
+
+
+def test_find_task_returns_the_job_task(tmp_path):
+    graph = _saved_task_graph(tmp_path)
+
+    assert _find_task(graph) == OntologyManager.CU.Task_job1
+
+
+def test_find_task_skips_example_tasks_of_the_schema(tmp_path):
+    # Ontologije sacuvane dok je schema ulazila u graf imaju i primjere Task-ova (bez koraka)
+    graph = _saved_task_graph(tmp_path)
+    graph += OntologyManager.vocabulary()
+
+    assert OntologyManager.CU.YouTubeSearchWorkflow in set(graph.subjects(RDF.type, OntologyManager.CU.Task))
+    assert _find_task(graph) == OntologyManager.CU.Task_job1
+
+
+def test_find_task_empty_graph():
+    assert _find_task(Graph()) is None
+
+
+def test_target_synonyms_from_alternative_labels():
+    synonyms = OntologyManager.get_target_synonyms("Create a new project")
+
+    assert "Create new project" in synonyms
+    assert "New Project" in synonyms
+    assert "Create a new project" not in synonyms
+
+
+def test_target_synonyms_ignore_class_words_and_case():
+    assert OntologyManager.get_target_synonyms("create a new project button") == \
+        OntologyManager.get_target_synonyms("Create a new project")
+
+
+def test_target_synonyms_match_whole_labels():
+    # "New" (File -> New u Visual Studio) nije "New tab" / "Open a new tab" iz browsera
+    assert OntologyManager.get_target_synonyms("New") == []
+    assert "Open a new tab" in OntologyManager.get_target_synonyms("New tab")
+
+
+def test_target_synonyms_do_not_name_another_action():
+    assert OntologyManager.get_target_synonyms("Start") == ["Run"]
+    assert "Finish" not in OntologyManager.get_target_synonyms("Create")
+    assert OntologyManager.get_target_synonyms("Name") == []
+
+
+def test_target_synonyms_unknown_target():
+    assert OntologyManager.get_target_synonyms("No such element anywhere") == []
@@ -0,0 +1,186 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.execution import rate_limiter
+from src.execution.rate_limiter import (
+    CircuitBreaker, RateLimiter, TokenBucket, _parse_model_limits, _parse_seconds
+)
+
+
+class FakeClock:
+    """Zamjena za time modul u rate_limiter-u: vrijeme ide samo kad ga test pomjeri"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", clock)
+    return clock
+
+
+def test_bucket_burst_then_rate(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    # Rezervisani token se ne dijeli - sljedeci ceka iza njega
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.advance(1.0)
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_bucket_refills_up_to_burst(clock):
+    bucket = TokenBucket(rate=1.0, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.advance(10.0)
+
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_bucket_refund_and_pause(clock):
+    bucket = TokenBucket(rate=1.0, burst=1)
+    bucket.reserve()
+    bucket.refund()
+    assert bucket.reserve() == 0.0
+
+    bucket.refund()
+    bucket.pause(5.0)
+    assert bucket.reserve() == pytest.approx(5.0)
+
+
+def test_breaker_opens_after_threshold_and_half_opens(clock):
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=30.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.advance(30.0)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.trips == 1
+
+
+def test_breaker_success_resets_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_trip_uses_retry_after(clock):
+    breaker = CircuitBreaker(cooldown=30.0)
+    breaker.trip(4.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.advance(4.0)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_limiter_429_opens_breaker_and_pauses_bucket(clock):
+    limiter = RateLimiter(default_rate=10.0, default_burst=5)
+
+    limiter.update_from_response("m", 429, {"retry-after": "7"})
+
+    assert not limiter.available("m")
+    assert limiter.available("other")
+    assert limiter._bucket("m").reserve() == pytest.approx(7.0)
+
+    metrics = limiter.metrics()["models"]["m"]
+    assert metrics["throttled"] == 1 and metrics["skipped"] == 1
+    assert metrics["breaker"] == CircuitBreaker.OPEN
+
+
+def test_limiter_remaining_zero_waits_for_reset(clock):
+    limiter = RateLimiter(default_rate=10.0, default_burst=5)
+
+    limiter.update_from_response("m", 200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": "3"})
+
+    assert limiter.available("m")
+    assert limiter._bucket("m").reserve() == pytest.approx(3.0)
+
+
+def test_limiter_server_errors_open_breaker(clock):
+    limiter = RateLimiter(failure_threshold=2)
+    limiter.update_from_response("m", 503, {})
+    limiter.record_failure("m")
+
+    assert not limiter.available("m")
+
+
+def test_acquire_refunds_when_deadline_would_pass(clock):
+    limiter = RateLimiter(default_rate=1.0, default_burst=1)
+    assert asyncio.run(limiter.acquire("m"))
+
+    assert not asyncio.run(limiter.acquire("m", deadline=clock.now + 0.5))
+    # Token je vracen, pa sljedeci poziv ceka samo jednu periodu
+    assert limiter._bucket("m").reserve() == pytest.approx(1.0)
+
+
+def test_metrics_while_other_threads_count():
+    # metrics() se cita iz drugog thread-a dok se dodaju novi modeli i broje zahtjevi
+    limiter = RateLimiter()
+
+    def worker(index):
+        for i in range(200):
+            limiter._count(f"m{index}-{i % 20}", wait=0.01)
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        limiter.metrics()
+    for thread in threads:
+        thread.join()
+
+    metrics = limiter.metrics()
+    assert len(metrics["models"]) == 80
+    assert sum(m["requests"] for m in metrics["models"].values()) == 800
+    assert metrics["wait_total_s"] == pytest.approx(8.0)
+
+
+def test_parse_seconds_formats():
+    now = 1_700_000_000.0
+
+    assert _parse_seconds("12", now) == 12.0
+    assert _parse_seconds(str(now + 5), now) == pytest.approx(5.0)
+    assert _parse_seconds(str((now + 2) * 1000), now) == pytest.approx(2.0)
+    assert _parse_seconds("1m30s", now) == 90.0
+    assert _parse_seconds("250ms", now) == pytest.approx(0.25)
+    assert _parse_seconds("Tue, 14 Nov 2023 22:13:30 GMT", now) == pytest.approx(10.0)
+    assert _parse_seconds("soon", now) is None
+    assert _parse_seconds(None, now) is None
+
+
+def test_parse_model_limits():
+    limits = _parse_model_limits("a/model=2:4, b=0.5,broken=x")
+
+    assert limits == {"a/model": (2.0, 4), "b": (0.5, 1)}
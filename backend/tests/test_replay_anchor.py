@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+from PIL import Image, ImageDraw
+from rdflib import Graph, URIRef
+
+from src.execution.replay_anchor import capture_anchor, match_anchor
+from src.execution.screen_capture import Frame
+from src.ontology import OntologyManager, PlanMapper, OntologyExecutor
+
+
+def _screen(button=(300, 200), size=(800, 600)):
+    image = Image.new("RGB", size, (245, 245, 245))
+    draw = ImageDraw.Draw(image)
+    x, y = button
+    draw.rectangle((x - 40, y - 12, x + 40, y + 12), fill=(30, 90, 200))
+    draw.rectangle((x - 20, y - 4, x + 20, y + 4), fill=(255, 255, 255))
+    return image
+
+
+def test_anchor_matches_the_same_screen():
+    anchor = capture_anchor(_screen(), 300, 200)
+
+    element = match_anchor(anchor, _screen())
+
+    assert element["found"] and element["source"] == "replay"
+    assert (element["x"], element["y"]) == (300, 200)
+    assert element["screen_distance"] == 0
+
+
+def test_anchor_follows_a_small_move():
+    anchor = capture_anchor(_screen(), 300, 200)
+
+    element = match_anchor(anchor, _screen(button=(315, 190)))
+
+    assert (element["x"], element["y"]) == (315, 190)
+
+
+def test_anchor_rejects_a_moved_or_missing_element():
+    anchor = capture_anchor(_screen(), 300, 200)
+
+    assert match_anchor(anchor, _screen(button=(600, 450))) is None
+    assert match_anchor(anchor, Image.new("RGB", (800, 600), (245, 245, 245))) is None
+
+
+def test_anchor_rejects_a_different_screen_size():
+    anchor = capture_anchor(_screen(), 300, 200)
+
+    assert match_anchor(anchor, _screen(size=(1024, 768))) is None
+
+
+def test_uniform_neighbourhood_uses_the_larger_crop_or_nothing():
+    # Mali isjecak (120x40) oko tacke je jednolican, veci (240x80) zahvata dugme
+    anchor = capture_anchor(_screen(), 300, 240)
+    assert anchor is not None
+    assert anchor["box"] == (180, 200, 420, 280)
+
+    assert capture_anchor(Image.new("RGB", (800, 600), (245, 245, 245)), 300, 200) is None
+
+
+def test_anchor_near_the_screen_edge_stays_inside():
+    anchor = capture_anchor(_screen(button=(30, 10)), 30, 10)
+
+    assert anchor["box"] == (0, 0, 120, 40)
+    element = match_anchor(anchor, _screen(button=(30, 10)))
+    assert (element["x"], element["y"]) == (30, 10)
+
+
+def test_anchor_survives_the_saved_ontology(tmp_path):
+    manager = OntologyManager()
+    task_uri = PlanMapper(manager).map_plan_to_ontology(
+        {"goal": "Open File", "steps": [{"id": 1, "action": "click", "target": "File"}]}, task_id="job1"
+    )
+    executor = OntologyExecutor.__new__(OntologyExecutor)
+    step_uri = executor._get_steps_from_graph(manager.graph, task_uri)[0]["uri"]
+
+    anchor = capture_anchor(_screen(), 300, 200)
+    executor._store_anchor(manager.graph, URIRef(step_uri), anchor)
+    path = os.path.join(str(tmp_path), "task_ontology_job1.owl")
+    manager.save_ontology(path)
+
+    graph = Graph()
+    graph.parse(path, format="xml")
+    stored = executor._get_steps_from_graph(graph, task_uri)[0]["anchor"]
+
+    assert stored == {**anchor, "box": tuple(anchor["box"])}
+    assert match_anchor(stored, _screen())["x"] == 300
+
+
+class FakeAnalyzer:
+    def __init__(self, frames):
+        self.frames = list(frames)
+
+    def capture_frame(self):
+        image = self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+        return Frame(np.asarray(image))
+
+
+def _replay_executor(frames, timeout=1.0):
+    executor = OntologyExecutor.__new__(OntologyExecutor)
+    executor.analyzer = FakeAnalyzer(frames)
+    executor.replay_threshold = 0.9
+    executor.replay_timeout = timeout
+    executor.replay_hits = executor.replay_misses = 0
+    return executor
+
+
+def test_replay_waits_for_the_element_to_appear():
+    anchor = capture_anchor(_screen(), 300, 200)
+    blank = Image.new("RGB", (800, 600), (245, 245, 245))
+    executor = _replay_executor([blank, blank, _screen()])
+
+    element = executor._replay_locate("OK", anchor)
+
+    assert (element["x"], element["y"]) == (300, 200)
+    assert (executor.replay_hits, executor.replay_misses) == (1, 0)
+
+
+def test_replay_miss_falls_back_after_the_timeout():
+    anchor = capture_anchor(_screen(), 300, 200)
+    executor = _replay_executor([_screen(button=(600, 450))], timeout=0.0)
+
+    assert executor._replay_locate("OK", anchor) is None
+    assert (executor.replay_hits, executor.replay_misses) == (0, 1)
+
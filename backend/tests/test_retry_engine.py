@@ -0,0 +1,190 @@
+from src.execution.retry_engine import (
+    RetryEngine, INITIAL, NEXT_CANDIDATE, REGROUND, SYNONYM, FULL_SCREEN, MARKS, DIRECT
+)
+
+
+class FakeAnalyzer:
+    """Grounding double: answers from a queue and records how it was asked."""
+
+    def __init__(self, answers=None, candidates=None, grounding_mode="coordinates"):
+        self.answers = list(answers or [])
+        self.candidates = list(candidates or [])
+        self.grounding_mode = grounding_mode
+        self.encoded_images = 0
+        self.payload_bytes = 0
+        self.calls = []
+        self.rejected = []
+
+    def find_element_coordinates(self, target, context, use_cache=True, full_screen=False, grounding_mode=None):
+        self.calls.append({"target": target, "use_cache": use_cache, "full_screen": full_screen,
+                           "grounding_mode": grounding_mode})
+        self.encoded_images += 1
+        self.payload_bytes += 100
+        return self.answers.pop(0) if self.answers else {"found": False}
+
+    def thread_usage(self):
+        return self.encoded_images, self.payload_bytes
+
+    def next_candidate(self, target, element):
+        return self.candidates.pop(0) if self.candidates else None
+
+    def reject_element(self, target, element):
+        self.rejected.append((target, element["x"], element["y"]))
+
+
+class FakeSettle:
+    def __init__(self):
+        self.waits = []
+
+    def wait(self, max_seconds, min_seconds=0.0, require_change=False):
+        self.waits.append(max_seconds)
+
+
+def _element(x, y):
+    return {"found": True, "x": x, "y": y}
+
+
+def _engine(analyzer, synonyms=None, max_attempts=None):
+    return RetryEngine(analyzer, FakeSettle(), synonyms=synonyms, max_attempts=max_attempts,
+                       direct_attempts=3, max_candidates=2, base_delay=0.5, max_delay=4.0)
+
+
+def test_first_attempt_success():
+    analyzer = FakeAnalyzer([_element(10, 20)])
+    engine = _engine(analyzer)
+    result = {}
+
+    assert engine.run("OK", "dialog", lambda element: True, result=result)
+    assert result["retries"] == 0
+    assert [a["strategy"] for a in result["attempts"]] == [INITIAL]
+    assert result["attempts"][0]["vision_images"] == 1
+    assert engine.settle.waits == []
+
+
+def test_escalation_order():
+    analyzer = FakeAnalyzer()
+    engine = _engine(analyzer, synonyms=lambda target: ["Next", "Continue", "Proceed"])
+    result = {}
+
+    assert not engine.run("Next button", "wizard", lambda element: True, result=result)
+
+    strategies = [(a["strategy"], a["label"]) for a in result["attempts"]]
+    assert strategies == [
+        (INITIAL, "Next button"),
+        (REGROUND, "Next button"),
+        (SYNONYM, "Next"),
+        (SYNONYM, "Continue"),
+        (FULL_SCREEN, "Next button"),
+        (MARKS, "Next button"),
+    ]
+    assert analyzer.calls[1]["use_cache"] is False
+    assert analyzer.calls[4]["full_screen"] is True
+    assert analyzer.calls[5]["grounding_mode"] == "marks"
+    assert result["error"] == "Element not found: Next button"
+
+
+def test_candidates_do_not_use_up_the_chain():
+    # Svaki odgovor ima kandidate - lanac ipak stigne do MARKS
+    analyzer = FakeAnalyzer([_element(i, i) for i in range(1, 10)],
+                            candidates=[_element(100 + i, 100 + i) for i in range(10)])
+    engine = _engine(analyzer, synonyms=lambda target: ["Continue"])
+    result = {}
+
+    assert not engine.run("Next", "wizard", lambda element: False, result=result)
+
+    strategies = [a["strategy"] for a in result["attempts"]]
+    assert strategies.count(NEXT_CANDIDATE) == 2
+    assert [s for s in strategies if s != NEXT_CANDIDATE] == [INITIAL, REGROUND, SYNONYM, FULL_SCREEN, MARKS]
+
+
+def test_marks_skipped_when_already_in_marks_mode():
+    engine = _engine(FakeAnalyzer(grounding_mode="marks"))
+    result = {}
+
+    engine.run("Save", "", lambda element: True, result=result)
+
+    assert MARKS not in [a["strategy"] for a in result["attempts"]]
+
+
+def test_next_candidate_before_new_request_and_without_backoff():
+    analyzer = FakeAnalyzer([_element(10, 10)], candidates=[_element(50, 50)])
+    engine = _engine(analyzer)
+    clicked = []
+
+    def perform(element):
+        clicked.append((element["x"], element["y"]))
+        return element["x"] == 50
+
+    result = {}
+    assert engine.run("Run", "toolbar", perform, result=result)
+
+    assert [a["strategy"] for a in result["attempts"]] == [INITIAL, NEXT_CANDIDATE]
+    assert clicked == [(10, 10), (50, 50)]
+    assert analyzer.rejected == [("Run", 10, 10)]
+    assert len(analyzer.calls) == 1
+    assert engine.settle.waits == []
+    assert engine.stats()["recovered_steps"] == 1
+
+
+def test_backoff_doubles_and_is_capped():
+    engine = _engine(FakeAnalyzer(), synonyms=lambda target: ["a", "b"])
+
+    engine.run("x", "", lambda element: True, result={})
+
+    assert engine.settle.waits == [0.5, 1.0, 2.0, 4.0, 4.0]
+
+
+def test_max_attempts_limits_the_escalation():
+    engine = _engine(FakeAnalyzer())
+    result = {}
+
+    engine.run("x", "", lambda element: True, result=result, max_attempts=2)
+
+    assert len(result["attempts"]) == 2
+
+
+def test_step_without_context_is_retried():
+    engine = _engine(FakeAnalyzer())
+    calls = []
+    result = {}
+
+    assert not engine.run("enter", None, lambda element: calls.append(element) or False, result=result)
+
+    assert calls == [None, None, None]
+    assert [a["strategy"] for a in result["attempts"]] == [DIRECT] * 3
+    assert result["retries"] == 2
+    assert engine.settle.waits == [0.5, 1.0]
+
+
+def test_step_without_context_stops_on_success():
+    engine = _engine(FakeAnalyzer())
+    outcomes = [False, True]
+    result = {}
+
+    assert engine.run("enter", None, lambda element: outcomes.pop(0), result=result)
+    assert result["retries"] == 1
+    assert engine.stats()["recovered_steps"] == 1
+
+
+def test_optional_target_runs_the_action_without_the_element():
+    engine = _engine(FakeAnalyzer(), max_attempts=2)
+    performed = []
+    result = {}
+
+    assert engine.run("Editor", "", lambda element: performed.append(element) or True,
+                      result=result, optional_target=True)
+
+    assert performed == [None]
+    assert result["attempts"][-1]["strategy"] == DIRECT
+    assert "error" not in result
+
+
+def test_exception_in_perform_is_recorded():
+    def perform(element):
+        raise RuntimeError("boom")
+
+    engine = _engine(FakeAnalyzer([_element(1, 1)]), max_attempts=1)
+    result = {}
+
+    assert not engine.run("x", "", perform, result=result)
+    assert result["attempts"][0]["error"] == "boom"
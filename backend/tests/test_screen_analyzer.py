@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.execution.screen_capture import CaptureBackend, Frame
+from src.execution import screen_analyzer
+from src.execution.screen_analyzer import ScreenAnalyzer
+
+
+class StaticCapture(CaptureBackend):
+    name = "static"
+
+    def __init__(self, image):
+        self.image = image
+
+    def grab(self) -> Frame:
+        return Frame(np.asarray(self.image), "RGB", image=self.image)
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+    monkeypatch.setenv("VISION_STATS_PATH", "")
+    image = Image.new("RGB", (320, 200), (200, 200, 200))
+    return ScreenAnalyzer(screen_size=image.size, capture=StaticCapture(image))
+
+
+def test_thread_usage_is_per_thread(analyzer):
+    image = analyzer.take_screenshot()
+
+    analyzer._get_screenshot_base64(image)
+    foreground = analyzer.thread_usage()
+
+    worker = threading.Thread(target=lambda: [analyzer._get_screenshot_base64(image) for _ in range(3)])
+    worker.start()
+    worker.join()
+
+    assert analyzer.thread_usage() == foreground
+    assert foreground[0] == 1 and foreground[1] > 0
+    assert analyzer.encoded_images == 4
+    assert analyzer.payload_bytes == 4 * foreground[1]
+
+
+def _stub_grounding(analyzer, batch_answer):
+    calls = []
+
+    def batch(targets, screenshot, fingerprint):
+        calls.append(("batch", [target for target, _ in targets]))
+        return batch_answer
+
+    def single(target, context, screenshot, fingerprint, region=None):
+        calls.append(("single", target))
+        return {"found": True, "x": 10, "y": 20}
+
+    analyzer.find_elements_batch = batch
+    analyzer._locate_with_coordinates = single
+    analyzer.refine = False
+    return calls
+
+
+def test_batch_answer_is_used_for_the_current_target(analyzer):
+    calls = _stub_grounding(analyzer, {"File": {"found": True, "x": 1, "y": 2}})
+
+    element = analyzer.find_element_coordinates("File", "menu", lookahead=[("New", "menu")])
+
+    assert (element["x"], element["y"]) == (1, 2)
+    assert calls == [("batch", ["File", "New"])]
+
+
+def test_target_missing_from_batch_is_located_alone(analyzer):
+    calls = _stub_grounding(analyzer, {"New": {"found": True, "x": 5, "y": 5}})
+
+    element = analyzer.find_element_coordinates("File", "menu", lookahead=[("New", "menu")])
+
+    assert element["found"] and (element["x"], element["y"]) == (10, 20)
+    assert calls == [("batch", ["File", "New"]), ("single", "File")]
+
+
+def _answer(text):
+    return {"choices": [{"message": {"role": "assistant", "content": text}}]}
+
+
+def test_describe_screen_reads_the_whole_free_text_answer(analyzer):
+    calls = []
+
+    def call(image_base64, prompt, **kwargs):
+        calls.append(kwargs)
+        return _answer("Visual Studio is open [Start Window] with {recent projects}.")
+
+    analyzer._call_vision_api = call
+
+    assert analyzer.describe_screen() == "Visual Studio is open [Start Window] with {recent projects}."
+    assert calls[0]["expect_json"] is False
+    assert calls[0]["stop_when"](None) is False
+
+
+def test_answer_check_depends_on_the_request_type():
+    text = _answer("A browser window with YouTube open.")
+
+    assert not ScreenAnalyzer._has_answer(text)
+    assert ScreenAnalyzer._has_answer(text, expect_json=False)
+    assert ScreenAnalyzer._has_answer(_answer('{"found": true}'))
+    assert not ScreenAnalyzer._has_answer(_answer("  "), expect_json=False)
+
+
+def test_free_text_answer_wins_the_hedge(analyzer):
+    async def request(model, messages, max_retries, deadline, max_tokens=300, stop_when=None):
+        return _answer(f"Described by {model}")
+
+    analyzer._request_model = request
+    result = asyncio.run(analyzer._call_hedged([], ["a", "b"], 1, time.time() + 5, expect_json=False))
+
+    assert result["choices"][0]["message"]["content"] == "Described by a"
+
+
+def test_marks_only_number_boxes_inside_the_region(analyzer, monkeypatch):
+    region = (0, 0, 160, 100)
+    monkeypatch.setattr(screen_analyzer, "propose_boxes", lambda screenshot, region=None: [(10, 10, 60, 30)])
+    analyzer.locator.candidate_boxes = lambda target, screenshot: [(200, 150, 260, 180), (140, 40, 200, 60)]
+    analyzer._call_vision_api = lambda *args, **kwargs: _answer('{"marks": [1, 2], "confidence": 0.8}')
+
+    element = analyzer._locate_with_marks("OK", "", analyzer.take_screenshot(), "00", region)
+
+    assert analyzer.last_request_geometry["marks"] == [(140, 40, 160, 60), (10, 10, 60, 30)]
+    assert element["box"] == [140, 40, 160, 60]
+    assert element["confidence"] == 0.8
+    assert "confidence" not in element["candidates"][1]
+
+
+def test_request_geometry_and_last_frame_are_per_thread(analyzer):
+    frame = analyzer.capture_frame()
+    analyzer.last_request_geometry = {"offset": (0, 0), "scale_factor": 1.0}
+
+    def background():
+        analyzer.capture_frame()
+        analyzer.last_request_geometry = {"offset": (100, 50), "scale_factor": 0.5}
+
+    worker = threading.Thread(target=background)
+    worker.start()
+    worker.join()
+
+    assert analyzer.last_frame is frame
+    assert analyzer.last_request_geometry["offset"] == (0, 0)
@@ -0,0 +1,56 @@
+from src.execution.screen_regions import (
+    CHANGE_DRIVEN_CLASSES, UI_ELEMENT_REGIONS, element_class_for, region_for_class
+)
+from src.ontology.ontology_manager import OntologyManager
+
+
+def test_region_classes_exist_in_the_ontology():
+    classes = OntologyManager.get_ui_element_classes()
+
+    assert set(UI_ELEMENT_REGIONS) <= set(classes)
+    assert CHANGE_DRIVEN_CLASSES <= set(classes)
+
+
+def test_categories_are_not_element_classes():
+    classes = OntologyManager.get_ui_element_classes()
+
+    assert "ClickableElement" not in classes
+    assert classes["MenuItem"] == ["menu item"]
+
+
+def test_hint_decides_the_class():
+    assert element_class_for("File", "Look for 'File' in the TOP MENU BAR of the application.") == "Menu"
+    assert element_class_for("New", "Look for 'New' in the currently OPEN DROPDOWN MENU.") == "Dropdown"
+    assert element_class_for("Start", "Look for the green 'Start' button (play icon) in the toolbar.") == "Toolbar"
+
+
+def test_quoted_target_does_not_decide_the_class():
+    # 'Terminal' je i klasa u ontologiji, ali hint kaze da je u meniju
+    assert element_class_for("Terminal", "Look for 'Terminal' in the TOP MENU BAR of the application.") == "Menu"
+
+
+def test_target_matches_an_element_label():
+    assert element_class_for("URL bar", "Look for a clickable element labeled 'URL bar'.") == "AddressBar"
+    assert element_class_for("Back") == "Button"
+
+
+def test_target_matches_a_class_name():
+    assert element_class_for("Program.cs tab") == "Tab"
+    assert element_class_for("Settings") is None
+
+
+def test_label_match_needs_whole_words():
+    assert element_class_for("Table", "Look for the 'Table' in the tabular view.") is None
+
+
+def test_injected_classes():
+    classes = {"Menu": ["menu"], "MenuItem": ["menu item"]}
+
+    assert element_class_for("Save", "Look for the 'Save' menu item.", classes=classes) == "MenuItem"
+    assert element_class_for("Back", classes=classes) is None
+
+
+def test_region_for_class():
+    assert region_for_class("Menu", 1000, 800) == (0, 0, 1000, 120)
+    assert region_for_class("Button", 1000, 800) is None
+    assert region_for_class(None, 1000, 800) is None
@@ -0,0 +1,91 @@
+import numpy as np
+
+from src.execution.screen_capture import CaptureBackend, Frame
+from src.execution.screen_settle import ScreenSettle
+
+
+class ScriptedCapture(CaptureBackend):
+    """Returns frames with the given gray levels, then repeats the last one."""
+
+    name = "scripted"
+
+    def __init__(self, levels):
+        self.levels = list(levels)
+        self.grabs = 0
+
+    def grab(self) -> Frame:
+        level = self.levels[min(self.grabs, len(self.levels) - 1)]
+        self.grabs += 1
+        return Frame(np.full((32, 32, 3), level, dtype=np.uint8))
+
+
+def test_stable_screen_ends_early():
+    settle = ScreenSettle(ScriptedCapture([10]), interval=0.01, stable_samples=2)
+
+    settle.wait(5)
+
+    assert settle.stats()["early_exits"] == 1
+    assert settle.stats()["waited_s"] < 1
+
+
+def test_require_change_waits_for_the_change():
+    capture = ScriptedCapture([10, 10, 10, 10, 200])
+    settle = ScreenSettle(capture, interval=0.01, stable_samples=2, change_timeout=1.0)
+
+    frame = settle.wait(5, require_change=True)
+
+    assert frame.pixels[0, 0, 0] == 200
+    assert capture.grabs >= 7
+
+
+def test_change_timeout_ends_a_wait_without_change():
+    settle = ScreenSettle(ScriptedCapture([10]), interval=0.01, stable_samples=2)
+
+    settle.wait(5, require_change=True, change_timeout=0.1)
+
+    assert settle.stats()["waited_s"] < 1
+
+
+def test_wait_for_load_outlasts_a_short_pause_between_updates():
+    # Spinner: promjena, kratka pauza (3 ista frame-a), pa nova promjena
+    capture = ScriptedCapture([10, 50, 50, 50, 90, 90])
+    settle = ScreenSettle(capture, interval=0.01, stable_samples=2,
+                          load_stable_seconds=0.05, load_min_seconds=0.0)
+
+    frame = settle.wait_for_load(5)
+
+    assert frame.pixels[0, 0, 0] == 90
+
+
+def test_wait_for_load_respects_the_minimum():
+    settle = ScreenSettle(ScriptedCapture([10, 200]), interval=0.01, stable_samples=1,
+                          load_stable_seconds=0.01, load_min_seconds=0.2)
+
+    settle.wait_for_load(5)
+
+    assert settle.stats()["waited_s"] >= 0.2
+
+
+def test_wait_for_load_minimum_is_capped_by_the_planned_duration():
+    settle = ScreenSettle(ScriptedCapture([10]), interval=0.01, load_min_seconds=10)
+
+    settle.wait_for_load(0.1)
+
+    assert settle.stats()["waited_s"] < 1
+
+
+def test_require_change_on_a_settled_screen_uses_the_default_change_timeout():
+    settle = ScreenSettle(ScriptedCapture([10]), interval=0.01, stable_samples=2, change_timeout=0.1)
+
+    settle.wait(5, require_change=True)
+
+    assert settle.stats()["waited_s"] < 1
+
+
+def test_wait_for_load_without_any_change_ends_after_the_window():
+    # Nista se ne ucitava - WAIT ne placa cijelo planirano trajanje
+    settle = ScreenSettle(ScriptedCapture([10]), interval=0.01, load_stable_seconds=0.1, load_min_seconds=0.05)
+
+    settle.wait_for_load(5)
+
+    assert 0.1 <= settle.stats()["waited_s"] < 1
@@ -0,0 +1,138 @@
+import numpy as np
+
+from src.execution.screen_capture import CaptureBackend, Frame
+from src.execution.speculative_prefetcher import SpeculativePrefetcher
+from src.ontology import OntologyExecutor
+
+
+class ScriptedCapture(CaptureBackend):
+    name = "scripted"
+
+    def __init__(self, levels):
+        self.levels = list(levels)
+        self.grabs = 0
+
+    def grab(self) -> Frame:
+        level = self.levels[min(self.grabs, len(self.levels) - 1)]
+        self.grabs += 1
+        pixels = np.full((64, 64, 3), level, dtype=np.uint8)
+        pixels[:32, :32] = 255 - level
+        return Frame(pixels)
+
+
+class FakeAnalyzer:
+    def __init__(self, capture):
+        self.capture = capture
+        self.grounded_levels = []
+
+    def capture_frame(self) -> Frame:
+        return self.capture.grab()
+
+    def find_element_coordinates(self, target, context, screenshot=None, lookahead=None):
+        self.grounded_levels.append(screenshot.getpixel((63, 63))[0])
+        return {"found": True, "x": 5, "y": 6}
+
+
+def test_prefetch_after_input_grounds_the_changed_screen():
+    # Ekran reaguje na unos tek posle nekoliko frame-ova
+    analyzer = FakeAnalyzer(ScriptedCapture([10, 10, 10, 120]))
+    prefetcher = SpeculativePrefetcher(analyzer, settle_interval=0.01, change_timeout=2.0)
+
+    prefetcher.start("OK", "dialog", after_input=True)
+    element = prefetcher.take("OK", "dialog", timeout=5)
+
+    assert analyzer.grounded_levels == [120]
+    assert element["prefetched"] and (element["x"], element["y"]) == (5, 6)
+    assert prefetcher.stats()["hits"] == 1
+    prefetcher.close()
+
+
+def test_prefetch_after_input_without_change_grounds_after_change_timeout():
+    analyzer = FakeAnalyzer(ScriptedCapture([10]))
+    prefetcher = SpeculativePrefetcher(analyzer, settle_interval=0.01, change_timeout=0.05)
+
+    prefetcher.start("OK", "dialog", after_input=True)
+
+    assert prefetcher.take("OK", "dialog", timeout=1) is not None
+    assert analyzer.grounded_levels == [10]
+    prefetcher.close()
+
+
+def test_prefetch_for_another_target_is_discarded():
+    analyzer = FakeAnalyzer(ScriptedCapture([10]))
+    prefetcher = SpeculativePrefetcher(analyzer, settle_interval=0.01)
+
+    prefetcher.start("OK", "dialog")
+
+    assert prefetcher.take("Cancel", "dialog", timeout=1) is None
+    assert prefetcher.stats()["discarded"] == 1
+    prefetcher.close()
+
+
+def test_stale_prefetch_is_not_used():
+    capture = ScriptedCapture([10])
+    analyzer = FakeAnalyzer(capture)
+    prefetcher = SpeculativePrefetcher(analyzer, settle_interval=0.01)
+
+    prefetcher.start("OK", "dialog")
+    prefetcher._pending["future"].result(timeout=1)
+    capture.levels = [10, 240]
+    capture.grabs = 1
+
+    assert prefetcher.take("OK", "dialog") is None
+    assert prefetcher.stats()["stale"] == 1
+    prefetcher.close()
+
+
+class RecordingPrefetcher:
+    def __init__(self):
+        self.cancelled = 0
+
+    def cancel(self):
+        self.cancelled += 1
+
+
+class ClickingPerformer:
+    after_input = None
+
+    def click(self, x, y):
+        callback, self.after_input = self.after_input, None
+        if callback:
+            callback()
+        return True
+
+
+class OneAttempt:
+    def run(self, target, context, perform, locate=None, result=None, **kwargs):
+        return perform({"found": True, "x": 5, "y": 6})
+
+
+class FailingVerifier:
+    def verify(self, expected, before, after, point, action, next_target=None):
+        return {"satisfied": False, "description": "dialog did not open"}
+
+
+class StillSettle:
+    def wait(self, *args, **kwargs):
+        return Frame(np.zeros((8, 8, 3), dtype=np.uint8))
+
+
+def test_prefetch_is_cancelled_when_the_step_fails_verification():
+    executor = OntologyExecutor.__new__(OntologyExecutor)
+    executor.analyzer = FakeAnalyzer(ScriptedCapture([10]))
+    executor.performer = ClickingPerformer()
+    executor.prefetcher = RecordingPrefetcher()
+    executor.retry = OneAttempt()
+    executor.verifier = FailingVerifier()
+    executor.settle = StillSettle()
+    executor.verify_steps = True
+    executor.record_anchors = False
+    started = []
+
+    step = {"id": 1, "uri": "step1", "action": "click", "target": "OK", "expected_result": "Dialog opens"}
+    result = executor._execute_step(step, None, prefetch=lambda: started.append(True))
+
+    assert started == [True]
+    assert executor.prefetcher.cancelled == 1
+    assert not result["success"]
+    assert "prefetch_started" not in result
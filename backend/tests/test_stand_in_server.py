@@ -0,0 +1,49 @@
+from benchmarks.stand_in_server import StandInServer, create_app
+from src.execution.rate_limiter import RateLimiter
+
+
+def _post(client, model="vision-model"):
+    return client.post("/api/v1/chat/completions", json={
+        "model": model, "messages": [{"role": "user", "content": "hello"}]
+    })
+
+
+def test_rpm_headers_are_the_ones_the_limiter_reads():
+    client = create_app(StandInServer(latency="fixed:0", token_delay=0, rpm=2)).test_client()
+
+    first = _post(client)
+    assert first.status_code == 200
+    assert first.headers["x-ratelimit-remaining"] == "1"
+    assert float(first.headers["x-ratelimit-reset"]) > 0
+
+    second = _post(client)
+    assert second.headers["x-ratelimit-remaining"] == "0"
+
+    limited = _post(client)
+    assert limited.status_code == 429
+    assert float(limited.headers["retry-after"]) > 0
+    assert limited.headers["x-ratelimit-remaining"] == "0"
+
+
+def test_limiter_pauses_on_exhausted_remaining():
+    client = create_app(StandInServer(latency="fixed:0", token_delay=0, rpm=1)).test_client()
+    limiter = RateLimiter(default_rate=100.0, default_burst=10)
+
+    response = _post(client)
+    limiter.update_from_response("vision-model", response.status_code, response.headers)
+
+    # Sljedeci token tek kad istekne minutni prozor servera
+    assert limiter._bucket("vision-model").reserve() > 50
+
+
+def test_limiter_trips_on_injected_429():
+    client = create_app(StandInServer(latency="fixed:0", token_delay=0, rate_429=1.0, retry_after=5)).test_client()
+    limiter = RateLimiter(default_rate=100.0, default_burst=10)
+
+    response = _post(client)
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "5"
+
+    limiter.update_from_response("vision-model", response.status_code, response.headers)
+    assert limiter.metrics()["models"]["vision-model"]["throttled"] == 1
+    assert limiter.metrics()["models"]["vision-model"]["breaker"] == "open"
@@ -0,0 +1,63 @@
+from src.execution import text_input
+from src.execution.text_input import TextInput
+
+
+class FakeClipboard:
+    name = "fake"
+    available = True
+
+    def __init__(self):
+        self.text = "previous"
+
+    def get(self):
+        return self.text
+
+    def set(self, text):
+        self.text = text
+        return True
+
+
+class FakeBackend:
+    def __init__(self):
+        self.hotkeys = []
+
+    def hotkey(self, *keys):
+        self.hotkeys.append(keys)
+
+    def write(self, text, interval=0.0):
+        raise AssertionError("text should not be typed")
+
+
+def make_input():
+    entry = TextInput.__new__(TextInput)
+    entry.default_mode = text_input.INJECT
+    entry.paste_settle = 0
+    entry.input = FakeBackend()
+    entry.clipboard = FakeClipboard()
+    entry.inject_helper = "/usr/bin/xdotool"
+    entry.paste_keys = ("ctrl", "v")
+    entry.injected = []
+    entry._inject = entry.injected.append
+    return entry
+
+
+def test_inject_multiline_code_is_pasted():
+    # Enter kao key event bi pokrenuo auto-indent u IDE-u
+    entry = make_input()
+
+    mode = entry.type_text("def f():\n    return 1\n")
+
+    assert mode == text_input.CLIPBOARD
+    assert entry.injected == []
+    assert entry.input.hotkeys == [("ctrl", "v")]
+    assert entry.clipboard.text == "previous"
+
+
+def test_inject_single_line_uses_helper():
+    entry = make_input()
+
+    mode = entry.type_text("hello world")
+
+    assert mode == text_input.INJECT
+    assert entry.injected == ["hello world"]
+    assert entry.input.hotkeys == []